@@ -0,0 +1,71 @@
+"""Alembic script template for migrations."""
+
+"""JSON columns for contracts and skills
+
+Revision ID: 3b8f2c1d9a47
+Revises: 10f6ff5d5050
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3b8f2c1d9a47'
+down_revision = '10f6ff5d5050'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = (
+    ('contracts', 'deliverables'),
+    ('contracts', 'milestones'),
+    ('user_profiles', 'skills'),
+)
+
+
+def upgrade() -> None:
+    # SQLite stores JSON as TEXT, so only Postgres needs a type change.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.Text(),
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            existing_nullable=True,
+            postgresql_using=f"NULLIF({column}, '')::jsonb",
+        )
+    op.create_index(
+        'ix_contracts_milestones',
+        'contracts',
+        ['milestones'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'milestones': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_user_profiles_skills',
+        'user_profiles',
+        ['skills'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'skills': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_user_profiles_skills', table_name='user_profiles')
+    op.drop_index('ix_contracts_milestones', table_name='contracts')
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            type_=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::text',
+        )
@@ -0,0 +1,81 @@
+"""Alembic script template for migrations."""
+
+"""Skills dictionary and user_skills association
+
+Revision ID: 5c1e7a9b2d30
+Revises: 3b8f2c1d9a47
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7a9b2d30'
+down_revision = '3b8f2c1d9a47'
+branch_labels = None
+depends_on = None
+
+SEED_SKILLS = [
+    ('Python', 'programming', ['py', 'python3']),
+    ('JavaScript', 'programming', ['js', 'ecmascript']),
+    ('TypeScript', 'programming', ['ts']),
+    ('React', 'frontend', ['reactjs', 'react.js']),
+    ('Vue.js', 'frontend', ['vue', 'vuejs']),
+    ('Node.js', 'backend', ['node', 'nodejs']),
+    ('Django', 'backend', []),
+    ('FastAPI', 'backend', []),
+    ('PostgreSQL', 'data', ['postgres', 'psql']),
+    ('SQL', 'data', []),
+    ('Flutter', 'mobile', []),
+    ('Swift', 'mobile', ['ios']),
+    ('Kotlin', 'mobile', ['android']),
+    ('Figma', 'design', []),
+    ('UI/UX Design', 'design', ['ui', 'ux', 'ui design', 'ux design']),
+    ('Copywriting', 'writing', ['copy writing']),
+    ('SEO', 'marketing', ['search engine optimization']),
+    ('Data Analysis', 'data', ['data analytics']),
+    ('Machine Learning', 'data', ['ml']),
+    ('DevOps', 'infrastructure', ['devops engineering']),
+]
+
+
+def upgrade() -> None:
+    json_type = sa.JSON().with_variant(
+        postgresql.JSONB(astext_type=sa.Text()), 'postgresql'
+    )
+    skills = op.create_table('skills',
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=True),
+    sa.Column('aliases', json_type, nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_skills_id'), 'skills', ['id'], unique=False)
+    op.create_index(op.f('ix_skills_name'), 'skills', ['name'], unique=True)
+    op.create_table('user_skills',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('skill_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['skill_id'], ['skills.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'skill_id')
+    )
+    op.create_index(op.f('ix_user_skills_skill_id'), 'user_skills', ['skill_id'], unique=False)
+    op.bulk_insert(
+        skills,
+        [
+            {'name': name, 'category': category, 'aliases': aliases}
+            for name, category, aliases in SEED_SKILLS
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_skills_skill_id'), table_name='user_skills')
+    op.drop_table('user_skills')
+    op.drop_index(op.f('ix_skills_name'), table_name='skills')
+    op.drop_index(op.f('ix_skills_id'), table_name='skills')
+    op.drop_table('skills')
@@ -7,55 +7,88 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from ..db.database import get_db
+from ..core.context import set_user_id
 from ..core.security import decode_token
+from ..core.tracing import traced
+from ..infra.principal_cache import Principal, cache_principal, get_cached_principal
+from ..models.user import UserRole
+from ..repositories.user_repository import UserRepository
 
 security = HTTPBearer()
 
 
+def resolve_principal(db: Session, user_id: int) -> Optional[Principal]:
+    """Return the cached principal for a user, loading it on a cache miss."""
+    principal = get_cached_principal(user_id)
+    if principal is not None:
+        return principal
+    user = UserRepository(db).get_by_id(user_id)
+    if user is None:
+        return None
+    principal = Principal(
+        id=int(user.id),
+        role=UserRole(user.role).value,
+        is_active=bool(user.is_active),
+        is_verified=bool(user.is_verified),
+    )
+    cache_principal(principal)
+    return principal
+
+
+@traced("auth.get_current_user")
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
-) -> Optional[dict]:
+) -> Optional[Principal]:
     """Get current authenticated user from JWT token.
 
+    The user is resolved through the principal cache, so the database is
+    only queried on a cache miss.
+
     Args:
         credentials: Bearer token from Authorization header
         db: Database session
 
     Returns:
-        User data from token payload
+        Principal (id, role, is_active, is_verified) of the token subject
 
     Raises:
-        HTTPException: If token is invalid or expired
+        HTTPException: If token is invalid or expired, or the user is gone
     """
+    credentials_error = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
     token = credentials.credentials
     payload = decode_token(token)
 
     if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise credentials_error
 
-    # TODO: In a real implementation, you would:
-    # 1. Extract user_id from payload
-    # 2. Query database to get full user object
-    # 3. Return user object instead of payload
+    try:
+        user_id = int(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        raise credentials_error
 
-    return payload
+    principal = resolve_principal(db, user_id)
+    if principal is None:
+        raise credentials_error
+
+    set_user_id(principal.id)
+    return principal
 
 
 def get_current_active_user(
-    current_user: Optional[dict] = Depends(get_current_user),
-) -> dict:
+    current_user: Optional[Principal] = Depends(get_current_user),
+) -> Principal:
     """Get current active user (non-disabled).
 
     Args:
         current_user: Current user from get_current_user
 
     Returns:
-        Active user data
+        Active user principal
 
     Raises:
         HTTPException: If user is disabled
@@ -65,11 +98,9 @@ def get_current_active_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
         )
 
-    # TODO: Check if user is active/not disabled
-    # if not current_user.is_active:
-    #     raise HTTPException(
-    #         status_code=status.HTTP_400_BAD_REQUEST,
-    #         detail="Inactive user"
-    #     )
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
 
     return current_user
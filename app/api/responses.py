@@ -0,0 +1,41 @@
+"""Fast JSON responses for API routes.
+
+``FastJSONResponse`` is the application's default response class: it
+renders with orjson when installed and compact stdlib JSON otherwise.
+
+``model_response`` serializes a pydantic model that our own code built
+(and therefore already validated) straight to JSON bytes. Returning a
+``Response`` skips FastAPI's ``response_model`` step, which would dump the
+model to a dict, validate it again and encode the result; routes keep
+``response_model`` for the OpenAPI schema.
+"""
+
+import json
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional: faster serialization
+    orjson = None  # type: ignore[assignment]
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def json_bytes_response(body: bytes, status_code: int = 200) -> Response:
+    """Return already-encoded JSON."""
+    return Response(body, status_code=status_code, media_type="application/json")
+
+
+def model_response(model: BaseModel, status_code: int = 200) -> Response:
+    """Serialize a trusted model without FastAPI revalidating it."""
+    return json_bytes_response(model.model_dump_json().encode(), status_code)
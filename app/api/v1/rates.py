@@ -1,37 +1,89 @@
-from typing import cast, Literal
+import json
+import math
+from typing import Optional
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+from starlette.concurrency import run_in_threadpool
+from ...core.tracing import span, traced
+from ...infra.response_cache import cache_response
 from ...services.rates import calculate_compensation_tiers
-from ...schemas.rates import RateRequest, RateResponse, RateHistoryResponse
+from ...schemas.rates import (
+    RATE_RATIONALE,
+    RATIONALES,
+    RateRequest,
+    RateResponse,
+    RateHistoryResponse,
+)
 from ..deps import get_db
+from ..responses import json_bytes_response
 from sqlalchemy.orm import Session
 
 router = APIRouter(prefix="/rates", tags=["rates"])
 
+# Everything after the three rates is the same for every rule-based
+# response, so it is encoded once rather than per request
+_RULE_BASED_TAIL = (
+    ","
+    + json.dumps(
+        {"currency": "EGP", "method": "rule_based", "rationale": RATE_RATIONALE},
+        separators=(",", ":"),
+    )[1:]
+).encode()
+
+
+def encode_rate_response(tiers: dict) -> bytes:
+    """Encode calculated tiers as a ``RateResponse`` JSON body."""
+    minimum = float(tiers["minimum_rate"])
+    competitive = float(tiers["competitive_rate"])
+    premium = float(tiers["premium_rate"])
+    if (
+        tiers["currency"] != "EGP"
+        or tiers["method"] != "rule_based"
+        or min(minimum, competitive, premium) < 0
+        or not math.isfinite(minimum + competitive + premium)
+    ):
+        # Not the pre-encoded shape: let the model validate it
+        rationale = RATIONALES.get(str(tiers["method"]), RATE_RATIONALE)
+        return (
+            RateResponse.model_validate({**tiers, "rationale": rationale})
+            .model_dump_json()
+            .encode()
+        )
+    return b'{"minimum_rate":%r,"competitive_rate":%r,"premium_rate":%r%s' % (
+        minimum,
+        competitive,
+        premium,
+        _RULE_BASED_TAIL,
+    )
+
 
 @router.get("/history", response_model=RateHistoryResponse)
+@cache_response(ttl=30, tags=("rates:{principal}",))
 async def get_history() -> RateHistoryResponse:
     return RateHistoryResponse(items=[])
 
 
 @router.post("/calculate", response_model=RateResponse)
+@traced("rates.calculate_rate")
 async def calculate_rate(
     payload: RateRequest, db: Session = Depends(get_db)
-) -> RateResponse:
+) -> Response:
     """Calculate rate tiers based on a simple rule-based engine.
 
     This endpoint returns minimum, competitive, and premium rates in EGP.
     """
     # TODO: Get user_id from authentication when auth is implemented
-    user_id = None  # Will be replaced with actual user authentication
-    tiers = calculate_compensation_tiers(payload, db=db, user_id=user_id)
-    return RateResponse(
-        minimum_rate=float(tiers["minimum_rate"]),
-        competitive_rate=float(tiers["competitive_rate"]),
-        premium_rate=float(tiers["premium_rate"]),
-        currency=cast("Literal['EGP']", tiers["currency"]),
-        method=cast("Literal['rule_based']", tiers["method"]),
-        rationale=(
-            "Rule-based calculation using project complexity, experience, "
-            "skills, client region, and urgency."
-        ),
-    )
+    user_id: Optional[int] = None  # Will be replaced with actual user authentication
+    if user_id is None:
+        # Pure computation: no database access, so no thread hop
+        tiers = calculate_compensation_tiers(payload, db=db, user_id=user_id)
+    else:
+        # Reads profile skills and saves the calculation (which invalidates
+        # cached history): blocking I/O, kept off the event loop
+        tiers = await run_in_threadpool(
+            calculate_compensation_tiers, payload, db=db, user_id=user_id
+        )
+    with span("rates.serialize"):
+        body = encode_rate_response(tiers)
+    return json_bytes_response(body)
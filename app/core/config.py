@@ -2,7 +2,7 @@
 
 import json
 from functools import lru_cache
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -28,6 +28,76 @@ class AppSettings(BaseSettings):
     environment: str = Field(default="development", alias="ENVIRONMENT")
     debug: bool = Field(default=True, alias="DEBUG")
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
+    # Log records are written by a background thread through a bounded
+    # queue (0 = write synchronously); when it is full, "drop" discards and
+    # counts records, "block" makes the logging call wait
+    log_queue_size: int = Field(default=10000, alias="LOG_QUEUE_SIZE")
+    log_queue_policy: Literal["drop", "block"] = Field(
+        default="drop", alias="LOG_QUEUE_POLICY"
+    )
+    # Access log sampling for 2xx/3xx responses; 4xx/5xx and requests slower
+    # than ACCESS_LOG_SLOW_MS are always logged. Route rates are a JSON object
+    # mapping a path prefix to a rate between 0 and 1
+    access_log_sample_rate: float = Field(default=1.0, alias="ACCESS_LOG_SAMPLE_RATE")
+    access_log_route_sampling: str = Field(
+        default="{}", alias="ACCESS_LOG_ROUTE_SAMPLING"
+    )
+    access_log_slow_ms: Optional[float] = Field(
+        default=1000.0, alias="ACCESS_LOG_SLOW_MS"
+    )
+    # Statements slower than this are logged as fingerprints on
+    # app.db.slow_query (0 disables); in DEBUG, responses also report their
+    # query count and DB time
+    db_slow_query_ms: float = Field(default=200.0, alias="DB_SLOW_QUERY_MS")
+    # Seconds a new PostgreSQL connection may take before failing
+    db_connect_timeout: int = Field(default=5, alias="DB_CONNECT_TIMEOUT")
+    # OpenTelemetry tracing (needs opentelemetry-sdk; OTLP also needs
+    # opentelemetry-exporter-otlp-proto-http). The sample rate applies to new
+    # traces; requests with a traceparent follow the caller's decision
+    tracing_enabled: bool = Field(default=False, alias="TRACING_ENABLED")
+    tracing_sample_rate: float = Field(default=1.0, alias="TRACING_SAMPLE_RATE")
+    tracing_exporter: Literal["console", "file", "otlp"] = Field(
+        default="file", alias="TRACING_EXPORTER"
+    )
+    tracing_file: str = Field(default="traces.jsonl", alias="TRACING_FILE")
+    tracing_otlp_endpoint: Optional[str] = Field(
+        default=None, alias="TRACING_OTLP_ENDPOINT"
+    )
+    tracing_service_name: str = Field(
+        default="qeem-backend", alias="TRACING_SERVICE_NAME"
+    )
+    # Market index shared by the workers through a memory-mapped file (see
+    # app/infra/market_index.py): one worker rebuilds it every refresh
+    # interval, the others pick up the new file within the check interval
+    market_index_enabled: bool = Field(default=False, alias="MARKET_INDEX_ENABLED")
+    market_index_path: str = Field(
+        default="/tmp/qeem-market-index.bin", alias="MARKET_INDEX_PATH"
+    )
+    market_index_refresh_interval: float = Field(
+        default=300.0, alias="MARKET_INDEX_REFRESH_INTERVAL"
+    )
+    market_index_check_interval: float = Field(
+        default=5.0, alias="MARKET_INDEX_CHECK_INTERVAL"
+    )
+    # Readiness probes (/health/ready): per-check timeout, how long results
+    # are reused, and whether Redis being down makes the service not ready
+    # (by default it reports "degraded" and serves with local fallbacks)
+    readiness_timeout: float = Field(default=1.0, alias="READINESS_TIMEOUT")
+    readiness_cache_ttl: float = Field(default=2.0, alias="READINESS_CACHE_TTL")
+    readiness_require_redis: bool = Field(
+        default=False, alias="READINESS_REQUIRE_REDIS"
+    )
+    # Request profiler (see app/core/profiler.py): requests sending
+    # X-Profile-Token: <PROFILER_TOKEN>, plus a sampled fraction, are profiled
+    # to folded stacks in PROFILER_DIR. Not installed at all when disabled
+    profiler_enabled: bool = Field(default=False, alias="PROFILER_ENABLED")
+    profiler_token: Optional[str] = Field(default=None, alias="PROFILER_TOKEN")
+    profiler_sample_rate: float = Field(default=0.0, alias="PROFILER_SAMPLE_RATE")
+    profiler_dir: str = Field(default="profiles", alias="PROFILER_DIR")
+    profiler_interval_ms: float = Field(default=1.0, alias="PROFILER_INTERVAL_MS")
+    # Prometheus /metrics endpoint and request instrumentation; with several
+    # workers also set PROMETHEUS_MULTIPROC_DIR (see app/core/metrics.py)
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
 
     # Core URLs
     database_url: str = Field(
@@ -35,6 +105,26 @@ class AppSettings(BaseSettings):
     )
     redis_url: str = Field(default="redis://localhost:6379", alias="REDIS_URL")
 
+    # Redis connection pool (shared by the async and sync clients)
+    redis_max_connections: int = Field(default=20, alias="REDIS_MAX_CONNECTIONS")
+    redis_pool_timeout: float = Field(default=1.0, alias="REDIS_POOL_TIMEOUT")
+    redis_socket_timeout: float = Field(default=0.5, alias="REDIS_SOCKET_TIMEOUT")
+    redis_socket_connect_timeout: float = Field(
+        default=1.0, alias="REDIS_SOCKET_CONNECT_TIMEOUT"
+    )
+    redis_retry_attempts: int = Field(default=2, alias="REDIS_RETRY_ATTEMPTS")
+    redis_health_check_interval: int = Field(
+        default=30, alias="REDIS_HEALTH_CHECK_INTERVAL"
+    )
+    # Circuit breaker: open after N consecutive connection/timeout errors,
+    # probe again after the recovery timeout (seconds)
+    redis_breaker_failure_threshold: int = Field(
+        default=5, alias="REDIS_BREAKER_FAILURE_THRESHOLD"
+    )
+    redis_breaker_recovery_timeout: float = Field(
+        default=10.0, alias="REDIS_BREAKER_RECOVERY_TIMEOUT"
+    )
+
     # CORS
     cors_origins_str: str = Field(
         default="http://localhost:3000,http://127.0.0.1:3000", alias="CORS_ORIGINS"
@@ -46,6 +136,54 @@ class AppSettings(BaseSettings):
     enable_ai_negotiation: bool = Field(default=False, alias="ENABLE_AI_NEGOTIATION")
     enable_rate_limiting: bool = Field(default=False, alias="RATE_LIMITING_ENABLED")
 
+    # Rate limits as "<count>/<second|minute|hour|day>"; routes and principals
+    # are JSON objects mapping a path prefix / user id to a limit
+    rate_limit_default: str = Field(default="100/hour", alias="RATE_LIMIT_DEFAULT")
+    rate_limit_authenticated: str = Field(
+        default="1000/hour", alias="RATE_LIMIT_AUTHENTICATED"
+    )
+    rate_limit_routes: str = Field(default="{}", alias="RATE_LIMIT_ROUTES")
+    rate_limit_principals: str = Field(default="{}", alias="RATE_LIMIT_PRINCIPALS")
+    # "atomic": one Redis round trip per request; "hybrid": local buckets
+    # reconciled with Redis every sync interval, admitting at most
+    # limit * tolerance requests per worker between syncs
+    rate_limit_mode: Literal["atomic", "hybrid"] = Field(
+        default="atomic", alias="RATE_LIMIT_MODE"
+    )
+    rate_limit_tolerance: float = Field(default=0.05, alias="RATE_LIMIT_TOLERANCE")
+    rate_limit_sync_interval: float = Field(
+        default=1.0, alias="RATE_LIMIT_SYNC_INTERVAL"
+    )
+
+    # Password hashing: bcrypt cost factor and size of the hashing thread pool
+    bcrypt_rounds: int = Field(default=12, alias="BCRYPT_ROUNDS")
+    password_hash_workers: int = Field(default=2, alias="PASSWORD_HASH_WORKERS")
+
+    # Token verification cache (0 disables caching)
+    jwt_cache_size: int = Field(default=10000, alias="JWT_CACHE_SIZE")
+    jwt_revocation_check: bool = Field(default=False, alias="JWT_REVOCATION_CHECK")
+
+    # Authenticated principal cache: per-worker LRU plus optional Redis tier
+    principal_cache_size: int = Field(default=10000, alias="PRINCIPAL_CACHE_SIZE")
+    principal_cache_ttl_seconds: int = Field(default=30, alias="PRINCIPAL_CACHE_TTL")
+    principal_cache_redis: bool = Field(default=False, alias="PRINCIPAL_CACHE_REDIS")
+    principal_redis_ttl_seconds: int = Field(default=300, alias="PRINCIPAL_REDIS_TTL")
+
+    # Per-worker skill dictionary index, reloaded after this many seconds
+    skill_index_ttl_seconds: int = Field(default=300, alias="SKILL_INDEX_TTL")
+
+    # Response cache for read endpoints ("memory" is per-process, for local
+    # runs and tests); beta > 1 refreshes hot entries earlier before expiry
+    response_cache_enabled: bool = Field(default=True, alias="RESPONSE_CACHE_ENABLED")
+    response_cache_backend: Literal["redis", "memory"] = Field(
+        default="redis", alias="RESPONSE_CACHE_BACKEND"
+    )
+    response_cache_ttl_seconds: int = Field(default=60, alias="RESPONSE_CACHE_TTL")
+    response_cache_lock_timeout: float = Field(
+        default=5.0, alias="RESPONSE_CACHE_LOCK_TIMEOUT"
+    )
+    response_cache_beta: float = Field(default=1.0, alias="RESPONSE_CACHE_BETA")
+
     # Nested
     security: SecuritySettings = SecuritySettings()
     sentry: SentrySettings = SentrySettings()
@@ -0,0 +1,82 @@
+"""Per-request context shared with logging.
+
+``RequestContextMiddleware`` binds a ``RequestContext`` for each HTTP
+request; code running inside the request (including sync dependencies,
+which run in a copied context) reads or updates it through
+``current_request``. The object is mutable so values set in a worker
+thread, such as the user id or the query stats recorded by the engine
+instrumentation, are visible to later log records.
+"""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Any, List, Optional, Tuple
+
+# Statements kept per request for debugging, slowest first
+SLOWEST_QUERIES = 3
+
+
+class RequestContext:
+    __slots__ = (
+        "request_id",
+        "method",
+        "path",
+        "start",
+        "user_id",
+        "scope",
+        "queries",
+        "db_ms",
+        "slowest",
+    )
+
+    def __init__(self, request_id: str, method: str, path: str, scope: Any) -> None:
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.start = time.perf_counter()
+        self.user_id: Optional[int] = None
+        self.scope = scope
+        self.queries = 0
+        self.db_ms = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+
+    def record_query(self, statement: str, ms: float) -> None:
+        self.queries += 1
+        self.db_ms += ms
+        slowest = self.slowest
+        if len(slowest) < SLOWEST_QUERIES or ms > slowest[-1][0]:
+            slowest.append((ms, statement))
+            slowest.sort(key=lambda item: item[0], reverse=True)
+            del slowest[SLOWEST_QUERIES:]
+
+    @property
+    def route(self) -> Optional[str]:
+        """Matched route template (e.g. ``/users/{id}``) once routing ran."""
+        route = self.scope.get("route")
+        return getattr(route, "path", None)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+
+_request: ContextVar[Optional[RequestContext]] = ContextVar("request", default=None)
+
+
+def bind_request(context: RequestContext) -> Token:
+    return _request.set(context)
+
+
+def reset_request(token: Token) -> None:
+    _request.reset(token)
+
+
+def current_request() -> Optional[RequestContext]:
+    return _request.get()
+
+
+def set_user_id(user_id: int) -> None:
+    """Record the authenticated user on the current request, if any."""
+    context = _request.get()
+    if context is not None:
+        context.user_id = user_id
@@ -1,12 +1,201 @@
 """Logging configuration utilities.
 
-Provides a helper to configure JSON or text logging format based on environment.
+Provides a helper to configure JSON or text logging format based on environment,
+and a queue-based pipeline that moves handler I/O off the calling thread.
 """
 
 import json
 import logging
 import logging.config
-from typing import Literal
+import random
+import threading
+import time
+from collections import defaultdict
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+from typing import Any, Callable, Dict, List, Literal, Optional, Sequence, Tuple
+
+from .context import RequestContext, current_request
+
+try:
+    import orjson
+except ImportError:  # optional: faster serialization
+    orjson = None  # type: ignore[assignment]
+
+
+def _orjson_dumps(payload: Dict[str, Any]) -> str:
+    return orjson.dumps(payload, default=str).decode()
+
+
+# json.dumps builds a new encoder per call when given any option
+_json_encoder = json.JSONEncoder(default=str)
+
+
+def _json_dumps(payload: Dict[str, Any]) -> str:
+    return _json_encoder.encode(payload)
+
+
+def _add_request_fields(payload: Dict[str, Any], context: RequestContext) -> None:
+    payload["request_id"] = context.request_id
+    payload["method"] = context.method
+    payload["path"] = context.path
+    # Truncated to 0.01 ms; round() costs more than the rest of this function
+    payload["elapsed_ms"] = int((time.perf_counter() - context.start) * 1e5) / 100
+    route = context.scope.get("route")
+    if route is not None:
+        payload["route"] = route.path
+    if context.user_id is not None:
+        payload["user_id"] = context.user_id
+    if context.queries:
+        payload["db_queries"] = context.queries
+        payload["db_ms"] = int(context.db_ms * 100) / 100
+
+
+def request_log_fields() -> Optional[Dict[str, Any]]:
+    """Fields of the request being handled, or None outside a request."""
+    context = current_request()
+    if context is None:
+        return None
+    fields: Dict[str, Any] = {}
+    _add_request_fields(fields, context)
+    return fields
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the current request's context.
+
+    Records logged while a request is handled carry its request id, method,
+    path, matched route, user id, elapsed time and, once it has queried the
+    database, its query count and DB time. Records formatted on another
+    thread (the logging queue listener) use the fields captured when they
+    were logged. Serializes with orjson when it is installed.
+    """
+
+    def __init__(self, use_orjson: bool = True) -> None:
+        super().__init__()
+        self._dumps: Callable[[Dict[str, Any]], str] = (
+            _orjson_dumps if use_orjson and orjson is not None else _json_dumps
+        )
+
+    # type: ignore[override]
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        # Captured by the queue handler when formatted on another thread
+        fields = record.__dict__.get("request")
+        if fields is not None:
+            payload.update(fields)
+        else:
+            context = current_request()
+            if context is not None:
+                _add_request_fields(payload, context)
+        sample_rate = record.__dict__.get("sample_rate")
+        if sample_rate is not None:
+            payload["sample_rate"] = sample_rate
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return self._dumps(payload)
+
+
+class AccessLogSampler(logging.Filter):
+    """Sample successful ``uvicorn.access`` records per route.
+
+    4xx/5xx responses and requests slower than ``slow_ms`` are always
+    logged. Other records are kept with the rate of the longest matching
+    path prefix in ``routes`` (``default_rate`` otherwise). Kept records
+    carry ``sample_rate`` so totals can be reconstructed; suppressed ones
+    are counted per route prefix.
+    """
+
+    def __init__(
+        self,
+        routes: Optional[Dict[str, float]] = None,
+        default_rate: float = 1.0,
+        slow_ms: Optional[float] = None,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        super().__init__()
+        self.routes = sorted((routes or {}).items(), key=lambda r: -len(r[0]))
+        self.default_rate = default_rate
+        self.slow_ms = slow_ms
+        self._rand = rand
+        self.logged: Dict[str, int] = defaultdict(int)
+        self.suppressed: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_settings(cls, settings: Any) -> "AccessLogSampler":
+        return cls(
+            routes={
+                str(k): float(v)
+                for k, v in json.loads(settings.access_log_route_sampling).items()
+            },
+            default_rate=settings.access_log_sample_rate,
+            slow_ms=settings.access_log_slow_ms,
+        )
+
+    def _route(self, path: str) -> Tuple[str, float]:
+        for prefix, rate in self.routes:
+            if path.startswith(prefix):
+                return prefix, rate
+        return "*", self.default_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        args = record.args
+        # (client, method, path with query, http version, status)
+        if not isinstance(args, tuple) or len(args) != 5:
+            return True
+        status = args[4]
+        if not isinstance(status, int):
+            return True
+        route, rate = self._route(str(args[2]).partition("?")[0])
+        if rate < 1.0 and status < 400 and not self._slow():
+            if rate <= 0.0 or self._rand() >= rate:
+                self.suppressed[route] += 1
+                return False
+            record.sample_rate = rate
+        self.logged[route] += 1
+        return True
+
+    def _slow(self) -> bool:
+        if self.slow_ms is None:
+            return False
+        context = current_request()
+        return context is not None and context.elapsed_ms >= self.slow_ms
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        routes = set(self.logged) | set(self.suppressed)
+        return {
+            route: {
+                "logged": self.logged[route],
+                "suppressed": self.suppressed[route],
+            }
+            for route in sorted(routes)
+        }
+
+
+access_sampler: Optional[AccessLogSampler] = None
+
+
+def access_log_stats() -> Dict[str, Dict[str, int]]:
+    """Return logged/suppressed access record counts per route prefix."""
+    return access_sampler.stats() if access_sampler is not None else {}
+
+
+def _access_filters(sampler: Optional[AccessLogSampler]) -> Dict[str, Any]:
+    global access_sampler
+    access_sampler = sampler
+    # dictConfig adds filters to existing loggers but never removes them
+    access_logger = logging.getLogger("uvicorn.access")
+    for old in [f for f in access_logger.filters if isinstance(f, AccessLogSampler)]:
+        access_logger.removeFilter(old)
+    if sampler is None:
+        return {}
+    return {"access_sampler": {"()": lambda: sampler}}
 
 
 def configure_logging(
@@ -17,16 +206,6 @@ def configure_logging(
     handler = logging.StreamHandler()
     if fmt == "json":
 
-        class JsonFormatter(logging.Formatter):
-            # type: ignore[override]
-            def format(self, record: logging.LogRecord) -> str:
-                payload = {
-                    "level": record.levelname,
-                    "name": record.name,
-                    "message": record.getMessage(),
-                }
-                return json.dumps(payload)
-
         handler.setFormatter(JsonFormatter())
     else:
         if color:
@@ -57,23 +236,20 @@ def configure_logging(
     logger.handlers = [handler]
 
 
-def configure_uvicorn_json_logging(level: str) -> None:
-    """Route uvicorn loggers through the JSON formatter."""
+def configure_uvicorn_json_logging(
+    level: str, access_sampler: Optional[AccessLogSampler] = None
+) -> None:
+    """Route uvicorn loggers through the JSON formatter.
 
-    class JsonFormatter(logging.Formatter):
-        # type: ignore[override]
-        def format(self, record: logging.LogRecord) -> str:
-            payload = {
-                "level": record.levelname,
-                "name": record.name,
-                "message": record.getMessage(),
-            }
-            return json.dumps(payload)
+    ``access_sampler`` (if given) filters ``uvicorn.access`` records.
+    """
+    filters = _access_filters(access_sampler)
 
     logging.config.dictConfig(
         {
             "version": 1,
             "disable_existing_loggers": False,
+            "filters": filters,
             "formatters": {
                 "json": {
                     "()": JsonFormatter,
@@ -99,6 +275,7 @@ def configure_uvicorn_json_logging(level: str) -> None:
                 },
                 "uvicorn.access": {
                     "handlers": ["json"],
+                    "filters": list(filters),
                     "level": level.upper(),
                     "propagate": False,
                 },
@@ -107,7 +284,11 @@ def configure_uvicorn_json_logging(level: str) -> None:
     )
 
 
-def configure_uvicorn_text_logging(level: str, color: bool = True) -> None:
+def configure_uvicorn_text_logging(
+    level: str, color: bool = True, access_sampler: Optional[AccessLogSampler] = None
+) -> None:
+    filters = _access_filters(access_sampler)
+
     class PlainFormatter(logging.Formatter):
         # type: ignore[override]
         def format(self, record: logging.LogRecord) -> str:
@@ -133,6 +314,7 @@ def configure_uvicorn_text_logging(level: str, color: bool = True) -> None:
         {
             "version": 1,
             "disable_existing_loggers": False,
+            "filters": filters,
             "formatters": {
                 "text": {"()": ColorFormatter if color else PlainFormatter},
             },
@@ -156,9 +338,196 @@ def configure_uvicorn_text_logging(level: str, color: bool = True) -> None:
                 },
                 "uvicorn.access": {
                     "handlers": ["text"],
+                    "filters": list(filters),
                     "level": level.upper(),
                     "propagate": False,
                 },
             },
         }
     )
+
+
+# Loggers whose handlers are moved behind the queue by start_queue_logging
+QUEUED_LOGGERS = ("", "uvicorn", "uvicorn.error", "uvicorn.access")
+
+
+class LogQueueStats:
+    """Counters for the logging queue."""
+
+    def __init__(self) -> None:
+        self.enqueued = 0
+        self.dropped = 0
+        self.dropped_by_level: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record_drop(self, record: logging.LogRecord) -> None:
+        with self._lock:
+            self.dropped += 1
+            self.dropped_by_level[record.levelname] += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "enqueued": self.enqueued,
+                "dropped": self.dropped,
+                "dropped_by_level": dict(self.dropped_by_level),
+            }
+
+
+class BoundedQueueHandler(QueueHandler):
+    """Enqueue records for ``logger_name``'s handlers on the listener thread.
+
+    With the "drop" policy a full queue drops the record (and counts it)
+    instead of blocking the caller; "block" waits for space.
+    """
+
+    queue: "Queue[logging.LogRecord]"
+
+    def __init__(
+        self,
+        log_queue: "Queue[logging.LogRecord]",
+        logger_name: str,
+        policy: Literal["drop", "block"],
+        stats: LogQueueStats,
+    ) -> None:
+        super().__init__(log_queue)
+        self.logger_name = logger_name
+        self.policy = policy
+        self.stats = stats
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render the traceback now: both may change or go
+        # away once the caller continues. Formatting itself happens on the
+        # listener thread.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.queue_route = self.logger_name
+        # The listener thread has no request context; capture it now.
+        record.request = request_log_fields()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.policy == "block":
+            self.queue.put(record)
+        else:
+            try:
+                self.queue.put_nowait(record)
+            except Full:
+                self.stats.record_drop(record)
+                return
+        self.stats.enqueued += 1
+
+
+class RoutingQueueListener(QueueListener):
+    """Deliver each queued record to the handlers of the logger it came from.
+
+    Dropped records are reported as a warning on the root handlers (or the
+    first route when root is not queued), at most once per
+    ``report_interval`` seconds.
+    """
+
+    queue: "Queue[logging.LogRecord]"
+
+    def __init__(
+        self,
+        log_queue: "Queue[logging.LogRecord]",
+        routes: Dict[str, List[logging.Handler]],
+        stats: LogQueueStats,
+        report_interval: float = 10.0,
+    ) -> None:
+        super().__init__(log_queue, respect_handler_level=True)
+        self.routes = routes
+        self.stats = stats
+        self.report_interval = report_interval
+        self._reported_drops = 0
+        self._last_report = 0.0
+        self._report_route = "" if "" in routes else next(iter(routes), "")
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.routes.get(getattr(record, "queue_route", ""), ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        self._report_drops()
+
+    def _report_drops(self, force: bool = False) -> None:
+        dropped = self.stats.dropped
+        now = time.monotonic()
+        if dropped == self._reported_drops or (
+            not force and now - self._last_report < self.report_interval
+        ):
+            return
+        warning = logging.makeLogRecord(
+            {
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Dropped {dropped - self._reported_drops} log records "
+                "(logging queue full)",
+                "queue_route": self._report_route,
+            }
+        )
+        self._reported_drops = dropped
+        self._last_report = now
+        for handler in self.routes.get(self._report_route, ()):
+            handler.handle(warning)
+
+    def enqueue_sentinel(self) -> None:
+        # The base class uses put_nowait, which fails on a full queue.
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+    def stop(self) -> None:
+        super().stop()
+        self._report_drops(force=True)
+        for handlers in self.routes.values():
+            for handler in handlers:
+                handler.flush()
+
+
+_listener: Optional[RoutingQueueListener] = None
+_queue_stats = LogQueueStats()
+
+
+def start_queue_logging(
+    queue_size: int = 10000,
+    policy: Literal["drop", "block"] = "drop",
+    logger_names: Sequence[str] = QUEUED_LOGGERS,
+) -> None:
+    """Move the configured handlers of ``logger_names`` behind a queue.
+
+    Call after the handlers are configured. Records are written by a single
+    background thread; ``stop_queue_logging`` drains the queue and restores
+    the original handlers. A ``queue_size`` of 0 leaves logging synchronous.
+    """
+    global _listener
+    if _listener is not None or queue_size <= 0:
+        return
+    log_queue: "Queue[logging.LogRecord]" = Queue(maxsize=queue_size)
+    routes: Dict[str, List[logging.Handler]] = {}
+    for name in logger_names:
+        logger = logging.getLogger(name)
+        routes[name] = list(logger.handlers)
+        logger.handlers = [BoundedQueueHandler(log_queue, name, policy, _queue_stats)]
+    _listener = RoutingQueueListener(log_queue, routes, _queue_stats)
+    _listener.start()
+
+
+def stop_queue_logging() -> None:
+    """Flush queued records and put the original handlers back."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    for name, handlers in listener.routes.items():
+        logging.getLogger(name).handlers = handlers
+
+
+def logging_queue_stats() -> Dict[str, object]:
+    """Return enqueued/dropped counters and the current queue depth."""
+    stats = _queue_stats.snapshot()
+    stats["depth"] = _listener.queue.qsize() if _listener is not None else 0
+    return stats
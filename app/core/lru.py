@@ -0,0 +1,76 @@
+"""Bounded in-process LRU cache with per-entry expiry."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class ExpiringLRUCache(Generic[V]):
+    """Thread-safe LRU cache whose entries also expire at an absolute time.
+
+    Expired entries are dropped lazily on access; least recently used entries
+    are evicted once ``maxsize`` is reached. A ``maxsize`` of 0 disables it.
+    """
+
+    def __init__(self, maxsize: int, clock: Callable[[], float] = time.time) -> None:
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return a live value for ``key`` or None."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V, expires_at: float) -> None:
+        """Store ``value`` until the absolute time ``expires_at``."""
+        if self.maxsize <= 0 or expires_at <= self._clock():
+            return
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        """Remove ``key`` if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,153 @@
+"""Prometheus metrics.
+
+Metrics are module-level ``prometheus_client`` objects updated in place by
+the code they describe: ``MetricsMiddleware`` (HTTP latency and in-flight
+requests), ``app.db.instrumentation`` (SQL timings and pool usage), the Redis
+clients and the rate engine. ``render_metrics`` produces the ``/metrics``
+body.
+
+With several uvicorn workers each process only sees its own samples. Set
+``PROMETHEUS_MULTIPROC_DIR`` to an empty, writable directory before the
+workers start (wipe it on every deploy): ``prometheus_client`` then writes
+samples to per-process files there and ``render_metrics`` aggregates all of
+them, whichever worker serves the scrape.
+"""
+
+import os
+import time
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# SQL and Redis calls are much faster than HTTP requests
+FAST_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ("method",),
+    multiprocess_mode="livesum",
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ("operation",),
+    buckets=FAST_BUCKETS,
+)
+DB_QUERY_ERRORS = Counter(
+    "db_query_errors_total", "SQL statements that raised", ("operation",)
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Database connections checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Open database connections held by the pool",
+    multiprocess_mode="livesum",
+)
+
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command latency (pipelines count as PIPELINE)",
+    ("command",),
+    buckets=FAST_BUCKETS,
+)
+REDIS_COMMAND_ERRORS = Counter(
+    "redis_command_errors_total",
+    "Redis commands that failed or were rejected by the circuit breaker",
+    ("command",),
+)
+
+RATE_CALCULATIONS = Counter(
+    "rate_calculations_total", "Rate tier calculations", ("method",)
+)
+
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Return the exposition body and its content type."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges (in-flight, pool) at shutdown."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """Record request latency per route template and requests in flight.
+
+    The route label is the matched template (``/users/{id}``), so label
+    cardinality stays bounded; requests that match no route (404s, or
+    rejected by middleware before routing) are labelled ``<unmatched>``.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            HTTP_REQUEST_DURATION.labels(method, route, str(status)).observe(
+                time.perf_counter() - start
+            )
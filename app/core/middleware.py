@@ -0,0 +1,102 @@
+"""Request-scoped ASGI middleware.
+
+Middleware here is written against the raw ASGI interface rather than
+``@app.middleware("http")`` (Starlette's ``BaseHTTPMiddleware``), which runs
+the endpoint in a separate task and re-wraps every response body. These
+classes only look at ``scope`` and intercept the ``http.response.start``
+message to add headers, so streaming responses pass through untouched.
+"""
+
+import logging
+import uuid
+from typing import Iterable, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..db.instrumentation import fingerprint
+from .context import RequestContext, bind_request, reset_request
+
+REQUEST_ID_HEADER = "X-Request-ID"
+DB_QUERIES_HEADER = "X-DB-Queries"
+
+query_logger = logging.getLogger("app.db.queries")
+
+
+def header_value(scope: Scope, name: bytes) -> Optional[str]:
+    """Return a request header from ``scope`` (``name`` lower-case) or None."""
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def send_with_headers(send: Send, headers: Iterable[Tuple[str, str]]) -> Send:
+    """Wrap ``send`` so ``headers`` are appended to the response start."""
+
+    async def wrapped(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            response_headers = MutableHeaders(scope=message)
+            for key, value in headers:
+                response_headers.append(key, value)
+        await send(message)
+
+    return wrapped
+
+
+class RequestContextMiddleware:
+    """Assign each request an id and report its time to first byte.
+
+    An incoming ``X-Request-ID`` is kept (so ids propagate from proxies);
+    otherwise one is generated. The id is stored in ``scope["state"]`` for
+    handlers, bound as the logging ``RequestContext`` and echoed on the
+    response with a ``Server-Timing`` header.
+
+    With ``query_stats`` (debug), the response also reports the queries
+    issued before it started (``X-DB-Queries`` and a ``db`` Server-Timing
+    entry) and each request that queried the database logs its count, DB
+    time and slowest statement fingerprints on ``app.db.queries``.
+    """
+
+    def __init__(self, app: ASGIApp, query_stats: bool = False) -> None:
+        self.app = app
+        self.query_stats = query_stats
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = header_value(scope, b"x-request-id") or uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+        context = RequestContext(request_id, scope["method"], scope["path"], scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(REQUEST_ID_HEADER, request_id)
+                timing = f"app;dur={context.elapsed_ms:.2f}"
+                if self.query_stats:
+                    headers.append(DB_QUERIES_HEADER, str(context.queries))
+                    timing += f", db;dur={context.db_ms:.2f}"
+                headers.append("Server-Timing", timing)
+            await send(message)
+
+        token = bind_request(context)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if self.query_stats and context.queries:
+                _log_queries(context)
+            reset_request(token)
+
+
+def _log_queries(context: RequestContext) -> None:
+    query_logger.info(
+        "%d queries in %.2f ms; slowest: %s",
+        context.queries,
+        context.db_ms,
+        "; ".join(
+            f"{ms:.2f} ms {fingerprint(statement)}" for ms, statement in context.slowest
+        ),
+    )
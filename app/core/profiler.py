@@ -0,0 +1,253 @@
+"""On-demand sampling profiler for single requests.
+
+``ProfilerMiddleware`` profiles a request when it carries
+``X-Profile-Token`` matching ``PROFILER_TOKEN`` or when it is picked by
+``PROFILER_SAMPLE_RATE``. While the request runs, a ``SamplingProfiler``
+thread snapshots the interpreter's thread stacks every interval and counts
+those that pass through ``app`` code, which covers both the event loop
+(router, async endpoints, services called from them) and threadpool
+workers (sync dependencies and repositories).
+
+Output is in the folded-stack format read by ``flamegraph.pl``, speedscope
+and inferno: one ``outer;...;inner count`` line per distinct stack. It is
+written to ``PROFILER_DIR`` (the file name is returned in
+``X-Profile-File``), or, with ``X-Profile-Output: inline`` on a request
+carrying the token, returned as the response body in place of the
+endpoint's response. Sampled requests always write to the directory, so a
+client cannot swap its response for a profile by asking.
+
+Samples are process-wide, so concurrent requests running ``app`` code
+while a profile is taken show up in it too; only one profile runs at a
+time. The middleware is only installed when ``PROFILER_ENABLED`` is set.
+"""
+
+import gc
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Callable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .middleware import header_value
+
+logger = logging.getLogger(__name__)
+
+APP_ROOT = str(Path(__file__).resolve().parents[1]) + os.sep
+_SITE_MARKERS = ("site-packages/", "dist-packages/")
+# Request ids come from a client header; keep file names inside the dir
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(APP_ROOT):
+        filename = "app/" + filename[len(APP_ROOT) :]
+    else:
+        for marker in _SITE_MARKERS:
+            index = filename.find(marker)
+            if index != -1:
+                filename = filename[index + len(marker) :]
+                break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Count folded stacks of threads running ``app`` code.
+
+    Sampling needs the GIL, so while a profile runs the interpreter's
+    switch interval is lowered to ``interval``; otherwise a busy event loop
+    would only yield to the sampler every 5 ms.
+    """
+
+    def __init__(self, interval: float = 0.001, max_depth: int = 128) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._switch_interval = sys.getswitchinterval()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        sys.setswitchinterval(self._switch_interval)
+
+    def sample(self) -> None:
+        own = threading.get_ident()
+        # Before 3.12 a collection run inside _current_frames() can switch
+        # threads while it holds the interpreter's thread list lock, and a
+        # thread starting meanwhile deadlocks against it
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            frames = sys._current_frames()
+        finally:
+            if gc_enabled:
+                gc.enable()
+        for thread_id, frame in frames.items():
+            if thread_id == own:
+                continue
+            labels: List[str] = []
+            in_app = False
+            current: Optional[FrameType] = frame
+            while current is not None and len(labels) < self.max_depth:
+                if current.f_code.co_filename.startswith(APP_ROOT):
+                    in_app = True
+                labels.append(_frame_label(current))
+                current = current.f_back
+            if in_app:
+                labels.reverse()
+                self.stacks[";".join(labels)] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def folded(self) -> str:
+        """Stacks in folded format, most frequent first."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+class ProfilerMiddleware:
+    """Profile requests chosen by admin token header or by sampling."""
+
+    TOKEN_HEADER = b"x-profile-token"
+    OUTPUT_HEADER = b"x-profile-output"
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: Optional[str] = None,
+        sample_rate: float = 0.0,
+        output_dir: str = "profiles",
+        interval: float = 0.001,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self.app = app
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.output_dir = Path(output_dir)
+        self.interval = interval
+        self.rand = rand
+        self._lock = threading.Lock()
+
+    def _selection(self, scope: Scope) -> Optional[str]:
+        """``"token"``, ``"sample"``, or None when the request is not profiled."""
+        if self.token is not None:
+            supplied = header_value(scope, self.TOKEN_HEADER)
+            if supplied is not None:
+                if hmac.compare_digest(supplied.encode("latin-1"), self.token):
+                    return "token"
+                return None
+        if self.sample_rate > 0 and self.rand() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        selection = self._selection(scope) if scope["type"] == "http" else None
+        if selection is None:
+            await self.app(scope, receive, send)
+            return
+        # One profile at a time; overlapping requests run unprofiled
+        if not self._lock.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            if (
+                selection == "token"
+                and header_value(scope, self.OUTPUT_HEADER) == "inline"
+            ):
+                await self._profile_inline(scope, receive, send)
+            else:
+                await self._profile_to_file(scope, receive, send)
+        finally:
+            self._lock.release()
+
+    async def _profile_to_file(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        request_id = scope.get("state", {}).get("request_id") or uuid.uuid4().hex
+        request_id = _UNSAFE_NAME.sub("", request_id)[:64] or uuid.uuid4().hex
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}.folded"
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-File", name)
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            await run_in_threadpool(self._write, name, profiler.folded())
+            logger.info(
+                "profiled %s %s: %d samples -> %s",
+                scope["method"],
+                scope["path"],
+                profiler.samples,
+                name,
+            )
+
+    def _write(self, name: str, folded: str) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        (self.output_dir / name).write_text(folded)
+
+    async def _profile_inline(self, scope: Scope, receive: Receive, send: Send) -> None:
+        status = 500
+
+        async def capture(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = SamplingProfiler(self.interval)
+        profiler.start()
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            profiler.stop()
+        body = profiler.folded().encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-profile-status", str(status).encode()),
+                    (b"x-profile-samples", str(profiler.samples).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
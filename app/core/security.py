@@ -1,18 +1,35 @@
 """Security helpers for JWT and password hashing."""
 
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
 
 import bcrypt
-from jose import JWTError, jwt
 
 from .config import get_settings
+from .lru import ExpiringLRUCache
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+REVOKED_TOKEN_PREFIX = "revoked-token:"
+
+# Verified claims keyed by token digest; entries expire at the token's exp.
+_token_cache: ExpiringLRUCache[Dict[str, Any]] = ExpiringLRUCache(
+    settings.jwt_cache_size
+)
+
+
+T = TypeVar("T")
 
 
 def hash_password(plain_password: str) -> str:
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     return bcrypt.hashpw(plain_password.encode("utf-8"), salt).decode("utf-8")
 
 
@@ -25,6 +42,115 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Return True if a hash was made with a different bcrypt cost factor."""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+
+class PasswordHasherPool:
+    """Runs bcrypt off the event loop on a bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism
+    without the pickling overhead of a process pool. Callers beyond
+    ``workers`` wait on a semaphore; that wait is recorded as queue time.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(1, workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.in_flight = 0
+        self.waiting = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        async with self._semaphore:
+            waited = time.perf_counter() - queued_at
+            self.waiting -= 1
+            self.in_flight += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self._semaphore = None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "workers": self.workers,
+            "completed": self.completed,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "avg_wait_seconds": self.total_wait_seconds / max(1, self.completed),
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+_hasher_pool = PasswordHasherPool(settings.password_hash_workers)
+
+
+async def hash_password_async(plain_password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _hasher_pool.run(hash_password, plain_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _hasher_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Verify a password and rehash it if the configured cost changed.
+
+    Returns ``(valid, new_hash)``; ``new_hash`` is set only when the caller
+    should persist an upgraded hash (typically on successful login).
+    """
+    if not await verify_password_async(plain_password, hashed_password):
+        return False, None
+    if needs_rehash(hashed_password):
+        return True, await hash_password_async(plain_password)
+    return True, None
+
+
+def password_hasher_stats() -> Dict[str, float]:
+    """Return queue-wait and throughput counters for the hashing pool."""
+    return _hasher_pool.stats()
+
+
+def shutdown_password_hasher() -> None:
+    """Stop the hashing thread pool (called on application shutdown)."""
+    _hasher_pool.shutdown()
+
+
 def create_access_token(
     subject: str,
     expires_delta: Optional[timedelta] = None,
@@ -38,6 +164,8 @@ def create_access_token(
     to_encode: Dict[str, Any] = {"sub": subject, "exp": expire}
     if extra_claims:
         to_encode.update(extra_claims)
+    from jose import jwt  # deferred: only needed once tokens are issued
+
     return jwt.encode(
         to_encode,
         settings.security.jwt_secret,
@@ -45,7 +173,13 @@ def create_access_token(
     )
 
 
-def decode_token(token: str) -> Optional[Dict[str, Any]]:
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _verify_token(token: str) -> Optional[Dict[str, Any]]:
+    from jose import JWTError, jwt  # deferred: cache hits never need it
+
     try:
         return jwt.decode(
             token,
@@ -54,3 +188,87 @@ def decode_token(token: str) -> Optional[Dict[str, Any]]:
         )
     except JWTError:
         return None
+
+
+def _cached_claims(token: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Return the token digest and its verified claims (None if invalid)."""
+    digest = _token_digest(token)
+    claims = _token_cache.get(digest)
+    if claims is None:
+        claims = _verify_token(token)
+        if claims is None:
+            return digest, None
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            _token_cache.set(digest, claims, expires_at=float(exp))
+    return digest, claims
+
+
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a JWT and return its claims, or None if invalid.
+
+    Verified claims are cached per token until the token's ``exp``, so a
+    reused token is only signature-checked once per worker. Tokens without
+    ``exp`` are never cached. The revocation check is a blocking Redis call;
+    code on the event loop uses ``decode_token_async``.
+    """
+    digest, claims = _cached_claims(token)
+    if claims is None:
+        return None
+    if settings.jwt_revocation_check and is_token_revoked(digest):
+        return None
+    return dict(claims)
+
+
+async def decode_token_async(token: str) -> Optional[Dict[str, Any]]:
+    """``decode_token`` checking revocation with the asyncio Redis client."""
+    digest, claims = _cached_claims(token)
+    if claims is None:
+        return None
+    if settings.jwt_revocation_check and await is_token_revoked_async(digest):
+        return None
+    return dict(claims)
+
+
+def is_token_revoked(digest: str) -> bool:
+    """Check the Redis revocation list; fails open if Redis is unavailable."""
+    from ..infra.redis import get_redis
+
+    try:
+        return bool(get_redis().exists(REVOKED_TOKEN_PREFIX + digest))
+    except Exception:
+        logger.warning("Token revocation check failed", exc_info=True)
+        return False
+
+
+async def is_token_revoked_async(digest: str) -> bool:
+    """``is_token_revoked`` without blocking the event loop."""
+    from ..infra.redis import get_async_redis
+
+    try:
+        return bool(await get_async_redis().exists(REVOKED_TOKEN_PREFIX + digest))
+    except Exception:
+        logger.warning("Token revocation check failed", exc_info=True)
+        return False
+
+
+def revoke_token(token: str) -> None:
+    """Revoke a token until it expires, across all workers."""
+    from ..infra.redis import get_redis
+
+    digest = _token_digest(token)
+    _token_cache.pop(digest)
+    claims = _verify_token(token)
+    if claims is None:
+        return  # already invalid or expired
+    key = REVOKED_TOKEN_PREFIX + digest
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        get_redis().setex(key, max(1, int(exp - time.time()) + 1), 1)
+    else:
+        get_redis().set(key, 1)
+
+
+def token_cache_stats() -> Dict[str, int]:
+    """Return hit/miss counters for the token verification cache."""
+    return _token_cache.stats()
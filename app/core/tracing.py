@@ -0,0 +1,217 @@
+"""OpenTelemetry tracing across the router, service and repository layers.
+
+Span sites use ``span(name)`` (a context manager), ``@traced(name)`` for
+functions and ``@trace_methods(prefix)`` for repository classes. While
+tracing is off each site costs a global lookup and a ``None`` check:
+``span`` returns a shared no-op object and wrapped functions call straight
+through, so the OpenTelemetry SDK is an optional dependency and is only
+imported once tracing is configured.
+
+``configure_tracing`` builds a tracer provider from settings (ratio
+sampling that follows the caller's decision, console, file or OTLP
+export) and ``TracingMiddleware`` opens the server span for each request,
+continuing a W3C ``traceparent`` sent by the caller. Spans nest through
+``contextvars``, which Starlette copies into the threadpool that runs sync
+dependencies and endpoints, so their spans keep the request as parent.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, TypeVar
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import AppSettings
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.trace.export import SpanExporter
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_tracer: Any = None
+_provider: Any = None
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Any:
+    """Context manager opening a child span of the current one."""
+    tracer = _tracer
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.start_as_current_span(name, attributes=attributes)
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """Run the decorated function (sync or async) in a span."""
+
+    def decorator(fn: F) -> F:
+        span_name = name or fn.__qualname__
+
+        if asyncio.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                tracer = _tracer
+                if tracer is None:
+                    return await fn(*args, **kwargs)
+                with tracer.start_as_current_span(span_name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            with tracer.start_as_current_span(span_name):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def trace_methods(prefix: str) -> Callable[[type], type]:
+    """Class decorator tracing every public method as ``<prefix>.<name>``."""
+
+    def decorator(cls: type) -> type:
+        for attr, value in list(vars(cls).items()):
+            if not attr.startswith("_") and inspect.isfunction(value):
+                setattr(cls, attr, traced(f"{prefix}.{attr}")(value))
+        return cls
+
+    return decorator
+
+
+def _exporter(settings: AppSettings) -> "SpanExporter":
+    if settings.tracing_exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import (  # type: ignore[import-not-found]  # noqa: E501
+            OTLPSpanExporter,
+        )
+
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+    if settings.tracing_exporter == "file":
+        out = open(settings.tracing_file, "a", encoding="utf-8")
+        return ConsoleSpanExporter(
+            out=out, formatter=lambda s: s.to_json(indent=None) + "\n"
+        )
+    return ConsoleSpanExporter()
+
+
+def configure_tracing(
+    settings: AppSettings, exporter: Optional["SpanExporter"] = None
+) -> bool:
+    """Enable tracing per settings; returns whether spans are recorded."""
+    global _tracer, _provider
+    shutdown_tracing()
+    if not settings.tracing_enabled:
+        return False
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("TRACING_ENABLED is set but opentelemetry-sdk is missing")
+        return False
+    _provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.tracing_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_rate)),
+    )
+    _provider.add_span_processor(BatchSpanProcessor(exporter or _exporter(settings)))
+    _tracer = _provider.get_tracer("app")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and turn tracing off."""
+    global _tracer, _provider
+    provider, _provider, _tracer = _provider, None, None
+    if provider is not None:
+        provider.shutdown()
+
+
+class _HeaderGetter:
+    def get(self, carrier: Scope, key: str) -> Optional[list]:
+        name = key.lower().encode("latin-1")
+        values = [v.decode("latin-1") for k, v in carrier["headers"] if k == name]
+        return values or None
+
+    def keys(self, carrier: Scope) -> list:
+        return [k.decode("latin-1") for k, _ in carrier["headers"]]
+
+
+_header_getter = _HeaderGetter()
+
+
+class TracingMiddleware:
+    """Open a server span per request, named by its route template.
+
+    Only installed when tracing is enabled. An incoming ``traceparent``
+    becomes the parent, so the caller's sampling decision is kept.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        tracer = _tracer
+        if scope["type"] != "http" or tracer is None:
+            await self.app(scope, receive, send)
+            return
+
+        from opentelemetry import propagate, trace
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        getter: Any = _header_getter
+        parent = propagate.extract(scope, getter=getter)
+        with tracer.start_as_current_span(
+            method,
+            context=parent,
+            kind=trace.SpanKind.SERVER,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as server_span:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    server_span.update_name(f"{method} {route}")
+                    server_span.set_attribute("http.route", route)
+                server_span.set_attribute("http.response.status_code", status)
+                if status >= 500:
+                    server_span.set_status(trace.StatusCode.ERROR)
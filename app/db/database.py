@@ -1,13 +1,25 @@
-"""Database configuration and session management."""
+"""Database configuration and session management.
 
-from typing import Generator
+The engine is created on first use, once per process: ``get_engine``
+builds it lazily, so importing the app opens no connections. When the
+process forks (a pre-fork server preloading the app, see
+``gunicorn.conf.py``), the child drops the pool it inherited without
+closing the parent's connections and opens its own on demand; sockets are
+never shared across processes.
+"""
+
+import os
+import threading
+from typing import Generator, Optional
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from ..core.config import get_settings
 from ..models.base import Base
+from .instrumentation import instrument_engine
 
 settings = get_settings()
 
@@ -19,6 +31,8 @@ def _create_engine_url() -> str:
 def _engine_connect_args(url: str) -> dict:
     if url.startswith("sqlite"):
         return {"check_same_thread": False}
+    if url.startswith("postgresql"):
+        return {"connect_timeout": settings.db_connect_timeout}
     return {}
 
 
@@ -30,27 +44,71 @@ def _engine_pool_class(url: str):
 
 DATABASE_URL = _create_engine_url()
 
-engine_kwargs = {
-    "connect_args": _engine_connect_args(DATABASE_URL),
-}
-pool_class = _engine_pool_class(DATABASE_URL)
-if pool_class is not None:
-    engine_kwargs["poolclass"] = pool_class
+_engine: Optional[Engine] = None
+_engine_pid: Optional[int] = None
+_engine_lock = threading.Lock()
+
+# Unbound: sessions are bound to this process's engine in get_db
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+
+def _build_engine(url: str) -> Engine:
+    engine_kwargs = {
+        "connect_args": _engine_connect_args(url),
+    }
+    pool_class = _engine_pool_class(url)
+    if pool_class is not None:
+        engine_kwargs["poolclass"] = pool_class
+    engine = create_engine(url, **engine_kwargs)
+    instrument_engine(engine, settings.db_slow_query_ms)
+    return engine
+
+
+def get_engine() -> Engine:
+    """Return this process's engine, creating it on first use."""
+    global _engine, _engine_pid
+    engine = _engine
+    if engine is not None and _engine_pid == os.getpid():
+        return engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = _build_engine(DATABASE_URL)
+        elif _engine_pid != os.getpid():
+            # Forked without the at-fork hook (e.g. os.fork in a test)
+            _engine.dispose(close=False)
+        _engine_pid = os.getpid()
+        return _engine
+
+
+def dispose_engine() -> None:
+    """Close this process's pooled connections (worker shutdown)."""
+    if _engine is not None and _engine_pid == os.getpid():
+        _engine.dispose()
+
+
+def _after_fork_in_child() -> None:
+    global _engine_pid, _engine_lock
+    # Another thread may have held the lock at fork time
+    _engine_lock = threading.Lock()
+    if _engine is not None:
+        # Forget the parent's connections without closing them: the
+        # parent still owns those sockets
+        _engine.dispose(close=False)
+        _engine_pid = os.getpid()
 
-engine = create_engine(DATABASE_URL, **engine_kwargs)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+os.register_at_fork(after_in_child=_after_fork_in_child)
 
 
 def create_tables() -> None:
     """Create all database tables. Use only in development."""
     if settings.environment == "development":
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
 
 
 def get_db() -> Generator[Session, None, None]:
     """Yield a database session for request scope."""
-    db = SessionLocal()
+    db = SessionLocal(bind=get_engine())
     try:
         yield db
     finally:
@@ -0,0 +1,115 @@
+"""SQLAlchemy engine instrumentation.
+
+``instrument_engine`` times every statement once and feeds three consumers:
+the Prometheus query and pool metrics, the current request's query stats
+(count, total time and slowest statements; see ``RequestContext``) and the
+slow-query log, which records statements over a threshold as normalized
+fingerprints so repeated shapes group together.
+"""
+
+import logging
+import re
+import time
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..core.context import current_request
+from ..core.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CONNECTIONS,
+    DB_QUERY_DURATION,
+    DB_QUERY_ERRORS,
+)
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+_SQL_OPERATIONS = frozenset(
+    ("SELECT", "INSERT", "UPDATE", "DELETE", "BEGIN", "COMMIT", "ROLLBACK")
+)
+
+_FINGERPRINT_RULES = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # string literals
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+"), "?"),  # bind params
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),  # numbers
+    (re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I), "IN (?+)"),
+    (re.compile(r"\s+"), " "),
+)
+
+
+def sql_operation(statement: str) -> str:
+    """Label for a statement: its leading keyword, or OTHER."""
+    operation = statement.lstrip()[:8].split(None, 1)
+    verb = operation[0].upper() if operation else ""
+    return verb if verb in _SQL_OPERATIONS else "OTHER"
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    """Normalize a statement: literals and parameters become ``?``.
+
+    ``IN`` lists of any length collapse to ``(?+)``, so the same query with
+    different values or list sizes has one fingerprint.
+    """
+    for pattern, replacement in _FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def instrument_engine(engine: Engine, slow_query_ms: Optional[float] = None) -> None:
+    """Time statements and track pool usage for ``engine``.
+
+    Statements taking at least ``slow_query_ms`` are logged as warnings on
+    ``app.db.slow_query`` (``None`` or 0 disables the log).
+    """
+    threshold = slow_query_ms / 1000 if slow_query_ms else None
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn: Any, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Any, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_DURATION.labels(sql_operation(statement)).observe(elapsed)
+        context = current_request()
+        if context is not None:
+            context.record_query(statement, elapsed * 1000)
+        if threshold is not None and elapsed >= threshold:
+            slow_query_logger.warning(
+                "slow query (%.1f ms): %s", elapsed * 1000, fingerprint(statement)
+            )
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: Any) -> None:
+        connection = context.connection
+        starts = connection.info.get("query_start") if connection else None
+        if starts:
+            starts.pop()
+        DB_QUERY_ERRORS.labels(sql_operation(context.statement or "")).inc()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(*args: Any) -> None:
+        DB_POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(*args: Any) -> None:
+        DB_POOL_CHECKED_OUT.dec()
+
+    @event.listens_for(engine, "connect")
+    def _connect(*args: Any) -> None:
+        DB_POOL_CONNECTIONS.inc()
+
+    @event.listens_for(engine, "close")
+    def _close(*args: Any) -> None:
+        DB_POOL_CONNECTIONS.dec()
+
+    @event.listens_for(engine, "close_detached")
+    def _close_detached(*args: Any) -> None:
+        DB_POOL_CONNECTIONS.dec()
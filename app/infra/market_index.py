@@ -0,0 +1,448 @@
+"""Market index shared by all worker processes through a memory-mapped file.
+
+The index holds, per segment (project type, experience level, location),
+the latest ``MarketStatistics`` baselines combined across data sources and
+a percentile distribution derived from them. It is written as one flat,
+array-backed file:
+
+    header   magic, version, field count, segment count, keys size, built at
+    offsets  uint32[count + 1] into the key blob
+    keys     UTF-8 segment keys, sorted bytewise
+    values   float64[count][FIELDS], 8-byte aligned
+
+Every worker maps the file read-only; the pages live once in the OS page
+cache whatever the worker count. Lookups binary-search the keys and unpack
+one row straight from the mapping, so nothing is deserialized up front.
+
+One process rebuilds it: ``MarketIndexRefresher`` runs in every worker but
+only the holder of an exclusive ``flock`` on ``<path>.lock`` queries the
+database, so refresh load does not grow with workers (if the holder exits,
+the lock is released and another worker takes over). A rebuild is written
+to a temporary file and renamed over the index; readers notice the new
+inode and remap, while mappings of the old file stay valid until dropped.
+"""
+
+import fcntl
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..db.database import SessionLocal, dispose_engine, get_engine
+from ..models.market_statistics import MarketStatistics
+from .warmup import register_warmer
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MAGIC = b"QEEMMKT\x00"
+VERSION = 1
+
+# Value columns, in file order
+FIELDS = (
+    "average_rate",
+    "median_rate",
+    "min_rate",
+    "max_rate",
+    "rate_std_dev",
+    "p10",
+    "p25",
+    "p50",
+    "p75",
+    "p90",
+    "sample_size",
+    "demand_score",
+    "competition_score",
+)
+PERCENTILES = {"p10": -1.2816, "p25": -0.6745, "p75": 0.6745, "p90": 1.2816}
+
+_HEADER = struct.Struct("<8sHHIId")
+_OFFSET = struct.Struct("<I")
+_ROW = struct.Struct(f"<{len(FIELDS)}d")
+_KEY_SEPARATOR = "\x1f"
+
+SegmentKey = Tuple[str, str, str]
+
+
+class MarketSegment(NamedTuple):
+    """Market figures for one segment (EGP/hour; NaN when unknown)."""
+
+    average_rate: float
+    median_rate: float
+    min_rate: float
+    max_rate: float
+    rate_std_dev: float
+    p10: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+    sample_size: float
+    demand_score: float
+    competition_score: float
+
+
+def _key_bytes(project_type: str, experience_level: str, location: str) -> bytes:
+    return _KEY_SEPARATOR.join((project_type, experience_level, location)).encode()
+
+
+def _weighted(values: Sequence[Tuple[Optional[float], int]]) -> float:
+    known = [(value, weight) for value, weight in values if value is not None]
+    total = sum(weight for _, weight in known)
+    if not total:
+        return math.nan
+    return sum(value * weight for value, weight in known) / total
+
+
+def combine_statistics(rows: Sequence[Any]) -> MarketSegment:
+    """Merge one segment's rows (one per data source) into a ``MarketSegment``.
+
+    Rates are weighted by sample size and deviations pooled; percentiles
+    assume roughly normal rates, clipped to the observed range, and fall
+    back to interpolating between min, median and max without a deviation.
+    """
+    weights = [max(int(row.sample_size or 0), 1) for row in rows]
+    total = sum(weights)
+    average = _weighted([(row.average_rate, w) for row, w in zip(rows, weights)])
+    median = _weighted([(row.median_rate, w) for row, w in zip(rows, weights)])
+    low = min(row.min_rate for row in rows)
+    high = max(row.max_rate for row in rows)
+    if all(row.rate_std_dev is not None for row in rows):
+        variance = sum(
+            w * (row.rate_std_dev**2 + (row.average_rate - average) ** 2)
+            for row, w in zip(rows, weights)
+        )
+        std_dev = math.sqrt(variance / total)
+    else:
+        std_dev = math.nan
+
+    percentiles: Dict[str, float] = {}
+    for name, z in PERCENTILES.items():
+        if math.isnan(std_dev):
+            edge = low if z < 0 else high
+            estimate = median + (edge - median) * (0.8 if abs(z) > 1 else 0.5)
+        else:
+            estimate = average + z * std_dev
+        percentiles[name] = min(max(estimate, low), high)
+
+    return MarketSegment(
+        average_rate=average,
+        median_rate=median,
+        min_rate=low,
+        max_rate=high,
+        rate_std_dev=std_dev,
+        p50=median,
+        sample_size=float(total),
+        demand_score=_weighted(
+            [(row.demand_score, w) for row, w in zip(rows, weights)]
+        ),
+        competition_score=_weighted(
+            [(row.competition_score, w) for row, w in zip(rows, weights)]
+        ),
+        **percentiles,
+    )
+
+
+def load_segments(db: Session) -> Dict[SegmentKey, MarketSegment]:
+    """Latest statistics per segment, combined across data sources."""
+    segment = (
+        MarketStatistics.project_type,
+        MarketStatistics.experience_level,
+        MarketStatistics.location,
+    )
+    latest = (
+        select(*segment, func.max(MarketStatistics.date).label("date"))
+        .group_by(*segment)
+        .subquery()
+    )
+    rows = db.scalars(
+        select(MarketStatistics).join(
+            latest,
+            (MarketStatistics.project_type == latest.c.project_type)
+            & (MarketStatistics.experience_level == latest.c.experience_level)
+            & (MarketStatistics.location == latest.c.location)
+            & (MarketStatistics.date == latest.c.date),
+        )
+    ).all()
+    grouped: Dict[SegmentKey, List[Any]] = {}
+    for row in rows:
+        key = (str(row.project_type), str(row.experience_level), str(row.location))
+        grouped.setdefault(key, []).append(row)
+    return {key: combine_statistics(group) for key, group in grouped.items()}
+
+
+def encode_index(
+    segments: Dict[SegmentKey, MarketSegment], built_at: Optional[float] = None
+) -> bytes:
+    """Serialize ``segments`` to the index file format."""
+    items = sorted((_key_bytes(*key), values) for key, values in segments.items())
+    offsets = [0]
+    for key, _ in items:
+        offsets.append(offsets[-1] + len(key))
+    keys = b"".join(key for key, _ in items)
+    head = (
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(FIELDS),
+            len(items),
+            len(keys),
+            time.time() if built_at is None else built_at,
+        )
+        + b"".join(_OFFSET.pack(offset) for offset in offsets)
+        + keys
+    )
+    padding = b"\0" * (-len(head) % 8)
+    return head + padding + b"".join(_ROW.pack(*values) for _, values in items)
+
+
+def write_index(path: Path, segments: Dict[SegmentKey, MarketSegment]) -> None:
+    """Write the index next to ``path`` and rename it into place atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as out:
+            out.write(encode_index(segments))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+@dataclass(frozen=True)
+class _Mapping:
+    mm: mmap.mmap
+    identity: Tuple[int, int]
+    count: int
+    keys_start: int
+    values_start: int
+    built_at: float
+
+    @classmethod
+    def open(cls, path: Path) -> "_Mapping":
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, fields, count, keys_size, built_at = _HEADER.unpack_from(mm)
+        if magic != MAGIC or version != VERSION or fields != len(FIELDS):
+            raise ValueError(f"{path} is not a version {VERSION} market index")
+        keys_start = _HEADER.size + _OFFSET.size * (count + 1)
+        values_start = keys_start + keys_size + (-(keys_start + keys_size) % 8)
+        if len(mm) != values_start + count * _ROW.size:
+            raise ValueError(f"{path} is truncated")
+        return cls(
+            mm, (stat.st_dev, stat.st_ino), count, keys_start, values_start, built_at
+        )
+
+    def _key(self, index: int) -> bytes:
+        start, end = struct.unpack_from(
+            "<II", self.mm, _HEADER.size + _OFFSET.size * index
+        )
+        return self.mm[self.keys_start + start : self.keys_start + end]
+
+    def find(self, key: bytes) -> Optional[MarketSegment]:
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._key(lo) == key:
+            return MarketSegment._make(
+                _ROW.unpack_from(self.mm, self.values_start + lo * _ROW.size)
+            )
+        return None
+
+
+class MarketIndex:
+    """Read-only view of the index file, remapped when it is replaced.
+
+    The file is checked for replacement at most every ``check_interval``
+    seconds, so lookups normally cost a binary search over the mapping.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        check_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.clock = clock
+        self._mapping: Optional[_Mapping] = None
+        self._checked_at = -math.inf
+
+    def _current(self) -> Optional[_Mapping]:
+        now = self.clock()
+        if now - self._checked_at < self.check_interval:
+            return self._mapping
+        self._checked_at = now
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self._mapping
+        mapping = self._mapping
+        if mapping is None or mapping.identity != (stat.st_dev, stat.st_ino):
+            try:
+                # The old mapping is not closed: other threads may be reading
+                # it; it is unmapped once no longer referenced
+                self._mapping = mapping = _Mapping.open(self.path)
+            except (OSError, ValueError):
+                logger.warning("cannot map market index %s", self.path, exc_info=True)
+        return mapping
+
+    def lookup(
+        self, project_type: str, experience_level: str, location: str
+    ) -> Optional[MarketSegment]:
+        """Figures for a segment, or None if unknown or no index exists yet."""
+        mapping = self._current()
+        if mapping is None:
+            return None
+        return mapping.find(_key_bytes(project_type, experience_level, location))
+
+    def __len__(self) -> int:
+        mapping = self._current()
+        return 0 if mapping is None else mapping.count
+
+    @property
+    def built_at(self) -> Optional[float]:
+        mapping = self._current()
+        return None if mapping is None else mapping.built_at
+
+    def reload(self) -> None:
+        """Check for a replaced file on the next lookup."""
+        self._checked_at = -math.inf
+
+
+def refresh_index(path: Path, session_factory: Callable[[], Session]) -> int:
+    """Rebuild the index from the database; returns the segment count."""
+    db = session_factory()
+    try:
+        segments = load_segments(db)
+    finally:
+        db.close()
+    write_index(path, segments)
+    return len(segments)
+
+
+class MarketIndexRefresher:
+    """Background thread rebuilding the index when this process owns the lock."""
+
+    def __init__(
+        self,
+        path: Path,
+        session_factory: Callable[[], Session],
+        interval: float = 300.0,
+    ) -> None:
+        self.path = Path(path)
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_fd: Optional[int] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_fd is not None
+
+    def try_acquire(self) -> bool:
+        """Take the refresher role if no other process holds it."""
+        if self._lock_fd is not None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)  # closing drops the flock
+            self._lock_fd = None
+
+    def refresh_if_stale(self) -> bool:
+        """Rebuild if this process is the refresher and the index is old."""
+        if not self.try_acquire():
+            return False
+        try:
+            age = time.time() - os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            age = math.inf
+        if age < self.interval:
+            return False
+        count = refresh_index(self.path, self.session_factory)
+        logger.info("market index rebuilt: %d segments", count)
+        return True
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="market-index-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+        self.release()
+
+    def _run(self) -> None:
+        # Followers retry for the lock at a fraction of the interval so a
+        # new refresher takes over soon after the old one exits
+        while not self._stop.is_set():
+            try:
+                self.refresh_if_stale()
+            except Exception:
+                logger.warning("market index refresh failed", exc_info=True)
+            self._stop.wait(min(self.interval, 30.0))
+
+
+def _session_factory() -> Session:
+    return SessionLocal(bind=get_engine())
+
+
+market_index = MarketIndex(
+    Path(settings.market_index_path), settings.market_index_check_interval
+)
+market_index_refresher = MarketIndexRefresher(
+    Path(settings.market_index_path),
+    _session_factory,
+    settings.market_index_refresh_interval,
+)
+
+
+@register_warmer("market_index")
+def warm_market_index() -> None:
+    """Build a missing or stale index before the workers fork, and map it."""
+    if not settings.market_index_enabled:
+        return
+    try:
+        market_index_refresher.refresh_if_stale()
+    finally:
+        # Children must not inherit the lock or the pooled connection
+        market_index_refresher.release()
+        dispose_engine()
+    market_index.reload()
+    len(market_index)
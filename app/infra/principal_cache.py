@@ -0,0 +1,153 @@
+"""Two-tier cache of authenticated principals.
+
+Authenticated requests need a user's id, role and active/verified flags, not
+the full ORM row. Principals are cached in a small per-worker LRU (bounded
+staleness via a short TTL), backed by Redis when ``PRINCIPAL_CACHE_REDIS``
+is set. Writes through ``UserRepository`` invalidate both tiers and, with
+Redis, broadcast the user id over pub/sub so every worker drops its local
+copy.
+"""
+
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from ..core.config import get_settings
+from ..core.lru import ExpiringLRUCache
+from .redis import get_redis
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PRINCIPAL_KEY_PREFIX = "principal:"
+INVALIDATION_CHANNEL = "principal-invalidations"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authorization-relevant view of a user."""
+
+    id: int
+    role: str
+    is_active: bool
+    is_verified: bool
+
+
+_local: ExpiringLRUCache[Principal] = ExpiringLRUCache(settings.principal_cache_size)
+
+
+def get_cached_principal(user_id: int) -> Optional[Principal]:
+    """Look up a principal in the local tier, then Redis."""
+    principal = _local.get(user_id)
+    if principal is not None or not settings.principal_cache_redis:
+        return principal
+    try:
+        raw = get_redis().get(PRINCIPAL_KEY_PREFIX + str(user_id))
+    except Exception:
+        logger.warning("Principal cache read failed", exc_info=True)
+        return None
+    if raw is None:
+        return None
+    principal = Principal(**json.loads(str(raw)))
+    _local.set(user_id, principal, time.time() + settings.principal_cache_ttl_seconds)
+    return principal
+
+
+def cache_principal(principal: Principal) -> None:
+    """Store a principal freshly loaded from the database in both tiers."""
+    _local.set(
+        principal.id, principal, time.time() + settings.principal_cache_ttl_seconds
+    )
+    if not settings.principal_cache_redis:
+        return
+    try:
+        get_redis().setex(
+            PRINCIPAL_KEY_PREFIX + str(principal.id),
+            settings.principal_redis_ttl_seconds,
+            json.dumps(asdict(principal)),
+        )
+    except Exception:
+        logger.warning("Principal cache write failed", exc_info=True)
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop a principal everywhere and notify other workers."""
+    _local.pop(user_id)
+    if not settings.principal_cache_redis:
+        return
+    try:
+        redis = get_redis()
+        redis.delete(PRINCIPAL_KEY_PREFIX + str(user_id))
+        redis.publish(INVALIDATION_CHANNEL, str(user_id))
+    except Exception:
+        # Other workers still expire their copy after the local TTL.
+        logger.warning("Principal invalidation failed", exc_info=True)
+
+
+def principal_cache_stats() -> dict:
+    """Return hit/miss counters for the local tier."""
+    return _local.stats()
+
+
+class InvalidationListener:
+    """Background thread applying pub/sub invalidations to the local tier.
+
+    While Redis is unreachable it retries with exponential backoff, warning
+    once per outage. The local tier is cleared when the subscription is
+    re-established, since invalidations published meanwhile were missed.
+    """
+
+    def __init__(
+        self, retry_seconds: float = 1.0, max_retry_seconds: float = 60.0
+    ) -> None:
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None or not settings.principal_cache_redis:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="principal-invalidations", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                pubsub = get_redis().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                if failures:
+                    _local.clear()
+                    logger.info("Principal invalidation listener reconnected")
+                    failures = 0
+                try:
+                    while not self._stop.is_set():
+                        message = pubsub.get_message(timeout=1.0)
+                        if message is not None:
+                            _local.pop(int(message["data"]))
+                finally:
+                    pubsub.close()
+            except Exception:
+                if not failures:
+                    logger.warning(
+                        "Principal invalidation listener error", exc_info=True
+                    )
+                delay = min(self.retry_seconds * 2**failures, self.max_retry_seconds)
+                failures += 1
+                self._stop.wait(delay)
+
+
+invalidation_listener = InvalidationListener()
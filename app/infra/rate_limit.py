@@ -0,0 +1,496 @@
+"""Redis rate limiting (GCRA).
+
+``RedisRateLimiter`` decides every request with a single EVALSHA round
+trip: the Lua script reads the key's theoretical arrival time (TAT),
+decides, and writes the new TAT atomically, using the Redis server clock
+so workers never disagree.
+
+``HybridRateLimiter`` keeps a small local token bucket per key on each
+worker and reconciles consumed tokens with the same GCRA state in batched
+pipelines, so hot keys touch Redis once per batch instead of per request.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from redis.exceptions import RedisError
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..core.config import AppSettings
+from ..core.middleware import header_value, send_with_headers
+from .redis import CircuitOpenError
+from ..core.security import decode_token_async
+
+# KEYS[1] = bucket key; ARGV[1] = emission interval (ms), ARGV[2] = burst.
+# Returns {allowed, remaining, retry_after_ms, reset_after_ms}.
+GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local tolerance = emission * tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+  tat = now
+end
+local new_tat = tat + emission
+local allow_at = new_tat - tolerance
+if now < allow_at then
+  return {0, 0, allow_at - now, tat - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((tolerance - (new_tat - now)) / emission), 0, new_tat - now}
+"""
+
+# Force-consume ARGV[3] tokens already admitted locally, then report.
+# KEYS[1] = bucket key; ARGV[1] = emission interval (ms), ARGV[2] = burst,
+# ARGV[3] = tokens consumed. Returns {remaining, retry_after_ms, reset_after_ms};
+# remaining may be negative when workers over-admitted.
+GCRA_CONSUME_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local tolerance = emission * tonumber(ARGV[2])
+local consumed = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+  tat = now
+end
+if consumed > 0 then
+  tat = tat + emission * consumed
+  redis.call('SET', KEYS[1], tat, 'PX', tat - now)
+end
+local retry = tat - now + emission - tolerance
+if retry < 0 then
+  retry = 0
+end
+return {math.floor((tolerance - (tat - now)) / emission), retry, tat - now}
+"""
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``limit`` requests per ``period_seconds``."""
+
+    limit: int
+    period_seconds: int
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse ``"<count>/<second|minute|hour|day>"``, e.g. ``"100/hour"``."""
+        count, _, period = value.strip().partition("/")
+        period = period.strip().lower().rstrip("s")
+        if period not in _PERIODS or not count.strip().isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        return cls(int(count), _PERIODS[period])
+
+    @property
+    def emission_ms(self) -> int:
+        return max(1, math.ceil(self.period_seconds * 1000 / self.limit))
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float  # seconds until the next request would be allowed
+    reset_after: float  # seconds until the bucket is fully replenished
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+class RateLimitPolicy:
+    """Chooses the bucket key and limit for a request.
+
+    Authenticated requests are keyed by token subject, others by client
+    address. The most specific matching route prefix wins; per-principal
+    overrides take precedence over everything else.
+    """
+
+    def __init__(
+        self,
+        anonymous: RateLimit,
+        authenticated: RateLimit,
+        routes: Optional[Dict[str, RateLimit]] = None,
+        principals: Optional[Dict[str, RateLimit]] = None,
+    ) -> None:
+        self.anonymous = anonymous
+        self.authenticated = authenticated
+        self.principals = principals or {}
+        # Longest prefix first so the most specific rule matches
+        self._routes: List[Tuple[str, RateLimit]] = sorted(
+            (routes or {}).items(), key=lambda item: len(item[0]), reverse=True
+        )
+
+    @classmethod
+    def from_settings(cls, settings: AppSettings) -> "RateLimitPolicy":
+        def _parse_map(raw: str) -> Dict[str, RateLimit]:
+            parsed = json.loads(raw) if raw.strip() else {}
+            return {str(k): RateLimit.parse(v) for k, v in parsed.items()}
+
+        return cls(
+            anonymous=RateLimit.parse(settings.rate_limit_default),
+            authenticated=RateLimit.parse(settings.rate_limit_authenticated),
+            routes=_parse_map(settings.rate_limit_routes),
+            principals=_parse_map(settings.rate_limit_principals),
+        )
+
+    async def resolve(
+        self, path: str, client_host: str, authorization: Optional[str] = None
+    ) -> Tuple[str, RateLimit]:
+        """Return the Redis key and limit for a request."""
+        subject = await _token_subject(authorization)
+        scope, rate = path, None
+        for prefix, route_rate in self._routes:
+            if path.startswith(prefix):
+                scope, rate = prefix, route_rate
+                break
+        if subject is not None:
+            identity = f"user:{subject}"
+            rate = self.principals.get(subject) or rate or self.authenticated
+        else:
+            identity = f"ip:{client_host}"
+            rate = rate or self.anonymous
+        return f"ratelimit:{identity}:{scope}", rate
+
+
+async def _token_subject(authorization: Optional[str]) -> Optional[str]:
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    claims = await decode_token_async(authorization[7:].strip())
+    if not claims or claims.get("sub") is None:
+        return None
+    return str(claims["sub"])
+
+
+def _client_getter(redis) -> Callable[[], Any]:
+    """Accept a client or a zero-argument factory returning the current one."""
+    return redis if callable(redis) else lambda: redis
+
+
+class _ClientScript:
+    """Lua script registered against whichever client is current."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._client: Any = None
+        self._script: Any = None
+
+    def bind(self, client: Any) -> Any:
+        if client is not self._client:
+            self._script = client.register_script(self.source)
+            self._client = client
+        return self._script
+
+
+class RedisRateLimiter:
+    """Runs the GCRA script on an asyncio Redis client.
+
+    ``redis`` may be a client or a factory such as ``get_async_redis`` so the
+    limiter follows the client created in the application lifespan.
+    """
+
+    def __init__(self, redis) -> None:
+        self._get_client = _client_getter(redis)
+        self._script = _ClientScript(GCRA_SCRIPT)
+
+    def start(self) -> None:
+        """No background work; present for parity with HybridRateLimiter."""
+
+    async def stop(self) -> None:
+        """No background work; present for parity with HybridRateLimiter."""
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        script = self._script.bind(self._get_client())
+        allowed, remaining, retry_ms, reset_ms = await script(
+            keys=[key], args=[rate.emission_ms, rate.limit]
+        )
+        return RateLimitDecision(
+            allowed=bool(allowed),
+            limit=rate.limit,
+            remaining=int(remaining),
+            retry_after=int(retry_ms) / 1000,
+            reset_after=int(reset_ms) / 1000,
+        )
+
+
+@dataclass
+class _LocalBucket:
+    rate: RateLimit
+    tokens: int = 0  # admissions this worker may grant without Redis
+    pending: int = 0  # admissions not yet reported to Redis
+    remaining: int = 0  # global remaining as of the last sync
+    reset_after: float = 0.0
+    blocked_until: float = 0.0
+    last_used: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class HybridRateLimiter:
+    """Two-tier limiter: local token buckets reconciled with Redis GCRA state.
+
+    Each worker may admit up to ``ceil(limit * tolerance)`` requests per key
+    between syncs, taken only from the global remaining it last observed, so
+    global over-admission is bounded by that amount per concurrent worker.
+    Buckets are refreshed in one pipeline per ``sync_interval`` by the
+    background task; a bucket that runs dry syncs immediately, and denied
+    keys are answered locally until their retry time.
+    """
+
+    def __init__(
+        self,
+        redis,
+        tolerance: float = 0.05,
+        sync_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._get_client = _client_getter(redis)
+        self._script = _ClientScript(GCRA_CONSUME_SCRIPT)
+        self.tolerance = tolerance
+        self.sync_interval = sync_interval
+        self._clock = clock
+        self._buckets: Dict[str, _LocalBucket] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.local_decisions = 0
+        self.redis_round_trips = 0
+
+    def _budget(self, rate: RateLimit) -> int:
+        return max(1, math.ceil(rate.limit * self.tolerance))
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.rate != rate:
+            bucket = self._buckets[key] = _LocalBucket(rate=rate)
+        bucket.last_used = now
+        if bucket.tokens <= 0 and now >= bucket.blocked_until:
+            async with bucket.lock:
+                if bucket.tokens <= 0 and self._clock() >= bucket.blocked_until:
+                    await self._sync({key: bucket})
+        else:
+            self.local_decisions += 1
+        if bucket.tokens <= 0:
+            return RateLimitDecision(
+                allowed=False,
+                limit=rate.limit,
+                remaining=0,
+                retry_after=max(0.0, bucket.blocked_until - self._clock()),
+                reset_after=bucket.reset_after,
+            )
+        bucket.tokens -= 1
+        bucket.pending += 1
+        return RateLimitDecision(
+            allowed=True,
+            limit=rate.limit,
+            remaining=max(0, bucket.remaining - bucket.pending),
+            retry_after=0.0,
+            reset_after=bucket.reset_after,
+        )
+
+    async def _sync(self, buckets: Dict[str, _LocalBucket]) -> None:
+        """Report pending admissions and refill local tokens in one pipeline."""
+        sent = {key: bucket.pending for key, bucket in buckets.items()}
+        client = self._get_client()
+        script = self._script.bind(client)
+        pipe = client.pipeline(transaction=False)
+        for key, bucket in buckets.items():
+            await script(
+                keys=[key],
+                args=[bucket.rate.emission_ms, bucket.rate.limit, sent[key]],
+                client=pipe,
+            )
+        results = await pipe.execute()
+        self.redis_round_trips += 1
+        now = self._clock()
+        for (key, bucket), (remaining, retry_ms, reset_ms) in zip(
+            buckets.items(), results
+        ):
+            bucket.pending -= sent[key]
+            # Admissions made while the pipeline was in flight use up tokens
+            bucket.remaining = int(remaining) - bucket.pending
+            bucket.tokens = min(self._budget(bucket.rate), bucket.remaining)
+            bucket.reset_after = int(reset_ms) / 1000
+            bucket.blocked_until = (
+                now + int(retry_ms) / 1000 if bucket.tokens <= 0 else 0.0
+            )
+
+    async def flush(self) -> None:
+        """Reconcile buckets with pending or exhausted tokens; drop idle ones.
+
+        Buckets already syncing under their lock (a ``hit`` that ran dry) are
+        skipped; the rest are locked for the round trip so a concurrent
+        ``hit`` cannot report the same pending admissions twice.
+        """
+        now = self._clock()
+        idle_after = max(self.sync_interval * 10, 60.0)
+        due: Dict[str, _LocalBucket] = {}
+        for key, bucket in list(self._buckets.items()):
+            if bucket.lock.locked():
+                continue
+            if bucket.pending > 0 or (
+                bucket.tokens <= 0 and now >= bucket.blocked_until
+            ):
+                due[key] = bucket
+            elif now - bucket.last_used > idle_after:
+                del self._buckets[key]
+        if not due:
+            return
+        # An unlocked asyncio.Lock is acquired without yielding to the loop
+        for bucket in due.values():
+            await bucket.lock.acquire()
+        try:
+            await self._sync(due)
+        finally:
+            for bucket in due.values():
+                bucket.lock.release()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.flush()
+            except CircuitOpenError:
+                pass  # pending admissions are reported once Redis is back
+            except Exception:
+                logger.warning("Rate limit reconciliation failed", exc_info=True)
+
+    def start(self) -> None:
+        """Start periodic reconciliation on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop reconciliation and report any pending admissions."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if any(bucket.pending for bucket in self._buckets.values()):
+            await self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "buckets": len(self._buckets),
+            "local_decisions": self.local_decisions,
+            "redis_round_trips": self.redis_round_trips,
+        }
+
+
+class LocalRateLimiter:
+    """In-process GCRA used while Redis is unavailable.
+
+    Limits apply per worker, so the effective global limit is looser by
+    the number of workers until Redis is back. At most ``max_keys`` keys
+    are tracked; the least recently used are forgotten first.
+    """
+
+    def __init__(
+        self, max_keys: int = 10000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_keys = max_keys
+        self._clock = clock
+        self._tat: "OrderedDict[str, float]" = OrderedDict()
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        now = self._clock()
+        emission = rate.emission_ms / 1000
+        tolerance = emission * rate.limit
+        tat = max(self._tat.get(key, now), now)
+        new_tat = tat + emission
+        allow_at = new_tat - tolerance
+        if now < allow_at:
+            return RateLimitDecision(False, rate.limit, 0, allow_at - now, tat - now)
+        self._tat[key] = new_tat
+        self._tat.move_to_end(key)
+        while len(self._tat) > self.max_keys:
+            self._tat.popitem(last=False)
+        return RateLimitDecision(
+            allowed=True,
+            limit=rate.limit,
+            remaining=int((tolerance - (new_tat - now)) / emission),
+            retry_after=0.0,
+            reset_after=new_tat - now,
+        )
+
+
+def build_rate_limiter(
+    settings: AppSettings, redis
+) -> Union[RedisRateLimiter, HybridRateLimiter]:
+    """Create the limiter selected by ``RATE_LIMIT_MODE``."""
+    if settings.rate_limit_mode == "hybrid":
+        return HybridRateLimiter(
+            redis,
+            tolerance=settings.rate_limit_tolerance,
+            sync_interval=settings.rate_limit_sync_interval,
+        )
+    return RedisRateLimiter(redis)
+
+
+class RateLimitMiddleware:
+    """Pure ASGI middleware applying ``policy`` through ``limiter``.
+
+    Denied requests get a 429 without reaching the app; allowed responses
+    (streaming included) pass through with the rate limit headers added.
+    When Redis fails (including while its circuit breaker is open) the
+    request is decided by the in-process ``fallback`` limiter instead.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        policy: RateLimitPolicy,
+        limiter: Union[RedisRateLimiter, HybridRateLimiter],
+        fallback: Optional[LocalRateLimiter] = None,
+    ) -> None:
+        self.app = app
+        self.policy = policy
+        self.limiter = limiter
+        self.fallback = fallback or LocalRateLimiter()
+        self.fallback_decisions = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key, rate = await self.policy.resolve(
+            scope["path"],
+            client[0] if client else "unknown",
+            header_value(scope, b"authorization"),
+        )
+        try:
+            decision = await self.limiter.hit(key, rate)
+        except RedisError:
+            self.fallback_decisions += 1
+            decision = await self.fallback.hit(key, rate)
+        headers = decision.headers()
+        if not decision.allowed:
+            response = Response(
+                status_code=429, content="Rate limit exceeded", headers=headers
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send_with_headers(send, headers.items()))
@@ -0,0 +1,179 @@
+"""Readiness probes for the load balancer and container healthcheck.
+
+``ReadinessProbe`` runs named async checks concurrently, each under a
+timeout, and reports per-dependency status and latency. Results are cached
+for ``ttl`` seconds and concurrent callers share one in-flight run, so
+frequent probes from several balancers cost at most one round of checks
+per TTL.
+
+A failing *required* check makes the service not ready (503). Redis is
+optional by default: every worker shares it and falls back to local rate
+limiting and caching while it is down, so failing readiness would take
+all of them out of rotation at once; its failure reports "degraded".
+"""
+
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import text
+
+from ..core.config import AppSettings, get_settings
+from ..db.database import get_engine
+from ..schemas.rates import RateRequest
+from ..services.rates import compute_tiers
+from .redis import get_async_redis
+
+Check = Callable[[], Awaitable[None]]
+
+READY = "ready"
+DEGRADED = "degraded"
+NOT_READY = "not_ready"
+
+
+@dataclass
+class CheckResult:
+    status: str  # "ok", "error" or "timeout"
+    latency_ms: float
+    required: bool
+    error: Optional[str] = None
+
+
+@dataclass
+class ReadinessReport:
+    status: str
+    checks: Dict[str, CheckResult] = field(default_factory=dict)
+    checked_at: float = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.status != NOT_READY
+
+
+class ReadinessProbe:
+    """Run ``checks`` with a timeout each and cache the report for ``ttl``."""
+
+    def __init__(
+        self,
+        checks: Dict[str, Check],
+        required: Iterable[str],
+        timeout: float = 1.0,
+        ttl: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.checks = checks
+        self.required = set(required)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.clock = clock
+        self._report: Optional[ReadinessReport] = None
+        self._inflight: Optional["asyncio.Future[ReadinessReport]"] = None
+
+    async def check(self) -> ReadinessReport:
+        """Return the cached report, or run the checks if it is stale."""
+        report = self._report
+        if report is not None and self.clock() - report.checked_at < self.ttl:
+            return report
+        if self._inflight is None or self._inflight.done():
+            self._inflight = asyncio.ensure_future(self._run())
+        return await asyncio.shield(self._inflight)
+
+    def reset(self) -> None:
+        self._report = None
+
+    async def _run(self) -> ReadinessReport:
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._timed(name) for name in names))
+        checks = dict(zip(names, results))
+        failed = {name for name, result in checks.items() if result.status != "ok"}
+        if failed & self.required:
+            status = NOT_READY
+        elif failed:
+            status = DEGRADED
+        else:
+            status = READY
+        self._report = ReadinessReport(status, checks, self.clock())
+        return self._report
+
+    async def _timed(self, name: str) -> CheckResult:
+        required = name in self.required
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.checks[name](), self.timeout)
+        except asyncio.TimeoutError:
+            return CheckResult(
+                "timeout", _ms_since(start), required, f"no reply in {self.timeout}s"
+            )
+        except Exception as exc:
+            return CheckResult("error", _ms_since(start), required, repr(exc))
+        return CheckResult("ok", _ms_since(start), required)
+
+
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def _database_select_one() -> None:
+    with get_engine().connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+# The database probe gets its own thread rather than the shared threadpool
+# that get_db and sync dependencies use: a timed-out probe keeps running
+# until the connect attempt gives up, and against an unreachable database
+# every round would otherwise strand another of the request threads
+_database_probe_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="readiness-db"
+)
+_database_probe: Optional["Future[None]"] = None
+
+
+async def check_database() -> None:
+    # While a previous probe is still stuck, wait on it instead of queueing
+    # another one behind it
+    global _database_probe
+    if _database_probe is None or _database_probe.done():
+        _database_probe = _database_probe_executor.submit(_database_select_one)
+    await asyncio.wrap_future(_database_probe)
+
+
+async def check_redis() -> None:
+    await get_async_redis().ping()
+
+
+_RULES_PAYLOAD = RateRequest(
+    project_type="web_development",
+    project_complexity="moderate",
+    estimated_hours=40,
+    experience_years=3,
+    skills_count=5,
+    location="Cairo, Egypt",
+)
+
+
+async def check_rules() -> None:
+    """The rule tables load and produce ordered, positive tiers."""
+    tiers = compute_tiers(_RULES_PAYLOAD, skills_count=5)
+    minimum = float(tiers["minimum_rate"])
+    competitive = float(tiers["competitive_rate"])
+    premium = float(tiers["premium_rate"])
+    if not 0 < minimum <= competitive <= premium:
+        raise ValueError(f"rule tables produced unordered tiers: {tiers}")
+
+
+def build_readiness_probe(settings: Optional[AppSettings] = None) -> ReadinessProbe:
+    settings = settings or get_settings()
+    required = ["database", "rules"]
+    if settings.readiness_require_redis:
+        required.append("redis")
+    return ReadinessProbe(
+        {"database": check_database, "redis": check_redis, "rules": check_rules},
+        required=required,
+        timeout=settings.readiness_timeout,
+        ttl=settings.readiness_cache_ttl,
+    )
+
+
+readiness_probe = build_readiness_probe()
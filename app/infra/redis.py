@@ -1,13 +1,358 @@
-"""Redis client factory."""
+"""Redis client factory.
 
+The asyncio client is the one to use on the event loop (middleware, async
+routes). It is created in the FastAPI ``lifespan`` and closed on shutdown;
+``get_redis`` keeps a synchronous client for scripts, workers and sync
+dependencies. Both share pool, timeout and retry settings and record
+per-command latency (also exported as Prometheus metrics).
+
+Both clients also go through one circuit breaker: after repeated connection
+or timeout errors, commands fail immediately with ``CircuitOpenError``
+instead of waiting on socket timeouts, and callers switch to their local
+fallbacks (in-process rate limiting and caching) until a probe succeeds.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
 from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
 
 import redis
+import redis.asyncio as aioredis
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from redis.retry import Retry
+
+from ..core.config import AppSettings, get_settings
+from ..core.metrics import REDIS_COMMAND_DURATION, REDIS_COMMAND_ERRORS
+
+logger = logging.getLogger(__name__)
+
+
+class RedisMetrics:
+    """Per-command call counts, errors and latency."""
+
+    def __init__(self) -> None:
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.total_seconds: Dict[str, float] = defaultdict(float)
+        self.max_seconds: Dict[str, float] = defaultdict(float)
+
+    def observe(self, command: str, seconds: float, failed: bool) -> None:
+        self.calls[command] += 1
+        self.total_seconds[command] += seconds
+        if seconds > self.max_seconds[command]:
+            self.max_seconds[command] = seconds
+        REDIS_COMMAND_DURATION.labels(command).observe(seconds)
+        if failed:
+            self.errors[command] += 1
+            REDIS_COMMAND_ERRORS.labels(command).inc()
+
+    def reject(self, command: str) -> None:
+        """Count a command the circuit breaker refused to send."""
+        self.calls[command] += 1
+        self.errors[command] += 1
+        REDIS_COMMAND_ERRORS.labels(command).inc()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            command: {
+                "calls": calls,
+                "errors": self.errors[command],
+                "avg_seconds": self.total_seconds[command] / calls,
+                "max_seconds": self.max_seconds[command],
+            }
+            for command, calls in self.calls.items()
+        }
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.errors.clear()
+        self.total_seconds.clear()
+        self.max_seconds.clear()
+
+
+metrics = RedisMetrics()
+
+
+class CircuitOpenError(RedisConnectionError):
+    """Raised without touching the network while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Stops calling Redis after repeated connection failures.
+
+    Closed: commands go through; ``failure_threshold`` consecutive connection
+    or timeout errors open the breaker. Open: commands are rejected for
+    ``recovery_timeout`` seconds. Half-open: a single probe is let through;
+    success closes the breaker, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == self.OPEN
+                and self._clock() - self._opened_at >= self.recovery_timeout
+            ):
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Return whether a command may be sent now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            now = self._clock()
+            if self._state == self.OPEN:
+                if now - self._opened_at < self.recovery_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._probe_started = None
+            # Half-open: one probe at a time; a probe that never reported
+            # back (e.g. its task was cancelled) is replaced after a timeout.
+            if (
+                self._probe_started is not None
+                and now - self._probe_started < self.recovery_timeout
+            ):
+                self.rejected += 1
+                return False
+            self._probe_started = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_started = None
+            if self._state != self.CLOSED:
+                self._state = self.CLOSED
+                logger.info("Redis circuit breaker closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_started = None
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self.times_opened += 1
+                logger.warning("Redis circuit breaker opened")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_started = None
+            self.times_opened = self.rejected = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+_settings = get_settings()
+breaker = CircuitBreaker(
+    failure_threshold=_settings.redis_breaker_failure_threshold,
+    recovery_timeout=_settings.redis_breaker_recovery_timeout,
+)
+
+# Errors meaning Redis is unreachable or too slow; anything else (e.g. a
+# script error) still proves the server answered.
+_OUTAGE_ERRORS = (RedisConnectionError, RedisTimeoutError)
+
 
-from ..core.config import get_settings
+def _check_breaker(command: str) -> None:
+    if not breaker.allow():
+        metrics.reject(command)
+        raise CircuitOpenError("Redis circuit breaker is open")
+
+
+def _record(failure: Optional[BaseException]) -> None:
+    if failure is None or not isinstance(failure, _OUTAGE_ERRORS):
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+
+
+class InstrumentedRedis(redis.Redis):
+    """Synchronous client recording command latency, behind the breaker."""
+
+    def execute_command(self, *args: Any, **options: Any) -> Any:
+        command = str(args[0])
+        _check_breaker(command)
+        start = time.perf_counter()
+        failure: Optional[BaseException] = None
+        try:
+            return super().execute_command(*args, **options)
+        except Exception as exc:
+            failure = exc
+            raise
+        finally:
+            metrics.observe(command, time.perf_counter() - start, failure is not None)
+            _record(failure)
+
+
+class InstrumentedAsyncPipeline(aioredis.client.Pipeline):
+    """Pipeline timing the whole batch as a single ``PIPELINE`` command."""
+
+    async def execute(self, raise_on_error: bool = True) -> Any:
+        _check_breaker("PIPELINE")
+        start = time.perf_counter()
+        failure: Optional[BaseException] = None
+        try:
+            return await super().execute(raise_on_error)
+        except Exception as exc:
+            failure = exc
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.observe("PIPELINE", elapsed, failure is not None)
+            _record(failure)
+
+
+class InstrumentedAsyncRedis(aioredis.Redis):
+    """Asyncio client recording command latency, behind the breaker."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        command = str(args[0])
+        _check_breaker(command)
+        start = time.perf_counter()
+        failure: Optional[BaseException] = None
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception as exc:
+            failure = exc
+            raise
+        finally:
+            metrics.observe(command, time.perf_counter() - start, failure is not None)
+            _record(failure)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: Any = None
+    ) -> InstrumentedAsyncPipeline:
+        return InstrumentedAsyncPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def _connection_kwargs(settings: AppSettings) -> Dict[str, Any]:
+    return {
+        "max_connections": settings.redis_max_connections,
+        "timeout": settings.redis_pool_timeout,
+        "socket_timeout": settings.redis_socket_timeout,
+        "socket_connect_timeout": settings.redis_socket_connect_timeout,
+        "health_check_interval": settings.redis_health_check_interval,
+        "retry_on_error": [RedisConnectionError, RedisTimeoutError],
+        "decode_responses": True,
+    }
+
+
+def _backoff() -> ExponentialBackoff:
+    return ExponentialBackoff(cap=0.5, base=0.01)
 
 
 @lru_cache(maxsize=1)
 def get_redis() -> redis.Redis:
+    """Return the synchronous client (scripts, workers, sync dependencies)."""
     settings = get_settings()
-    return redis.from_url(settings.redis_url, decode_responses=True)
+    pool = redis.BlockingConnectionPool.from_url(
+        settings.redis_url,
+        retry=Retry(_backoff(), settings.redis_retry_attempts),
+        **_connection_kwargs(settings),
+    )
+    return InstrumentedRedis(connection_pool=pool)
+
+
+_async_client: Optional[InstrumentedAsyncRedis] = None
+
+
+def create_async_redis(
+    settings: Optional[AppSettings] = None,
+) -> InstrumentedAsyncRedis:
+    """Build a pooled asyncio client from settings."""
+    settings = settings or get_settings()
+    pool = aioredis.BlockingConnectionPool.from_url(
+        settings.redis_url,
+        retry=AsyncRetry(_backoff(), settings.redis_retry_attempts),
+        **_connection_kwargs(settings),
+    )
+    return InstrumentedAsyncRedis(connection_pool=pool)
+
+
+def get_async_redis() -> InstrumentedAsyncRedis:
+    """Return the asyncio client, creating it if the lifespan has not."""
+    global _async_client
+    if _async_client is None:
+        _async_client = create_async_redis()
+    return _async_client
+
+
+async def init_async_redis() -> InstrumentedAsyncRedis:
+    """Create the asyncio client at application startup."""
+    return get_async_redis()
+
+
+async def close_async_redis() -> None:
+    """Close the asyncio client and its pool at application shutdown."""
+    global _async_client
+    client, _async_client = _async_client, None
+    if client is not None:
+        await client.aclose()
+        await client.connection_pool.disconnect()
+
+
+def _pool_stats(pool: Any) -> Dict[str, int]:
+    if hasattr(pool, "_in_use_connections"):  # asyncio pool
+        in_use = len(pool._in_use_connections)
+        idle = len(pool._available_connections)
+    else:  # sync BlockingConnectionPool: queue holds idle conns and None slots
+        idle = sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        in_use = len(pool._connections) - idle
+    return {"in_use": in_use, "idle": idle, "max": pool.max_connections}
+
+
+def redis_stats() -> Dict[str, Any]:
+    """Return breaker state, command latency and pool usage."""
+    stats: Dict[str, Any] = {
+        "breaker": breaker.snapshot(),
+        "commands": metrics.snapshot(),
+    }
+    if _async_client is not None:
+        stats["async_pool"] = _pool_stats(_async_client.connection_pool)
+    if get_redis.cache_info().currsize:
+        stats["sync_pool"] = _pool_stats(get_redis().connection_pool)
+    return stats
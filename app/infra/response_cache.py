@@ -0,0 +1,568 @@
+"""Response cache for read endpoints.
+
+``cache_response`` wraps a FastAPI endpoint and caches its JSON body under a
+key built from the request path, the normalized query string and the
+authenticated principal. Entries carry tags; repositories call
+``invalidate_tags`` after writes to drop every entry tagged with the data
+they changed. Invalidation is a blocking backend call: from a worker thread
+it runs inline, and when a sync repository is reached from the event loop
+it is handed to the default executor so the loop never waits on Redis.
+
+Two mechanisms prevent dogpiles on popular keys. A miss recomputes under a
+short lock while concurrent requests for the same key wait for the result.
+A hit close to expiry is refreshed early with a probability that grows as
+expiry approaches and with how long the value took to compute (XFetch), so
+hot entries are usually replaced before they expire at all.
+
+Backend errors never fail a request: the endpoint is simply computed.
+"""
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import math
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from urllib.parse import urlencode
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+
+from ..core.config import get_settings
+from ..core.security import decode_token_async
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "respcache:"
+TAG_PREFIX = "respcache-tag:"
+# Tag sets outlive their entries; stale members are harmless on invalidation.
+TAG_TTL_SECONDS = 86400
+
+# Entries deleted per pipeline round trip on invalidation
+INVALIDATE_BATCH = 500
+
+
+class CacheBackend(ABC):
+    """Storage used by ``ResponseCache``.
+
+    Reads, writes and locks are async (they run on the event loop);
+    ``invalidate`` is sync and blocking, called by repositories from worker
+    threads (``invalidate_tags`` moves it off the loop otherwise).
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]: ...
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: str, ttl: float, tags: Sequence[str]
+    ) -> None: ...
+
+    @abstractmethod
+    async def acquire(self, key: str, ttl: float) -> bool: ...
+
+    @abstractmethod
+    async def release(self, key: str) -> None: ...
+
+    @abstractmethod
+    def invalidate(self, tags: Sequence[str]) -> int: ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process backend for local runs, tests and Redis outages.
+
+    Holds at most ``max_entries`` entries; expired ones are purged first,
+    then the oldest. Tag sets only ever name live entries.
+    """
+
+    def __init__(
+        self, max_entries: int = 10000, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Tuple[str, ...]] = {}
+        self._locks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= self._clock():
+                self._drop(key)
+                return None
+            return entry[0]
+
+    async def set(self, key: str, value: str, ttl: float, tags: Sequence[str]) -> None:
+        with self._lock:
+            now = self._clock()
+            self._drop(key)
+            self._entries[key] = (value, now + ttl)
+            self._key_tags[key] = tuple(tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            if len(self._entries) > self.max_entries:
+                self._evict(now)
+
+    def _drop(self, key: str) -> bool:
+        """Remove an entry and its tag memberships; False if it was absent."""
+        if self._entries.pop(key, None) is None:
+            return False
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
+
+    def _evict(self, now: float) -> None:
+        for key in [k for k, (_, expires) in self._entries.items() if expires <= now]:
+            self._drop(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def acquire(self, key: str, ttl: float) -> bool:
+        with self._lock:
+            now = self._clock()
+            if self._locks.get(key, 0.0) > now:
+                return False
+            self._locks[key] = now + ttl
+            return True
+
+    async def release(self, key: str) -> None:
+        with self._lock:
+            self._locks.pop(key, None)
+
+    def invalidate(self, tags: Sequence[str]) -> int:
+        deleted = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    deleted += self._drop(key)
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._key_tags.clear()
+            self._locks.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared backend: entries are strings with a PX expiry, tags are sets.
+
+    ``async_client`` and ``sync_client`` may be clients or factories such as
+    ``get_async_redis`` / ``get_redis``. Every command names the keys it
+    touches, so entries and tag sets may live in different cluster slots.
+    """
+
+    def __init__(self, async_client: Any, sync_client: Any) -> None:
+        self._async = async_client if callable(async_client) else lambda: async_client
+        self._sync = sync_client if callable(sync_client) else lambda: sync_client
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._async().get(key)
+        return None if value is None else str(value)
+
+    async def set(self, key: str, value: str, ttl: float, tags: Sequence[str]) -> None:
+        pipe = self._async().pipeline(transaction=False)
+        pipe.set(key, value, px=max(1, int(ttl * 1000)))
+        for tag in tags:
+            pipe.sadd(TAG_PREFIX + tag, key)
+            pipe.expire(TAG_PREFIX + tag, TAG_TTL_SECONDS)
+        await pipe.execute()
+
+    async def acquire(self, key: str, ttl: float) -> bool:
+        return bool(
+            await self._async().set(key, "1", nx=True, px=max(1, int(ttl * 1000)))
+        )
+
+    async def release(self, key: str) -> None:
+        await self._async().delete(key)
+
+    def invalidate(self, tags: Sequence[str]) -> int:
+        client = self._sync()
+        members: Set[str] = set()
+        for tag in tags:
+            # Read and drop each tag set atomically (one key, so one slot)
+            pipe = client.pipeline(transaction=True)
+            pipe.smembers(TAG_PREFIX + tag)
+            pipe.delete(TAG_PREFIX + tag)
+            tagged, _ = pipe.execute()
+            members.update(str(key) for key in tagged)
+        keys = sorted(members)
+        deleted = 0
+        for start in range(0, len(keys), INVALIDATE_BATCH):
+            # One DEL per key: cluster pipelines route each to its node
+            pipe = client.pipeline(transaction=False)
+            for key in keys[start : start + INVALIDATE_BATCH]:
+                pipe.delete(key)
+            deleted += sum(pipe.execute())
+        return deleted
+
+
+class FallbackCacheBackend(CacheBackend):
+    """Uses ``primary`` and switches to ``fallback`` for calls that fail.
+
+    With Redis as primary, an outage (or an open circuit breaker) degrades
+    to per-process caching and locking instead of no caching at all.
+    Invalidation always reaches the fallback too, so entries cached locally
+    during an outage are not served stale later.
+    """
+
+    def __init__(self, primary: CacheBackend, fallback: CacheBackend) -> None:
+        self.primary = primary
+        self.fallback = fallback
+        self.fallbacks = 0
+
+    def _degraded(self) -> None:
+        self.fallbacks += 1
+        if self.fallbacks == 1 or self.fallbacks % 1000 == 0:
+            logger.warning(
+                "Response cache using local fallback (%d calls)",
+                self.fallbacks,
+                exc_info=True,
+            )
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await self.primary.get(key)
+        except Exception:
+            self._degraded()
+            return await self.fallback.get(key)
+
+    async def set(self, key: str, value: str, ttl: float, tags: Sequence[str]) -> None:
+        try:
+            await self.primary.set(key, value, ttl, tags)
+        except Exception:
+            self._degraded()
+            await self.fallback.set(key, value, ttl, tags)
+
+    async def acquire(self, key: str, ttl: float) -> bool:
+        try:
+            return await self.primary.acquire(key, ttl)
+        except Exception:
+            self._degraded()
+            return await self.fallback.acquire(key, ttl)
+
+    async def release(self, key: str) -> None:
+        # Release both: the lock may have been taken on either side.
+        await self.fallback.release(key)
+        try:
+            await self.primary.release(key)
+        except Exception:
+            self._degraded()
+
+    def invalidate(self, tags: Sequence[str]) -> int:
+        deleted = self.fallback.invalidate(tags)
+        return deleted + self.primary.invalidate(tags)
+
+
+def _pack(body: str, expires_at: float, delta: float) -> str:
+    return f"{expires_at:.3f} {delta:.4f} {body}"
+
+
+def _unpack(raw: str) -> Tuple[float, float, str]:
+    expires_at, delta, body = raw.split(" ", 2)
+    return float(expires_at), float(delta), body
+
+
+class ResponseCache:
+    """Get-or-compute over a backend with stampede protection."""
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        beta: float = 1.0,
+        lock_timeout: float = 5.0,
+        poll_interval: float = 0.05,
+        clock: Callable[[], float] = time.time,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self.backend = backend
+        self.beta = beta
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._clock = clock
+        self._rand = rand
+        self.hits = 0
+        self.misses = 0
+        self.early_refreshes = 0
+        self.lock_waits = 0
+        self.errors = 0
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        ttl: float,
+        tags: Sequence[str] = (),
+    ) -> Tuple[str, str]:
+        """Return ``(body, status)`` where status is HIT, MISS or REFRESH."""
+        raw = await self._call(self.backend.get(key), None)
+        if raw is not None:
+            expires_at, delta, body = _unpack(raw)
+            # Only the lock holder refreshes; everyone else keeps serving.
+            if not self._refresh_early(expires_at, delta) or not await self._lock(key):
+                self.hits += 1
+                return body, "HIT"
+            self.early_refreshes += 1
+            try:
+                return await self._store(key, compute, ttl, tags), "REFRESH"
+            finally:
+                await self._unlock(key)
+
+        self.misses += 1
+        deadline = self._clock() + self.lock_timeout
+        waited = False
+        while not await self._lock(key):
+            # Another request is computing this key: wait for its result,
+            # taking over if it gives up without storing one.
+            if not waited:
+                self.lock_waits += 1
+                waited = True
+            if self._clock() >= deadline:
+                return await self._store(key, compute, ttl, tags), "MISS"
+            await asyncio.sleep(self.poll_interval)
+            raw = await self._call(self.backend.get(key), None)
+            if raw is not None:
+                return _unpack(raw)[2], "HIT"
+        try:
+            return await self._store(key, compute, ttl, tags), "MISS"
+        finally:
+            await self._unlock(key)
+
+    def _refresh_early(self, expires_at: float, delta: float) -> bool:
+        # XFetch: -log(U) is exponentially distributed, scaled by compute time.
+        gap = -delta * self.beta * math.log(1.0 - self._rand())
+        return self._clock() + gap >= expires_at
+
+    async def _store(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[str]],
+        ttl: float,
+        tags: Sequence[str],
+    ) -> str:
+        start = self._clock()
+        body = await compute()
+        now = self._clock()
+        await self._call(
+            self.backend.set(key, _pack(body, now + ttl, now - start), ttl, tags),
+            None,
+        )
+        return body
+
+    async def _lock(self, key: str) -> bool:
+        # Without a working backend every request computes for itself.
+        return bool(
+            await self._call(self.backend.acquire(key + ":lock", self.lock_timeout), 1)
+        )
+
+    async def _unlock(self, key: str) -> None:
+        await self._call(self.backend.release(key + ":lock"), None)
+
+    async def _call(self, operation: Awaitable[Any], default: Any) -> Any:
+        try:
+            return await operation
+        except Exception:
+            self.errors += 1
+            logger.warning("Response cache operation failed", exc_info=True)
+            return default
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        if not tags:
+            return 0
+        try:
+            return self.backend.invalidate(tags)
+        except Exception:
+            # Entries still expire after their TTL.
+            self.errors += 1
+            logger.warning("Response cache invalidation failed", exc_info=True)
+            return 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "early_refreshes": self.early_refreshes,
+            "lock_waits": self.lock_waits,
+            "errors": self.errors,
+            "fallbacks": getattr(self.backend, "fallbacks", 0),
+        }
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide cache, building it from settings on first use."""
+    global _cache
+    if _cache is None:
+        settings = get_settings()
+        backend: CacheBackend
+        if settings.response_cache_backend == "memory":
+            backend = InMemoryCacheBackend()
+        else:
+            from .redis import get_async_redis, get_redis
+
+            backend = FallbackCacheBackend(
+                RedisCacheBackend(get_async_redis, get_redis),
+                InMemoryCacheBackend(),
+            )
+        _cache = ResponseCache(
+            backend,
+            beta=settings.response_cache_beta,
+            lock_timeout=settings.response_cache_lock_timeout,
+        )
+    return _cache
+
+
+def configure_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Replace the process-wide cache (None rebuilds it from settings)."""
+    global _cache
+    _cache = cache
+
+
+# Invalidations handed to the executor, kept referenced until they finish
+_pending_invalidations: Set["asyncio.Future[int]"] = set()
+
+
+def invalidate_tags(*tags: str) -> int:
+    """Drop every cached response carrying any of ``tags``.
+
+    Returns the number of entries dropped. On the event loop thread the
+    backend call runs in the default executor instead and 0 is returned;
+    entries are gone within one Redis round trip.
+    """
+    if not get_settings().response_cache_enabled:
+        return 0
+    cache = get_response_cache()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return cache.invalidate(tags)
+    future = loop.run_in_executor(None, cache.invalidate, tags)
+    _pending_invalidations.add(future)
+    future.add_done_callback(_pending_invalidations.discard)
+    return 0
+
+
+def response_cache_stats() -> Dict[str, int]:
+    """Return hit/miss/refresh counters for this worker."""
+    return get_response_cache().stats()
+
+
+async def _principal(request: Request) -> str:
+    authorization = request.headers.get("authorization")
+    if authorization and authorization[:7].lower() == "bearer ":
+        claims = await decode_token_async(authorization[7:].strip())
+        if claims and claims.get("sub") is not None:
+            return f"user:{claims['sub']}"
+    return "anon"
+
+
+def cache_key(request: Request, principal: str) -> str:
+    """Key on principal, path and the query string with parameters sorted."""
+    query = urlencode(sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(query.encode()).hexdigest()[:16] if query else "-"
+    return f"{KEY_PREFIX}{principal}:{request.url.path}:{digest}"
+
+
+def cache_response(
+    ttl: Optional[int] = None,
+    tags: Sequence[str] = (),
+    vary_on_principal: bool = True,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Cache a GET endpoint's JSON body.
+
+    ``tags`` are format strings filled from the path parameters and
+    ``principal`` (``"user:<id>"`` or ``"anon"``), e.g.
+    ``"rates:{principal}"``. The endpoint must return something
+    ``jsonable_encoder`` can encode (typically its response model, which
+    is serialized directly with ``model_dump_json``); cached
+    and fresh bodies are returned as-is with an ``X-Cache`` header.
+    """
+
+    def decorator(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(endpoint)
+        params: List[inspect.Parameter] = list(signature.parameters.values())
+        existing = next((p.name for p in params if p.annotation is Request), None)
+        inject = existing is None
+        request_param = existing or "_cache_request"
+        if inject:
+            params.append(
+                inspect.Parameter(
+                    request_param, inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                )
+            )
+        is_coroutine = asyncio.iscoroutinefunction(endpoint)
+
+        async def call(args: Any, kwargs: Dict[str, Any]) -> Any:
+            if is_coroutine:
+                return await endpoint(*args, **kwargs)
+            return await run_in_threadpool(endpoint, *args, **kwargs)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            request: Request = (
+                kwargs.pop(request_param) if inject else kwargs[request_param]
+            )
+            settings = get_settings()
+            if not settings.response_cache_enabled or request.method not in (
+                "GET",
+                "HEAD",
+            ):
+                return await call(args, kwargs)
+
+            principal = await _principal(request) if vary_on_principal else "shared"
+            context = {**request.path_params, "principal": principal}
+
+            async def compute() -> str:
+                result = await call(args, kwargs)
+                if isinstance(result, BaseModel):
+                    return result.model_dump_json()
+                return json.dumps(jsonable_encoder(result), separators=(",", ":"))
+
+            body, status = await get_response_cache().get_or_compute(
+                cache_key(request, principal),
+                compute,
+                ttl or settings.response_cache_ttl_seconds,
+                [tag.format(**context) for tag in tags],
+            )
+            return Response(
+                body, media_type="application/json", headers={"X-Cache": status}
+            )
+
+        wrapper.__signature__ = signature.replace(  # type: ignore[attr-defined]
+            parameters=params
+        )
+        return wrapper
+
+    return decorator
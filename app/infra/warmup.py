@@ -0,0 +1,77 @@
+"""Cache warming before a pre-fork server starts its workers.
+
+``gunicorn.conf.py`` imports the app once in the master process and calls
+``warm_caches`` before forking, so every worker starts with the work below
+already done and shares those pages copy-on-write instead of repeating it
+on its first requests. Warmers must not leave open connections or threads
+behind: those do not survive a fork.
+
+Other modules add their own with ``register_warmer``. A failing warmer is
+logged and skipped; workers then fill that cache on first use.
+"""
+
+import logging
+import time
+from typing import Callable, Dict, Optional, get_args
+
+from fastapi import FastAPI
+
+logger = logging.getLogger(__name__)
+
+Warmer = Callable[[], None]
+
+_warmers: Dict[str, Warmer] = {}
+
+
+def register_warmer(name: str) -> Callable[[Warmer], Warmer]:
+    """Decorator adding a function to the warmers run by ``warm_caches``."""
+
+    def decorator(fn: Warmer) -> Warmer:
+        _warmers[name] = fn
+        return fn
+
+    return decorator
+
+
+@register_warmer("rules")
+def warm_rule_tables() -> None:
+    """Run every project type and complexity through validation and the rules."""
+    # Deferred: the rate service reads the market index, which registers a
+    # warmer here
+    from ..schemas.rates import RateRequest
+    from ..services.rates import compute_tiers
+
+    fields = RateRequest.model_fields
+    for project_type in get_args(fields["project_type"].annotation):
+        for complexity in get_args(fields["project_complexity"].annotation):
+            payload = RateRequest(
+                project_type=project_type,
+                project_complexity=complexity,
+                estimated_hours=40,
+                experience_years=3,
+                skills_count=5,
+                location="Cairo, Egypt",
+            )
+            compute_tiers(payload, skills_count=5)
+
+
+def warm_caches(app: Optional[FastAPI] = None) -> Dict[str, float]:
+    """Run the registered warmers; returns seconds taken per warmer.
+
+    With ``app``, its OpenAPI schema is built as well (FastAPI caches it on
+    the app after the first ``/openapi.json`` or ``/docs`` request).
+    """
+    warmers: Dict[str, Callable[[], object]] = dict(_warmers)
+    if app is not None:
+        warmers["openapi"] = app.openapi
+    timings: Dict[str, float] = {}
+    for name, warmer in warmers.items():
+        start = time.perf_counter()
+        try:
+            warmer()
+        except Exception:
+            logger.exception("cache warmer %s failed", name)
+            continue
+        timings[name] = time.perf_counter() - start
+        logger.info("warmed %s in %.1f ms", name, timings[name] * 1000)
+    return timings
@@ -1,47 +1,87 @@
 """Main FastAPI application."""
 
 from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Optional, Union
 from dotenv import load_dotenv
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
 
 from .api.v1 import api_router
 from .api.v1 import auth as auth_router
 from .api.v1 import rates as rates_router
+from .api.responses import FastJSONResponse
 from .core.config import get_settings
-from .db.database import create_tables
+from .core.metrics import MetricsMiddleware, mark_process_dead, render_metrics
+from .core.middleware import RequestContextMiddleware
+from .core.security import shutdown_password_hasher
+from .core.tracing import TracingMiddleware, configure_tracing, shutdown_tracing
+from .db.database import create_tables, dispose_engine
+from .infra.market_index import market_index_refresher
+from .infra.principal_cache import invalidation_listener
+from .infra.redis import breaker as redis_breaker
+from .infra.redis import close_async_redis, init_async_redis
 import os
-from .schemas.common import HealthResponse
+from .infra.readiness import readiness_probe
+from .schemas.common import DependencyCheck, HealthResponse, ReadinessResponse
 from .core.logging import (
+    AccessLogSampler,
     configure_logging,
     configure_uvicorn_json_logging,
+    start_queue_logging,
+    stop_queue_logging,
 )
 
-try:
-    import sentry_sdk  # type: ignore[import-not-found]
-except Exception:
-    sentry_sdk = None  # type: ignore[assignment]
+if TYPE_CHECKING:
+    from .infra.rate_limit import HybridRateLimiter, RedisRateLimiter
 
 # Load environment variables from .env file
 load_dotenv()
 
 settings = get_settings()
 
+# Created below when rate limiting is enabled; runs with the app lifespan
+rate_limiter: Optional[Union["RedisRateLimiter", "HybridRateLimiter"]] = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup
-    if sentry_sdk and (settings.sentry.dsn or os.getenv("SENTRY_DSN")):
-        sentry_sdk.init(dsn=settings.sentry.dsn or os.getenv("SENTRY_DSN"))
+    sentry_dsn = settings.sentry.dsn or os.getenv("SENTRY_DSN")
+    if sentry_dsn:
+        # Imported only when configured; it is heavy and optional
+        try:
+            import sentry_sdk  # type: ignore[import-not-found]
+        except ImportError:
+            pass
+        else:
+            sentry_sdk.init(dsn=sentry_dsn)
     # configure logging (JSON; set LOG_LEVEL via env per environment)
     configure_logging(level=settings.log_level, fmt="json")
-    configure_uvicorn_json_logging(settings.log_level)
+    configure_uvicorn_json_logging(
+        settings.log_level, AccessLogSampler.from_settings(settings)
+    )
+    start_queue_logging(settings.log_queue_size, settings.log_queue_policy)
+    configure_tracing(settings)
     create_tables()
+    await init_async_redis()
+    invalidation_listener.start()
+    if settings.market_index_enabled:
+        market_index_refresher.start()
+    if rate_limiter is not None:
+        rate_limiter.start()
     yield
     # shutdown
-    return
+    if rate_limiter is not None:
+        await rate_limiter.stop()
+    market_index_refresher.stop()
+    invalidation_listener.stop()
+    await close_async_redis()
+    shutdown_password_hasher()
+    dispose_engine()
+    mark_process_dead()
+    shutdown_tracing()
+    stop_queue_logging()
 
 
 app = FastAPI(
@@ -49,15 +89,67 @@ app = FastAPI(
     description="AI-powered freelance rate calculator for Egyptian freelancers",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 
 @app.get("/health", response_model=HealthResponse)
 async def health() -> HealthResponse:
-    """Health check endpoint."""
+    """Health check endpoint.
+
+    Reports "degraded" (still 200) while the Redis circuit breaker is not
+    closed and requests are served with local fallbacks.
+    """
+    redis_state = redis_breaker.state
+    return HealthResponse(
+        status="ok" if redis_state == redis_breaker.CLOSED else "degraded",
+        dependencies={"redis": redis_state},
+    )
+
+
+@app.get("/health/live", response_model=HealthResponse)
+async def liveness() -> HealthResponse:
+    """Liveness: the process is up and its event loop is answering.
+
+    Checks no dependencies, so an outage elsewhere never gets the container
+    restarted.
+    """
     return HealthResponse()
 
 
+@app.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse}},
+)
+async def readiness(response: Response) -> ReadinessResponse:
+    """Readiness: database, Redis and rule tables, with per-check latency.
+
+    Returns 503 when a required dependency fails. Results are cached for
+    READINESS_CACHE_TTL seconds, so probes do not pile load on dependencies.
+    """
+    report = await readiness_probe.check()
+    if not report.ready:
+        response.status_code = 503
+    return ReadinessResponse(
+        status=report.status,
+        checks={
+            name: DependencyCheck(**vars(result))
+            for name, result in report.checks.items()
+        },
+        age_seconds=round(readiness_probe.clock() - report.checked_at, 3),
+    )
+
+
+if settings.metrics_enabled:
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """Prometheus metrics, aggregated across workers in multiprocess mode."""
+        body, content_type = render_metrics()
+        return Response(body, media_type=content_type)
+
+
 # Mount API v1 routers (include sub-routers before mounting to the app)
 api_router.include_router(rates_router.router)
 api_router.include_router(auth_router.router)
@@ -73,21 +165,42 @@ app.add_middleware(
 )
 
 
-# Optional basic rate limiting middleware (MVP)
+# Optional rate limiting middleware (GCRA in Redis; see RATE_LIMIT_MODE)
 if settings.enable_rate_limiting:
-    from .infra.redis import get_redis
-
-    @app.middleware("http")
-    # type: ignore[no-redef]
-    async def rate_limit_middleware(request: Request, call_next):
-        redis = get_redis()
-        client_host = request.client.host if request.client else "unknown"
-        key = f"ratelimit:{client_host}:{request.url.path}"
-        current = redis.get(key)
-        if current and int(str(current)) >= 100:
-            return Response(status_code=429, content="Rate limit exceeded")
-        if current:
-            redis.incr(key)
-        else:
-            redis.setex(key, 3600, 1)
-        return await call_next(request)
+    from .infra.rate_limit import (
+        RateLimitMiddleware,
+        RateLimitPolicy,
+        build_rate_limiter,
+    )
+    from .infra.redis import get_async_redis
+
+    rate_limiter = build_rate_limiter(settings, get_async_redis)
+    app.add_middleware(
+        RateLimitMiddleware,
+        policy=RateLimitPolicy.from_settings(settings),
+        limiter=rate_limiter,
+    )
+
+# Latency per route and in-flight requests, including rate-limited ones
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Server span per request (the span sites below it are no-ops when off)
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+
+# On-demand profiling of single requests (inside the request context so
+# profiles are named after the request id)
+if settings.profiler_enabled:
+    from .core.profiler import ProfilerMiddleware
+
+    app.add_middleware(
+        ProfilerMiddleware,
+        token=settings.profiler_token,
+        sample_rate=settings.profiler_sample_rate,
+        output_dir=settings.profiler_dir,
+        interval=settings.profiler_interval_ms / 1000,
+    )
+
+# Request id and timing; added last so it wraps everything else
+app.add_middleware(RequestContextMiddleware, query_stats=settings.debug)
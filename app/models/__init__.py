@@ -6,6 +6,7 @@ from .rate_calculation import RateCalculation
 from .market_statistics import MarketStatistics
 from .invoice import Invoice
 from .contract import Contract
+from .skill import Skill, user_skills
 
 __all__ = [
     "Base",
@@ -15,4 +16,6 @@ __all__ = [
     "MarketStatistics",
     "Invoice",
     "Contract",
+    "Skill",
+    "user_skills",
 ]
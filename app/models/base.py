@@ -1,5 +1,8 @@
 """Base database configuration and models."""
 
+import json
+from typing import Any, List
+
 from sqlalchemy import Column, DateTime, Integer
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.sql import func
@@ -25,3 +28,19 @@ class IDMixin:
     """Mixin to add primary key id."""
 
     id = Column(Integer, primary_key=True, index=True)
+
+
+def json_list(value: Any) -> List[Any]:
+    """Normalize a JSON column value into a list.
+
+    JSON columns are parsed by the driver, but rows written before the
+    Text -> JSON migration may still hold a serialized string.
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            return []
+    return list(value) if isinstance(value, list) else []
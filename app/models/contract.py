@@ -1,11 +1,24 @@
 """Contract model."""
 
 from enum import Enum
-
-from sqlalchemy import Column, ForeignKey, String, Text, Float, Boolean, Date, Integer
+from typing import Any, Dict, List
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Date,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
-from .base import Base, IDMixin, TimestampMixin
+from .base import Base, IDMixin, TimestampMixin, json_list
 
 
 class ContractStatus(str, Enum):
@@ -28,9 +41,22 @@ class ContractType(str, Enum):
 
 
 class Contract(Base, IDMixin, TimestampMixin):
-    """Contract model for freelancer agreements."""
+    """Contract model for freelancer agreements.
+
+    ``milestones`` holds a list of objects shaped like
+    ``{"title": str, "due_date": "YYYY-MM-DD", "amount": float, "paid": bool}``
+    and ``deliverables`` a list of strings or objects.
+    """
 
     __tablename__ = "contracts"
+    __table_args__ = (
+        Index(
+            "ix_contracts_milestones",
+            "milestones",
+            postgresql_using="gin",
+            postgresql_ops={"milestones": "jsonb_path_ops"},
+        ),
+    )
 
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -58,8 +84,9 @@ class Contract(Base, IDMixin, TimestampMixin):
     # Status and Terms
     status = Column(String(20), default=ContractStatus.DRAFT, nullable=False)
     payment_terms = Column(Text, nullable=True)
-    deliverables = Column(Text, nullable=True)  # JSON string
-    milestones = Column(Text, nullable=True)  # JSON string
+    # JSON on SQLite, JSONB on Postgres
+    deliverables = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
+    milestones = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
 
     # Legal and Files
     terms_and_conditions = Column(Text, nullable=True)
@@ -69,3 +96,17 @@ class Contract(Base, IDMixin, TimestampMixin):
 
     # Relationships
     user = relationship("User", back_populates="contracts")
+
+    @property
+    def deliverable_items(self) -> List[Any]:
+        """Deliverables as a list, tolerating legacy string payloads."""
+        return json_list(self.deliverables)
+
+    @property
+    def milestone_items(self) -> List[Dict[str, Any]]:
+        """Milestones as a list of dicts with ``paid`` defaulting to False."""
+        return [
+            {"paid": False, **item}
+            for item in json_list(self.milestones)
+            if isinstance(item, dict)
+        ]
@@ -0,0 +1,35 @@
+"""Skill dictionary and user-skill association models."""
+
+from sqlalchemy import JSON, Column, ForeignKey, Integer, String, Table
+from sqlalchemy.dialects.postgresql import JSONB
+
+from .base import Base, IDMixin, TimestampMixin
+
+user_skills = Table(
+    "user_skills",
+    Base.metadata,
+    Column(
+        "user_id",
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "skill_id",
+        Integer,
+        ForeignKey("skills.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
+)
+
+
+class Skill(Base, IDMixin, TimestampMixin):
+    """Canonical skill entry with alternative spellings."""
+
+    __tablename__ = "skills"
+
+    name = Column(String(100), unique=True, nullable=False, index=True)
+    category = Column(String(50), nullable=True)
+    # Alternative spellings: JSON on SQLite, JSONB on Postgres
+    aliases = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
@@ -1,11 +1,13 @@
 """User and UserProfile models."""
 
 from enum import Enum
+from typing import List
 
-from sqlalchemy import Boolean, Column, ForeignKey, String, Text, Integer
+from sqlalchemy import JSON, Boolean, Column, ForeignKey, Index, String, Text, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
-from .base import Base, IDMixin, TimestampMixin
+from .base import Base, IDMixin, TimestampMixin, json_list
 
 
 class UserRole(str, Enum):
@@ -42,12 +44,21 @@ class User(Base, IDMixin, TimestampMixin):
     contracts = relationship(
         "Contract", back_populates="user", cascade="all, delete-orphan"
     )
+    skills = relationship("Skill", secondary="user_skills", order_by="Skill.name")
 
 
 class UserProfile(Base, IDMixin, TimestampMixin):
     """Extended user profile information."""
 
     __tablename__ = "user_profiles"
+    __table_args__ = (
+        Index(
+            "ix_user_profiles_skills",
+            "skills",
+            postgresql_using="gin",
+            postgresql_ops={"skills": "jsonb_path_ops"},
+        ),
+    )
 
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
@@ -62,7 +73,8 @@ class UserProfile(Base, IDMixin, TimestampMixin):
     # Professional Information
     profession = Column(String(100), nullable=True)
     experience_years = Column(Integer, nullable=True)
-    skills = Column(Text, nullable=True)  # JSON string of skills list
+    # List of skill names: JSON on SQLite, JSONB on Postgres
+    skills = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
     portfolio_url = Column(String(500), nullable=True)
     linkedin_url = Column(String(500), nullable=True)
 
@@ -76,3 +88,8 @@ class UserProfile(Base, IDMixin, TimestampMixin):
 
     # Relationships
     user = relationship("User", back_populates="profile")
+
+    @property
+    def skill_names(self) -> List[str]:
+        """Skills as a list of strings, tolerating legacy string payloads."""
+        return [str(skill) for skill in json_list(self.skills) if skill]
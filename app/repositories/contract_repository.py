@@ -0,0 +1,85 @@
+"""Contract repository for data access operations."""
+
+from datetime import date, timedelta
+from typing import List, Optional
+
+from sqlalchemy import ColumnElement, and_, cast, desc, exists, func, literal, select
+from sqlalchemy.dialects.postgresql import JSONPATH
+from sqlalchemy.orm import Session
+
+from ..core.tracing import trace_methods
+from ..models.contract import Contract
+
+
+@trace_methods("ContractRepository")
+class ContractRepository:
+    """Repository for contract-related database operations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_id(self, contract_id: int) -> Optional[Contract]:
+        """Get contract by ID."""
+        return self.db.get(Contract, contract_id)
+
+    def get_by_user_id(
+        self, user_id: int, skip: int = 0, limit: int = 100
+    ) -> List[Contract]:
+        """Get contracts for a specific user with pagination."""
+        stmt = (
+            select(Contract)
+            .where(Contract.user_id == user_id)
+            .order_by(desc(Contract.created_at))
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).scalars().all())
+
+    def get_with_unpaid_milestone_due(
+        self, start: date, end: date, user_id: Optional[int] = None
+    ) -> List[Contract]:
+        """Get contracts with an unpaid milestone due within [start, end].
+
+        The filter runs in the database: a jsonpath match on Postgres and
+        ``json_each`` on SQLite. The ``jsonb_path_ops`` GIN index only serves
+        equality paths, so the negated ``paid`` and the date range are
+        checked row by row.
+        """
+        condition: ColumnElement[bool]
+        if self.db.get_bind().dialect.name == "postgresql":
+            path = (
+                "$[*] ? (!(@.paid == true)"
+                f' && @.due_date >= "{start.isoformat()}"'
+                f' && @.due_date <= "{end.isoformat()}")'
+            )
+            condition = Contract.milestones.op("@?")(cast(path, JSONPATH))
+        else:
+            milestone = (
+                func.json_each(Contract.milestones).table_valued("value").alias("m")
+            )
+            due_date = func.json_extract(milestone.c.value, "$.due_date")
+            paid = func.coalesce(func.json_extract(milestone.c.value, "$.paid"), 0)
+            condition = exists(
+                select(literal(1))
+                .select_from(milestone)
+                .where(
+                    and_(
+                        paid == 0, due_date.between(start.isoformat(), end.isoformat())
+                    )
+                )
+            )
+
+        stmt = select(Contract).where(condition).order_by(Contract.id)
+        if user_id is not None:
+            stmt = stmt.where(Contract.user_id == user_id)
+        return list(self.db.execute(stmt).scalars().all())
+
+    def get_with_unpaid_milestone_due_this_week(
+        self, today: Optional[date] = None, user_id: Optional[int] = None
+    ) -> List[Contract]:
+        """Get contracts with an unpaid milestone due in the current ISO week."""
+        today = today or date.today()
+        start = today - timedelta(days=today.weekday())
+        return self.get_with_unpaid_milestone_due(
+            start, start + timedelta(days=6), user_id=user_id
+        )
@@ -4,9 +4,16 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 from sqlalchemy import select, desc
 
+from ..core.tracing import trace_methods
+from ..infra.response_cache import invalidate_tags
 from ..models.rate_calculation import RateCalculation
 
 
+def _invalidate_user_rates(user_id) -> None:
+    invalidate_tags(f"rates:user:{user_id}")
+
+
+@trace_methods("RateRepository")
 class RateRepository:
     """Repository for rate calculation-related database operations."""
 
@@ -36,6 +43,7 @@ class RateRepository:
         self.db.add(calculation)
         self.db.commit()
         self.db.refresh(calculation)
+        _invalidate_user_rates(calculation.user_id)
         return calculation
 
     def update(
@@ -46,12 +54,15 @@ class RateRepository:
             setattr(calculation, key, value)
         self.db.commit()
         self.db.refresh(calculation)
+        _invalidate_user_rates(calculation.user_id)
         return calculation
 
     def delete(self, calculation: RateCalculation) -> None:
         """Delete rate calculation."""
+        user_id = calculation.user_id
         self.db.delete(calculation)
         self.db.commit()
+        _invalidate_user_rates(user_id)
 
     def get_favorites(self, user_id: int) -> List[RateCalculation]:
         """Get favorite rate calculations for a user."""
@@ -74,6 +85,7 @@ class RateRepository:
             calculation.is_favorite = is_favorite  # type: ignore[assignment]
             self.db.commit()
             self.db.refresh(calculation)
+            _invalidate_user_rates(user_id)
             return calculation
         return None
 
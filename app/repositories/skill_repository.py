@@ -0,0 +1,80 @@
+"""Skill repository for data access operations."""
+
+from typing import Any, Iterable, List, Tuple
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..core.tracing import trace_methods
+from ..models.skill import Skill, user_skills
+from ..models.user import User
+
+
+@trace_methods("SkillRepository")
+class SkillRepository:
+    """Repository for the skill dictionary and user-skill links."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_all(self) -> List[Skill]:
+        """List every dictionary skill ordered by name."""
+        stmt = select(Skill).order_by(Skill.name)
+        return list(self.db.execute(stmt).scalars().all())
+
+    def create(self, skill_data: dict) -> Skill:
+        """Create a new dictionary skill."""
+        skill = Skill(**skill_data)
+        self.db.add(skill)
+        self.db.commit()
+        self.db.refresh(skill)
+        return skill
+
+    def version(self) -> Tuple[Any, ...]:
+        """Row count, highest id and latest update: changes with any edit."""
+        stmt = select(func.count(), func.max(Skill.id), func.max(Skill.updated_at))
+        return tuple(self.db.execute(stmt).one())
+
+    def get_ids_by_names(self, names: Iterable[str]) -> List[int]:
+        """Resolve canonical skill names to ids."""
+        names = list(names)
+        if not names:
+            return []
+        stmt = select(Skill.id).where(Skill.name.in_(names))
+        return list(self.db.execute(stmt).scalars().all())
+
+    def set_user_skills(
+        self, user_id: int, skill_ids: Iterable[int], commit: bool = True
+    ) -> None:
+        """Replace the set of skills linked to a user."""
+        self.db.execute(delete(user_skills).where(user_skills.c.user_id == user_id))
+        rows = [
+            {"user_id": user_id, "skill_id": skill_id} for skill_id in set(skill_ids)
+        ]
+        if rows:
+            self.db.execute(insert(user_skills), rows)
+        if commit:
+            self.db.commit()
+
+    def count_for_user(self, user_id: int) -> int:
+        """Count skills linked to a user."""
+        stmt = (
+            select(func.count())
+            .select_from(user_skills)
+            .where(user_skills.c.user_id == user_id)
+        )
+        return int(self.db.execute(stmt).scalar_one())
+
+    def get_users_with_skill(
+        self, skill_id: int, skip: int = 0, limit: int = 100
+    ) -> List[User]:
+        """Get active users linked to a skill via the indexed association."""
+        stmt = (
+            select(User)
+            .join(user_skills, user_skills.c.user_id == User.id)
+            .where(user_skills.c.skill_id == skill_id, User.is_active.is_(True))
+            .order_by(User.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).scalars().all())
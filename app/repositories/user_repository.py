@@ -1,12 +1,74 @@
 """User repository for data access operations."""
 
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    desc,
+    exists,
+    func,
+    literal,
+    select,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 
+from ..core.tracing import trace_methods
+from ..infra.principal_cache import invalidate_principal
 from ..models.user import User, UserProfile
 
+# Collections with user_id/created_at columns support per-user limits
+USER_COLLECTIONS = ("rate_calculations", "invoices", "contracts")
 
+
+@dataclass
+class UserLoadPlan:
+    """Explicit eager-loading plan for User aggregates.
+
+    ``collections`` maps a User collection relationship to the number of
+    most recent rows to load per user (``None`` loads all of them). Capped
+    collections are returned in ``LoadedUser.recent``; the relationship
+    itself is left unloaded so a truncated window is never mistaken for the
+    full (cascading) collection. With ``strict`` set, any relationship
+    outside the plan raises on access instead of silently issuing a lazy
+    query.
+    """
+
+    profile: bool = True
+    collections: Dict[str, Optional[int]] = field(default_factory=dict)
+    strict: bool = True
+
+    def __post_init__(self) -> None:
+        unknown = set(self.collections) - {*USER_COLLECTIONS, "skills"}
+        if unknown:
+            raise ValueError(f"Unknown User collections: {sorted(unknown)}")
+        if self.collections.get("skills") is not None:
+            raise ValueError("User.skills can only be loaded in full")
+
+
+@dataclass
+class LoadedUser:
+    """A user loaded by a ``UserLoadPlan`` and its capped collections."""
+
+    user: User
+    recent: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def rows(self, name: str) -> List[Any]:
+        """Rows of a planned collection: the recent window when capped."""
+        if name in self.recent:
+            return self.recent[name]
+        return list(getattr(self.user, name))
+
+
+RECENT_ACTIVITY_PLAN = UserLoadPlan(
+    profile=True,
+    collections={"rate_calculations": 10, "invoices": 10, "contracts": 10},
+)
+
+
+@trace_methods("UserRepository")
 class UserRepository:
     """Repository for user-related database operations."""
 
@@ -17,6 +79,75 @@ class UserRepository:
         """Get user by ID."""
         return self.db.get(User, user_id)
 
+    def get_with_plan(self, user_id: int, plan: UserLoadPlan) -> Optional[LoadedUser]:
+        """Get a user with relationships loaded according to ``plan``."""
+        users = self._load_with_plan(select(User).where(User.id == user_id), plan)
+        return users[0] if users else None
+
+    def list_active_with_plan(
+        self, plan: UserLoadPlan, skip: int = 0, limit: int = 100
+    ) -> List[LoadedUser]:
+        """List active users with relationships loaded according to ``plan``.
+
+        Issues one query for users (profile joined) plus one per planned
+        collection, independent of the number of users.
+        """
+        stmt = (
+            select(User)
+            .where(User.is_active.is_(True))
+            .order_by(User.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return self._load_with_plan(stmt, plan)
+
+    def _load_with_plan(self, stmt: Select, plan: UserLoadPlan) -> List[LoadedUser]:
+        options = []
+        if plan.profile:
+            options.append(joinedload(User.profile))
+        for name, per_user_limit in plan.collections.items():
+            if per_user_limit is None:
+                options.append(selectinload(getattr(User, name)))
+        if plan.strict:
+            options.append(raiseload("*"))
+        users = list(self.db.execute(stmt.options(*options)).unique().scalars().all())
+        loaded = [LoadedUser(user) for user in users]
+        for name, per_user_limit in plan.collections.items():
+            if per_user_limit is not None and users:
+                recent = self._load_recent(users, name, per_user_limit)
+                for item in loaded:
+                    item.recent[name] = recent[int(item.user.id)]
+        return loaded
+
+    def _load_recent(
+        self, users: Sequence[User], name: str, limit: int
+    ) -> Dict[int, List[Any]]:
+        """Return each user's ``limit`` most recent rows of a collection."""
+        target = getattr(User, name).property.mapper.class_
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=target.user_id,
+                order_by=(desc(target.created_at), desc(target.id)),
+            )
+            .label("rank")
+        )
+        ranked = (
+            select(target.id, rank)
+            .where(target.user_id.in_([user.id for user in users]))
+            .subquery()
+        )
+        stmt = (
+            select(target)
+            .join(ranked, ranked.c.id == target.id)
+            .where(ranked.c.rank <= limit)
+            .order_by(target.user_id, ranked.c.rank)
+        )
+        by_user: Dict[int, List[Any]] = {int(user.id): [] for user in users}
+        for item in self.db.execute(stmt).scalars():
+            by_user[item.user_id].append(item)
+        return by_user
+
     def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
         stmt = select(User).where(User.email == email)
@@ -36,30 +167,41 @@ class UserRepository:
             setattr(user, key, value)
         self.db.commit()
         self.db.refresh(user)
+        invalidate_principal(int(user.id))
         return user
 
     def delete(self, user: User) -> None:
         """Delete user."""
+        user_id = int(user.id)
         self.db.delete(user)
         self.db.commit()
+        invalidate_principal(user_id)
 
     def get_profile(self, user_id: int) -> Optional[UserProfile]:
         """Get user profile by user ID."""
         stmt = select(UserProfile).where(UserProfile.user_id == user_id)
         return self.db.execute(stmt).scalar_one_or_none()
 
-    def create_profile(self, profile_data: dict) -> UserProfile:
-        """Create a new user profile."""
+    def create_profile(self, profile_data: dict, commit: bool = True) -> UserProfile:
+        """Create a new user profile (only flushed with ``commit=False``)."""
         profile = UserProfile(**profile_data)
         self.db.add(profile)
+        if not commit:
+            self.db.flush()
+            return profile
         self.db.commit()
         self.db.refresh(profile)
         return profile
 
-    def update_profile(self, profile: UserProfile, profile_data: dict) -> UserProfile:
-        """Update user profile data."""
+    def update_profile(
+        self, profile: UserProfile, profile_data: dict, commit: bool = True
+    ) -> UserProfile:
+        """Update user profile data (only flushed with ``commit=False``)."""
         for key, value in profile_data.items():
             setattr(profile, key, value)
+        if not commit:
+            self.db.flush()
+            return profile
         self.db.commit()
         self.db.refresh(profile)
         return profile
@@ -73,3 +215,24 @@ class UserRepository:
         """Count total number of users."""
         stmt = select(User)
         return len(list(self.db.execute(stmt).scalars().all()))
+
+    def search_by_skill(
+        self, skill: str, skip: int = 0, limit: int = 100
+    ) -> List[UserProfile]:
+        """Find profiles listing a skill, using the skills GIN index on Postgres."""
+        condition: ColumnElement[bool]
+        if self.db.get_bind().dialect.name == "postgresql":
+            condition = type_coerce(UserProfile.skills, JSONB).contains([skill])
+        else:
+            entry = func.json_each(UserProfile.skills).table_valued("value").alias("s")
+            condition = exists(
+                select(literal(1)).select_from(entry).where(entry.c.value == skill)
+            )
+        stmt = (
+            select(UserProfile)
+            .where(condition)
+            .order_by(UserProfile.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).scalars().all())
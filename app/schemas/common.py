@@ -1,8 +1,31 @@
 """Common response schemas."""
 
+from typing import Dict, Optional
+
 from pydantic import BaseModel, Field
 
 
 class HealthResponse(BaseModel):
-    status: str = Field(default="ok", description="Service status")
+    status: str = Field(
+        default="ok", description="Service status (ok, or degraded on fallbacks)"
+    )
+    service: str = Field(default="qeem-backend", description="Service name")
+    dependencies: Dict[str, str] = Field(
+        default_factory=dict, description="Dependency state, e.g. Redis breaker"
+    )
+
+
+class DependencyCheck(BaseModel):
+    status: str = Field(..., description="ok, error or timeout")
+    latency_ms: float = Field(..., description="Time the check took")
+    required: bool = Field(..., description="Whether failure makes us not ready")
+    error: Optional[str] = None
+
+
+class ReadinessResponse(BaseModel):
+    status: str = Field(..., description="ready, degraded or not_ready")
     service: str = Field(default="qeem-backend", description="Service name")
+    checks: Dict[str, DependencyCheck] = Field(default_factory=dict)
+    age_seconds: float = Field(
+        default=0.0, description="How long ago the checks ran (results are cached)"
+    )
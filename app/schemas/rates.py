@@ -5,6 +5,16 @@ from typing import Literal, Annotated
 from pydantic import BaseModel, Field
 from typing import List
 
+RATE_RATIONALE = (
+    "Rule-based calculation using project complexity, experience, "
+    "skills, client region, and urgency."
+)
+MARKET_RATIONALE = (
+    "Median market rate for the project type, experience level and location, "
+    "adjusted for project complexity, skills, client region, and urgency."
+)
+RATIONALES = {"rule_based": RATE_RATIONALE, "market_based": MARKET_RATIONALE}
+
 
 class RateRequest(BaseModel):
     project_type: Literal[
@@ -25,7 +35,11 @@ class RateRequest(BaseModel):
         ..., description="Years of experience"
     )
     skills_count: Annotated[int, Field(ge=0, le=100)] = Field(
-        ..., description="Number of relevant skills"
+        ...,
+        description=(
+            "Number of relevant skills; replaced by the count derived from the "
+            "user's linked profile skills when available"
+        ),
     )
     location: str = Field(..., description="Primary work location (city, country)")
     client_region: Literal["egypt", "mena", "europe", "usa", "global"] = "egypt"
@@ -37,13 +51,8 @@ class RateResponse(BaseModel):
     competitive_rate: Annotated[float, Field(ge=0)]  # EGP/hour
     premium_rate: Annotated[float, Field(ge=0)]  # EGP/hour
     currency: Literal["EGP"] = "EGP"
-    method: Literal["rule_based"] = "rule_based"
-    rationale: str = Field(
-        default=(
-            "Rule-based calculation using project complexity, experience, "
-            "skills, client region, and urgency."
-        )
-    )
+    method: Literal["rule_based", "market_based"] = "rule_based"
+    rationale: str = Field(default=RATE_RATIONALE)
 
 
 class RateHistoryResponse(BaseModel):
@@ -7,13 +7,24 @@ minimum, competitive, and premium hourly rates in EGP based on:
  - Number of relevant skills
  - Client region (Egypt, MENA, Europe, USA, Global)
  - Urgency (normal vs rush)
+
+With ``MARKET_INDEX_ENABLED``, the median rate of the request's market
+segment (project type, experience level, location) from the shared market
+index replaces the placeholder project-type baseline and the experience
+multiplier; the other multipliers still apply.
 """
 
+import math
 from typing import Dict, Optional, Union
 from sqlalchemy.orm import Session
 
+from ..core.config import get_settings
+from ..core.metrics import RATE_CALCULATIONS
+from ..core.tracing import span, traced
+from ..infra.market_index import market_index
 from ..schemas.rates import RateRequest
 from ..repositories.rate_repository import RateRepository
+from .skills import derive_skills_count
 
 
 def _base_rate_for_project_type(project_type: str) -> float:
@@ -80,22 +91,71 @@ def _urgency_multiplier(urgency: str) -> float:
     return 1.15 if urgency == "rush" else 1.0
 
 
-def calculate_compensation_tiers(
-    payload: RateRequest, db: Optional[Session] = None, user_id: Optional[int] = None
+# Market segments built from fewer samples fall back to the rule baseline
+MIN_MARKET_SAMPLE_SIZE = 20
+
+
+def _experience_level(years: int) -> str:
+    """Map years of experience onto ``MarketStatistics.experience_level``."""
+    if years < 3:
+        return "junior"
+    if years < 8:
+        return "mid"
+    return "senior"
+
+
+def market_baseline(payload: RateRequest) -> Optional[float]:
+    """Median hourly rate of the request's market segment, if well sampled."""
+    if not get_settings().market_index_enabled:
+        return None
+    segment = market_index.lookup(
+        payload.project_type,
+        _experience_level(int(payload.experience_years)),
+        payload.location,
+    )
+    if (
+        segment is None
+        or segment.sample_size < MIN_MARKET_SAMPLE_SIZE
+        or not math.isfinite(segment.median_rate)
+        or segment.median_rate <= 0
+    ):
+        return None
+    return segment.median_rate
+
+
+def _resolve_skills_count(
+    payload: RateRequest, db: Optional[Session], user_id: Optional[int]
+) -> int:
+    """Prefer the count derived from the user's linked skills over the client's."""
+    if db and user_id:
+        derived = derive_skills_count(db, user_id)
+        if derived is not None:
+            return derived
+    return int(payload.skills_count)
+
+
+def compute_tiers(
+    payload: RateRequest, skills_count: int, market_rate: Optional[float] = None
 ) -> Dict[str, Union[float, str]]:
-    """Compute hourly rate tiers in EGP.
+    """Apply the rule tables to a request; no I/O and no metrics.
 
     Strategy:
-      base = project_type baseline
-      x complexity x experience x skills x client_region x urgency
+      base = project_type baseline x experience
+             (or ``market_rate``, already specific to the experience level)
+      x complexity x skills x client_region x urgency
       tiers: min=0.8x, competitive=1.0x, premium=1.3x (rounded to whole EGP)
     """
-    base = _base_rate_for_project_type(payload.project_type)
+    if market_rate is None:
+        base = _base_rate_for_project_type(
+            payload.project_type
+        ) * _experience_multiplier(int(payload.experience_years))
+        method = "rule_based"
+    else:
+        base, method = market_rate, "market_based"
     value = (
         base
         * _complexity_multiplier(payload.project_complexity)
-        * _experience_multiplier(int(payload.experience_years))
-        * _skills_multiplier(int(payload.skills_count))
+        * _skills_multiplier(skills_count)
         * _client_region_multiplier(payload.client_region)
         * _urgency_multiplier(payload.urgency)
     )
@@ -105,14 +165,30 @@ def calculate_compensation_tiers(
     competitive_rate = round(value)
     premium_rate = round(value * 1.3)
 
-    result: Dict[str, Union[float, str]] = {
+    return {
         "minimum_rate": float(minimum_rate),
         "competitive_rate": float(competitive_rate),
         "premium_rate": float(premium_rate),
         "currency": "EGP",
-        "method": "rule_based",
+        "method": method,
     }
 
+
+@traced("rates.calculate_compensation_tiers")
+def calculate_compensation_tiers(
+    payload: RateRequest, db: Optional[Session] = None, user_id: Optional[int] = None
+) -> Dict[str, Union[float, str]]:
+    """Compute hourly rate tiers in EGP (see ``compute_tiers``).
+
+    The skills count comes from the user's profile when available, and the
+    calculation is saved for authenticated users.
+    """
+    skills_count = _resolve_skills_count(payload, db, user_id)
+    market_rate = market_baseline(payload)
+    with span("rates.compute_tiers"):
+        result = compute_tiers(payload, skills_count, market_rate)
+    RATE_CALCULATIONS.labels(str(result["method"])).inc()
+
     # Save calculation to database if session and user_id are provided
     if db and user_id:
         rate_repo = RateRepository(db)
@@ -122,12 +198,12 @@ def calculate_compensation_tiers(
             "project_complexity": payload.project_complexity,
             "estimated_hours": payload.estimated_hours,
             "experience_years": payload.experience_years,
-            "skills_count": payload.skills_count,
+            "skills_count": skills_count,
             "location": payload.location,
             "minimum_rate": result["minimum_rate"],
             "competitive_rate": result["competitive_rate"],
             "premium_rate": result["premium_rate"],
-            "calculation_method": "rule_based",
+            "calculation_method": result["method"],
         }
         rate_repo.create(calculation_data)
 
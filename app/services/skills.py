@@ -0,0 +1,202 @@
+"""Skill canonicalization and search service.
+
+The skill dictionary is small and rarely changes, so each worker loads it
+into a ``SkillIndex`` that resolves free-text skill names (case and
+whitespace folded, aliases included) to canonical dictionary entries and
+serves prefix lookups for autocomplete. The index is reloaded after
+``SKILL_INDEX_TTL`` seconds, and linking a profile checks the dictionary
+version before dropping a skill as unknown, so a skill added through
+another worker is never lost from a profile's links.
+
+Profile writes go through ``create_profile`` / ``update_profile`` here, which
+store the profile and its skill links in one transaction.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import get_settings
+from ..models.skill import Skill
+from ..models.user import User, UserProfile
+from ..repositories.skill_repository import SkillRepository
+from ..repositories.user_repository import UserRepository
+
+
+def normalize_skill(raw: str) -> str:
+    """Fold case and collapse whitespace for lookup keys."""
+    return " ".join(str(raw).split()).casefold()
+
+
+class SkillIndex:
+    """In-memory lookup from normalized spellings to canonical skills."""
+
+    def __init__(
+        self,
+        entries: Iterable[Tuple[int, str, Iterable[str]]],
+        version: Tuple[Any, ...] = (),
+    ):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self._by_key: Dict[str, Tuple[int, str]] = {}
+        for skill_id, name, aliases in entries:
+            for spelling in (name, *aliases):
+                key = normalize_skill(spelling)
+                if key:
+                    self._by_key.setdefault(key, (skill_id, name))
+        self._keys: List[str] = sorted(self._by_key)
+
+    def __len__(self) -> int:
+        return len({skill_id for skill_id, _ in self._by_key.values()})
+
+    def lookup(self, raw: str) -> Optional[Tuple[int, str]]:
+        """Return ``(skill_id, canonical_name)`` for a spelling, if known."""
+        return self._by_key.get(normalize_skill(raw))
+
+    def canonicalize(self, raw_skills: Iterable[str]) -> List[Tuple[int, str]]:
+        """Resolve spellings to distinct canonical skills, dropping unknowns."""
+        seen: Dict[int, str] = {}
+        for raw in raw_skills:
+            match = self.lookup(raw)
+            if match is not None:
+                seen.setdefault(*match)
+        return list(seen.items())
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Return canonical names with a spelling starting with ``prefix``."""
+        key = normalize_skill(prefix)
+        names: List[str] = []
+        for i in range(bisect_left(self._keys, key), len(self._keys)):
+            candidate = self._keys[i]
+            if not candidate.startswith(key) or len(names) >= limit:
+                break
+            name = self._by_key[candidate][1]
+            if name not in names:
+                names.append(name)
+        return names
+
+
+_index: Optional[SkillIndex] = None
+_index_lock = threading.Lock()
+
+
+def load_skill_index(db: Session) -> SkillIndex:
+    """Build a fresh index from the skill dictionary."""
+    repo = SkillRepository(db)
+    version = repo.version()
+    return SkillIndex(
+        (
+            (int(skill.id), str(skill.name), skill.aliases or [])
+            for skill in repo.list_all()
+        ),
+        version=version,
+    )
+
+
+def get_skill_index(db: Session) -> SkillIndex:
+    """Return the per-worker index, loading it on first use or once expired."""
+    global _index
+    ttl = get_settings().skill_index_ttl_seconds
+    index = _index
+    if index is None or time.monotonic() - index.loaded_at >= ttl:
+        with _index_lock:
+            # Unless another thread reloaded it meanwhile
+            if _index is None or _index is index:
+                _index = load_skill_index(db)
+            index = _index
+    return index
+
+
+def _current_skill_index(db: Session) -> SkillIndex:
+    """The index, reloaded first if the dictionary changed since it was built."""
+    global _index
+    index = get_skill_index(db)
+    if SkillRepository(db).version() != index.version:
+        with _index_lock:
+            _index = index = load_skill_index(db)
+    return index
+
+
+def reset_skill_index() -> None:
+    """Drop the cached index so the next call reloads it."""
+    global _index
+    with _index_lock:
+        _index = None
+
+
+def sync_profile_skills(db: Session, profile: UserProfile) -> List[str]:
+    """Link a profile's free-text skills to dictionary entries.
+
+    Returns the canonical names that were linked; unknown skills are kept in
+    ``UserProfile.skills`` but not counted. Before a skill is dropped as
+    unknown the dictionary version is checked, so skills added through
+    another worker are found. The caller commits.
+    """
+    raw_skills = profile.skill_names
+    index = get_skill_index(db)
+    if any(index.lookup(raw) is None for raw in raw_skills):
+        index = _current_skill_index(db)
+    matches = index.canonicalize(raw_skills)
+    SkillRepository(db).set_user_skills(
+        int(profile.user_id), [skill_id for skill_id, _ in matches], commit=False
+    )
+    return [name for _, name in matches]
+
+
+def create_profile(db: Session, profile_data: dict) -> UserProfile:
+    """Create a profile and link its skills in one transaction."""
+    try:
+        profile = UserRepository(db).create_profile(profile_data, commit=False)
+        sync_profile_skills(db, profile)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(profile)
+    return profile
+
+
+def update_profile(
+    db: Session, profile: UserProfile, profile_data: dict
+) -> UserProfile:
+    """Update a profile, relinking its skills in the same transaction."""
+    try:
+        UserRepository(db).update_profile(profile, profile_data, commit=False)
+        if "skills" in profile_data:
+            sync_profile_skills(db, profile)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(profile)
+    return profile
+
+
+def create_skill(db: Session, skill_data: dict) -> Skill:
+    """Add a dictionary skill; this worker's index is rebuilt on next use.
+
+    Other workers pick it up through the version check when linking, and
+    for search and autocomplete within ``SKILL_INDEX_TTL``.
+    """
+    skill = SkillRepository(db).create(skill_data)
+    reset_skill_index()
+    return skill
+
+
+def derive_skills_count(db: Session, user_id: int) -> Optional[int]:
+    """Return the number of dictionary skills linked to a user, if any."""
+    count = SkillRepository(db).count_for_user(user_id)
+    return count or None
+
+
+def search_users_by_skill(
+    db: Session, raw_skill: str, skip: int = 0, limit: int = 100
+) -> List[User]:
+    """Find active users with a skill given in any known spelling."""
+    match = get_skill_index(db).lookup(raw_skill)
+    if match is None:
+        return []
+    return SkillRepository(db).get_users_with_skill(match[0], skip=skip, limit=limit)
@@ -0,0 +1,158 @@
+"""Benchmark: BaseHTTPMiddleware vs pure ASGI middleware.
+
+Builds the same app twice, once with the request-context and rate limiting
+middleware written as ``@app.middleware("http")`` functions (the previous
+implementation) and once with the pure ASGI classes from ``app``, and drives
+``/health`` and ``/api/v1/rates/calculate`` in-process (no sockets).
+
+The rate limiter runs in hybrid mode against the Redis at REDIS_URL when
+reachable, otherwise fakeredis (``pip install "fakeredis[lua]"``), so the
+limiter's own cost is the same on both sides.
+
+    python benchmarks/bench_asgi_middleware.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from starlette.responses import Response  # noqa: E402
+
+from app.api.v1 import rates as rates_router  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.core.middleware import RequestContextMiddleware  # noqa: E402
+from app.infra.rate_limit import (  # noqa: E402
+    HybridRateLimiter,
+    RateLimit,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+)
+from app.schemas.common import HealthResponse  # noqa: E402
+
+PAYLOAD = {
+    "project_type": "web_development",
+    "project_complexity": "moderate",
+    "estimated_hours": 40,
+    "experience_years": 3,
+    "skills_count": 5,
+    "location": "Cairo, Egypt",
+    "client_region": "egypt",
+    "urgency": "normal",
+}
+
+
+async def _redis_client():
+    import redis.asyncio as aioredis
+
+    client = aioredis.from_url(get_settings().redis_url, decode_responses=True)
+    try:
+        await client.ping()
+        return client, "redis"
+    except Exception:
+        import fakeredis
+
+        return fakeredis.FakeAsyncRedis(decode_responses=True), "fakeredis"
+
+
+def _base_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health", response_model=HealthResponse)
+    async def health() -> HealthResponse:
+        return HealthResponse()
+
+    app.include_router(rates_router.router, prefix="/api/v1")
+    return app
+
+
+def _http_middleware_app(policy: RateLimitPolicy, limiter) -> FastAPI:
+    """The previous BaseHTTPMiddleware implementation."""
+    app = _base_app()
+
+    @app.middleware("http")
+    async def rate_limit(request: Request, call_next):
+        client_host = request.client.host if request.client else "unknown"
+        key, rate = await policy.resolve(
+            request.url.path, client_host, request.headers.get("authorization")
+        )
+        decision = await limiter.hit(key, rate)
+        if not decision.allowed:
+            return Response(status_code=429, headers=decision.headers())
+        response = await call_next(request)
+        response.headers.update(decision.headers())
+        return response
+
+    @app.middleware("http")
+    async def request_context(request: Request, call_next):
+        start = time.perf_counter()
+        request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        response.headers["Server-Timing"] = f"app;dur={elapsed_ms:.2f}"
+        return response
+
+    return app
+
+
+def _asgi_middleware_app(policy: RateLimitPolicy, limiter) -> FastAPI:
+    app = _base_app()
+    app.add_middleware(RateLimitMiddleware, policy=policy, limiter=limiter)
+    app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+async def _measure(app: FastAPI, method: str, path: str, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    kwargs = {"json": PAYLOAD} if method == "POST" else {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://b") as client:
+        for _ in range(50):  # warm up
+            response = await client.request(method, path, **kwargs)
+            response.raise_for_status()
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.request(method, path, **kwargs)
+        return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    redis, backend = await _redis_client()
+    policy = RateLimitPolicy(
+        anonymous=RateLimit(10**9, 3600), authenticated=RateLimit(10**9, 3600)
+    )
+    apps = {
+        "http middleware": _http_middleware_app(policy, HybridRateLimiter(redis)),
+        "pure ASGI": _asgi_middleware_app(policy, HybridRateLimiter(redis)),
+    }
+
+    print(f"🧵 Middleware throughput ({backend}, {args.requests} requests each)")
+    print("=" * 60)
+    for method, path in (("GET", "/health"), ("POST", "/api/v1/rates/calculate")):
+        print(f"{method} {path}")
+        results = {}
+        for name, app in apps.items():
+            results[name] = await _measure(app, method, path, args.requests)
+            print(
+                f"  {name:>15}: {args.requests / results[name]:8.0f} req/s "
+                f"({results[name] / args.requests * 1e6:6.1f} µs/request)"
+            )
+        speedup = results["http middleware"] / results["pure ASGI"]
+        print(f"  {'speedup':>15}: {speedup:8.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
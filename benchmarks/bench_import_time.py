@@ -0,0 +1,103 @@
+"""Import-time report: what ``import app.main`` costs on a cold start.
+
+Runs ``python -X importtime`` in fresh interpreters (several runs, keeping
+each module's fastest time to damp noise) and reports the total, the
+slowest modules by cumulative and self time, and the time per top-level
+package, so regressions show up as a named import rather than a slower
+container start.
+
+    python benchmarks/bench_import_time.py --runs 5 --top 25
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(module: str) -> Tuple[Dict[str, Tuple[int, int, int]], float]:
+    """Import ``module`` in a fresh interpreter.
+
+    Returns ``{name: (self_us, cumulative_us, depth)}`` and the wall time in
+    seconds measured inside the child.
+    """
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite:///./test_ci.db")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules[name] = (int(own), int(cumulative), len(indent) // 2)
+    return modules, float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    # The first run warms the bytecode cache and is not counted
+    import_profile(args.module)
+    walls: List[float] = []
+    best: Dict[str, Tuple[int, int, int]] = {}
+    for _ in range(args.runs):
+        modules, wall = import_profile(args.module)
+        walls.append(wall)
+        for name, timing in modules.items():
+            if name not in best or timing[1] < best[name][1]:
+                best[name] = timing
+
+    print(f"⏱️  import {args.module} ({args.runs} fresh interpreters)")
+    print("=" * 72)
+    print(
+        f"wall: min {min(walls) * 1000:.0f} ms, "
+        f"median {statistics.median(walls) * 1000:.0f} ms, "
+        f"{len(best)} modules"
+    )
+
+    print(f"\nslowest by cumulative time (top {args.top}):")
+    for name, (own, cumulative, depth) in sorted(
+        best.items(), key=lambda item: -item[1][1]
+    )[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}")
+
+    print(f"\nslowest by self time (top {args.top}):")
+    for name, (own, _, _) in sorted(best.items(), key=lambda item: -item[1][0])[
+        : args.top
+    ]:
+        print(f"  {own / 1000:8.1f} ms  {name}")
+
+    packages: Dict[str, int] = defaultdict(int)
+    for name, (own, _, _) in best.items():
+        packages[name.split(".")[0]] += own
+    print(f"\nself time per top-level package (top {args.top}):")
+    for package, own in sorted(packages.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"  {own / 1000:8.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark: JSON log formatting throughput.
+
+Compares the previous formatter (stdlib json, level/name/message only) with
+the shared ``JsonFormatter`` using stdlib json and orjson, outside a request
+and inside a bound request context (which adds six fields).
+
+    python benchmarks/bench_log_formatter.py --records 200000
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import logging as app_logging  # noqa: E402
+from app.core.context import (  # noqa: E402
+    RequestContext,
+    bind_request,
+    reset_request,
+)
+from app.core.logging import JsonFormatter  # noqa: E402
+
+
+class PreviousJsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage(),
+        }
+        return json.dumps(payload)
+
+
+def _record() -> logging.LogRecord:
+    return logging.LogRecord(
+        "uvicorn.access",
+        logging.INFO,
+        __file__,
+        1,
+        '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:52000", "POST", "/api/v1/rates/calculate", "1.1", 200),
+        None,
+    )
+
+
+def _measure(formatter: logging.Formatter, records: int) -> float:
+    record = _record()
+    for _ in range(1000):  # warm up
+        formatter.format(record)
+    start = time.perf_counter()
+    for _ in range(records):
+        formatter.format(record)
+    return records / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=200000)
+    args = parser.parse_args()
+
+    formatters = {"previous (json)": PreviousJsonFormatter()}
+    formatters["shared (json)"] = JsonFormatter(use_orjson=False)
+    if app_logging.orjson is not None:
+        formatters["shared (orjson)"] = JsonFormatter()
+
+    context = RequestContext(
+        "3f2a9c", "POST", "/api/v1/rates/calculate", {"route": None}
+    )
+    context.user_id = 42
+
+    print(f"📝 JSON log formatting ({args.records} records each)")
+    print("=" * 60)
+    baseline = _measure(formatters["previous (json)"], args.records)
+    for name, formatter in formatters.items():
+        plain = _measure(formatter, args.records)
+        token = bind_request(context)
+        try:
+            in_request = _measure(formatter, args.records)
+        finally:
+            reset_request(token)
+        print(
+            f"{name:>16}: {plain:10.0f} rec/s ({plain / baseline:4.2f}x)  "
+            f"in request: {in_request:10.0f} rec/s ({in_request / baseline:4.2f}x)"
+        )
+    if app_logging.orjson is None:
+        print("orjson not installed; pip install orjson for the fast path")
+
+
+if __name__ == "__main__":
+    main()
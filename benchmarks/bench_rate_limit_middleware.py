@@ -0,0 +1,98 @@
+"""Benchmark: per-request overhead of the rate limiting middleware.
+
+Drives a minimal FastAPI app in-process (no sockets) with and without the
+middleware. Uses the Redis at REDIS_URL when reachable, otherwise an
+in-memory fakeredis (``pip install "fakeredis[lua]"``), which measures the
+middleware's own CPU cost but not network latency.
+
+    python benchmarks/bench_rate_limit_middleware.py --requests 5000
+    python benchmarks/bench_rate_limit_middleware.py --mode hybrid
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.infra.rate_limit import (  # noqa: E402
+    HybridRateLimiter,
+    RateLimit,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    RedisRateLimiter,
+)
+
+
+async def _redis_client():
+    import redis.asyncio as aioredis
+
+    client = aioredis.from_url(get_settings().redis_url, decode_responses=True)
+    try:
+        await client.ping()
+        return client, "redis"
+    except Exception:
+        import fakeredis
+
+        return fakeredis.FakeAsyncRedis(decode_responses=True), "fakeredis"
+
+
+def _build_app(limiter=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "ok"}
+
+    if limiter is not None:
+        policy = RateLimitPolicy(
+            anonymous=RateLimit(10**9, 3600), authenticated=RateLimit(10**9, 3600)
+        )
+        app.add_middleware(RateLimitMiddleware, policy=policy, limiter=limiter)
+    return app
+
+
+async def _measure(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://b") as client:
+        for _ in range(50):  # warm up
+            await client.get("/health")
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get("/health")
+        return (time.perf_counter() - start) / requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--mode", choices=("atomic", "hybrid"), default="atomic")
+    args = parser.parse_args()
+
+    redis, backend = await _redis_client()
+    limiter = (
+        HybridRateLimiter(redis) if args.mode == "hybrid" else RedisRateLimiter(redis)
+    )
+    baseline = await _measure(_build_app(), args.requests)
+    limited = await _measure(_build_app(limiter), args.requests)
+
+    print(
+        f"🚦 Rate limit middleware overhead "
+        f"({args.mode}, {backend}, {args.requests} requests)"
+    )
+    print("=" * 50)
+    print(f"without limiter: {baseline * 1e6:8.1f} µs/request")
+    print(f"   with limiter: {limited * 1e6:8.1f} µs/request")
+    print(f"       overhead: {(limited - baseline) * 1e6:8.1f} µs/request")
+    if isinstance(limiter, HybridRateLimiter):
+        print(f"   limiter stats: {limiter.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+"""Benchmark: per-request CPU spent serializing rate responses.
+
+``/api/v1/rates/calculate`` is driven in-process (no sockets) twice: once
+through the previous endpoint, which returned a ``RateResponse`` for FastAPI
+to validate again and encode with stdlib json, and once through the current
+router, which returns the pre-encoded body. A second section serializes a
+``RateHistoryResponse`` of ``--items`` entries the way FastAPI does for a
+returned model versus ``model_response``.
+
+    python benchmarks/bench_rate_serialization.py --requests 5000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import httpx  # noqa: E402
+from fastapi import APIRouter, Depends, FastAPI  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+
+from app.api import responses as app_responses  # noqa: E402
+from app.api.deps import get_db  # noqa: E402
+from app.api.responses import FastJSONResponse, model_response  # noqa: E402
+from app.api.v1 import rates as rates_router  # noqa: E402
+from app.schemas.rates import (  # noqa: E402
+    RATE_RATIONALE,
+    RateHistoryResponse,
+    RateRequest,
+    RateResponse,
+)
+from app.services.rates import calculate_compensation_tiers  # noqa: E402
+
+PAYLOAD = {
+    "project_type": "web_development",
+    "project_complexity": "moderate",
+    "estimated_hours": 40,
+    "experience_years": 3,
+    "skills_count": 5,
+    "location": "Cairo, Egypt",
+    "client_region": "egypt",
+    "urgency": "normal",
+}
+
+
+def _previous_app() -> FastAPI:
+    """The previous endpoint: return the model, let FastAPI serialize it."""
+    router = APIRouter(prefix="/rates")
+
+    @router.post("/calculate", response_model=RateResponse)
+    async def calculate_rate(
+        payload: RateRequest, db: Session = Depends(get_db)
+    ) -> RateResponse:
+        tiers = calculate_compensation_tiers(payload, db=db, user_id=None)
+        return RateResponse(
+            minimum_rate=float(tiers["minimum_rate"]),
+            competitive_rate=float(tiers["competitive_rate"]),
+            premium_rate=float(tiers["premium_rate"]),
+            currency=tiers["currency"],
+            method=tiers["method"],
+            rationale=RATE_RATIONALE,
+        )
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    return app
+
+
+def _current_app() -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.include_router(rates_router.router, prefix="/api/v1")
+    return app
+
+
+async def _cpu_per_request(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://b") as client:
+        for _ in range(50):  # warm up
+            response = await client.post("/api/v1/rates/calculate", json=PAYLOAD)
+            response.raise_for_status()
+        start = time.process_time()
+        for _ in range(requests):
+            await client.post("/api/v1/rates/calculate", json=PAYLOAD)
+        return (time.process_time() - start) / requests
+
+
+def _history(items: int) -> RateHistoryResponse:
+    return RateHistoryResponse(
+        items=[
+            RateResponse(
+                minimum_rate=160.0 + i,
+                competitive_rate=200.0 + i,
+                premium_rate=260.0 + i,
+            )
+            for i in range(items)
+        ]
+    )
+
+
+async def _fastapi_serialize(history: RateHistoryResponse) -> bytes:
+    field = rates_router.router.routes[0].response_field  # type: ignore[attr-defined]
+    content = await serialize_response(field=field, response_content=history)
+    return JSONResponse(content).body
+
+
+def _per_call(fn: Callable[[], object], calls: int) -> float:
+    for _ in range(min(calls, 100)):  # warm up
+        fn()
+    start = time.process_time()
+    for _ in range(calls):
+        fn()
+    return (time.process_time() - start) / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"🧾 Rate response serialization ({args.requests} requests each)")
+    print("=" * 60)
+    previous = asyncio.run(_cpu_per_request(_previous_app(), args.requests))
+    current = asyncio.run(_cpu_per_request(_current_app(), args.requests))
+    print("POST /api/v1/rates/calculate (CPU per request)")
+    print(f"  {'previous':>10}: {previous * 1e6:7.1f} µs")
+    print(
+        f"  {'current':>10}: {current * 1e6:7.1f} µs "
+        f"(saves {(previous - current) * 1e6:.1f} µs, {previous / current:.2f}x)"
+    )
+
+    history = _history(args.items)
+    loop = asyncio.new_event_loop()
+    calls = max(args.requests // 10, 100)
+    fastapi_cost = _per_call(
+        lambda: loop.run_until_complete(_fastapi_serialize(history)), calls
+    )
+    direct_cost = _per_call(lambda: model_response(history).body, calls)
+    loop.close()
+    print(f"RateHistoryResponse with {args.items} items (CPU per response)")
+    print(f"  {'response_model':>14}: {fastapi_cost * 1e6:8.1f} µs")
+    print(
+        f"  {'model_response':>14}: {direct_cost * 1e6:8.1f} µs "
+        f"({fastapi_cost / direct_cost:.2f}x)"
+    )
+    if app_responses.orjson is None:
+        print("orjson not installed; FastJSONResponse is using stdlib json")
+
+
+if __name__ == "__main__":
+    main()
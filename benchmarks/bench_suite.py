@@ -0,0 +1,298 @@
+"""Microbenchmark suite for the rate engine and API hot paths.
+
+Cases:
+
+    rates.calculate              calculate_compensation_tiers, one request
+    rates.calculate_batch        the same over BATCH_SIZE varied requests
+                                 (reported per request)
+    schemas.rate_request         RateRequest validation from a JSON body
+    schemas.rate_response        RateResponse body as the endpoint encodes it
+    schemas.rate_response_model  RateResponse.model_dump_json
+    security.decode_token        cached verification (the common case)
+    security.verify_token        full JWT signature check
+    api.calculate                POST /api/v1/rates/calculate on the full
+                                 app, in-process over ASGI, SQLite database
+
+Each case is auto-ranged to run for at least --min-time per round and
+timed over --rounds rounds; the fastest round is the least disturbed by
+the rest of the machine, the median shows the spread. Results are written
+as JSON with the commit and interpreter they came from, to --output or else
+under the system temp directory, never into the work tree. --compare prints
+the change per case against an earlier file (--max-regression makes the run
+fail when a case got slower by more than that factor, for CI).
+
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --output /tmp/old.json
+    python benchmarks/bench_suite.py -k rates --compare /tmp/old.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("RATE_LIMITING_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from app.api.v1.rates import encode_rate_response  # noqa: E402
+from app.core import security  # noqa: E402
+from app.schemas.rates import RATE_RATIONALE, RateRequest, RateResponse  # noqa: E402
+from app.services.rates import calculate_compensation_tiers  # noqa: E402
+
+PAYLOAD = {
+    "project_type": "web_development",
+    "project_complexity": "moderate",
+    "estimated_hours": 40,
+    "experience_years": 3,
+    "skills_count": 5,
+    "location": "Cairo, Egypt",
+    "client_region": "egypt",
+    "urgency": "normal",
+}
+
+PROJECT_TYPES = ("web_development", "mobile_development", "design", "writing")
+COMPLEXITIES = ("simple", "moderate", "complex", "enterprise")
+REGIONS = ("egypt", "mena", "europe", "usa", "global")
+BATCH_SIZE = 100
+
+# A case returns a function running ``batch`` operations per call
+Case = Callable[[argparse.Namespace], Callable[[], object]]
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str, batch: int = 1) -> Callable[[Case], Case]:
+    def decorator(fn: Case) -> Case:
+        fn.batch = batch  # type: ignore[attr-defined]
+        CASES[name] = fn
+        return fn
+
+    return decorator
+
+
+def _requests(count: int) -> List[RateRequest]:
+    return [
+        RateRequest(
+            **{
+                **PAYLOAD,
+                "project_type": PROJECT_TYPES[i % len(PROJECT_TYPES)],
+                "project_complexity": COMPLEXITIES[i % len(COMPLEXITIES)],
+                "client_region": REGIONS[i % len(REGIONS)],
+                "experience_years": i % 12,
+                "skills_count": i % 10,
+                "urgency": "rush" if i % 7 == 0 else "normal",
+            }
+        )
+        for i in range(count)
+    ]
+
+
+@case("rates.calculate")
+def rates_calculate(args: argparse.Namespace) -> Callable[[], object]:
+    payload = RateRequest(**PAYLOAD)
+    return lambda: calculate_compensation_tiers(payload)
+
+
+@case("rates.calculate_batch", batch=BATCH_SIZE)
+def rates_calculate_batch(args: argparse.Namespace) -> Callable[[], object]:
+    payloads = _requests(BATCH_SIZE)
+    return lambda: [calculate_compensation_tiers(payload) for payload in payloads]
+
+
+@case("schemas.rate_request")
+def schemas_rate_request(args: argparse.Namespace) -> Callable[[], object]:
+    body = json.dumps(PAYLOAD).encode()
+    return lambda: RateRequest.model_validate_json(body)
+
+
+@case("schemas.rate_response")
+def schemas_rate_response(args: argparse.Namespace) -> Callable[[], object]:
+    tiers = calculate_compensation_tiers(RateRequest(**PAYLOAD))
+    return lambda: encode_rate_response(tiers)
+
+
+@case("schemas.rate_response_model")
+def schemas_rate_response_model(args: argparse.Namespace) -> Callable[[], object]:
+    response = RateResponse(
+        minimum_rate=160.0,
+        competitive_rate=200.0,
+        premium_rate=260.0,
+        rationale=RATE_RATIONALE,
+    )
+    return response.model_dump_json
+
+
+@case("security.decode_token")
+def security_decode_token(args: argparse.Namespace) -> Callable[[], object]:
+    token = security.create_access_token("42")
+    security.decode_token(token)
+    return lambda: security.decode_token(token)
+
+
+@case("security.verify_token")
+def security_verify_token(args: argparse.Namespace) -> Callable[[], object]:
+    token = security.create_access_token("42")
+    return lambda: security._verify_token(token)
+
+
+@case("api.calculate")
+def api_calculate(args: argparse.Namespace) -> Callable[[], object]:
+    from app.db.database import create_tables
+    from app.main import app
+
+    create_tables()
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+
+    async def post() -> None:
+        response = await client.post("/api/v1/rates/calculate", json=PAYLOAD)
+        response.raise_for_status()
+
+    return lambda: loop.run_until_complete(post())
+
+
+def measure(fn: Callable[[], object], rounds: int, min_time: float) -> List[float]:
+    """Seconds per call for each round, auto-ranging the calls per round."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        number *= 10
+    number = max(1, int(number * (min_time / elapsed)))
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - start) / number)
+    return per_call
+
+
+def run_case(name: str, args: argparse.Namespace) -> Dict[str, float]:
+    factory = CASES[name]
+    batch = getattr(factory, "batch", 1)
+    timings = measure(factory(args), args.rounds, args.min_time)
+    best = min(timings) / batch
+    median = statistics.median(timings) / batch
+    return {
+        "batch": batch,
+        "rounds": len(timings),
+        "min_us": round(best * 1e6, 3),
+        "median_us": round(median * 1e6, 3),
+        "stdev_us": round(statistics.pstdev(timings) / batch * 1e6, 3),
+        "ops_per_sec": round(1 / best, 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline_path: Path, max_regression: float
+) -> bool:
+    """Print the change per case; returns False on a regression over the limit."""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nvs {baseline_path.name} ({baseline['meta'].get('commit') or '?'}):")
+    ok = True
+    for name, result in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            print(f"  {name:<30} (new)")
+            continue
+        ratio = result["min_us"] / previous["min_us"]
+        flag = ""
+        if max_regression and ratio > max_regression:
+            flag, ok = "  REGRESSION", False
+        print(f"  {name:<30} {ratio:6.2f}x  ({previous['min_us']:.2f} µs){flag}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-k", "--filter", default="", help="run cases containing")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds/round")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="JSON file (default <tmp>/qeem-bench/<time>-<commit>.json)",
+    )
+    parser.add_argument("--compare", type=Path, help="earlier results JSON")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.0,
+        help="with --compare, exit 1 if a case is this many times slower",
+    )
+    args = parser.parse_args()
+
+    names = [name for name in CASES if args.filter in name]
+    commit = _git_commit()
+    print(f"📊 Benchmark suite ({len(names)} cases, {args.rounds} rounds)")
+    print("=" * 72)
+    print(f"  {'case':<30} {'min':>10} {'median':>10} {'ops/s':>12}")
+    results: Dict[str, Dict[str, float]] = {}
+    for name in names:
+        result = results[name] = run_case(name, args)
+        print(
+            f"  {name:<30} {result['min_us']:8.2f}µs {result['median_us']:8.2f}µs "
+            f"{result['ops_per_sec']:12,.0f}"
+        )
+
+    now = datetime.now(timezone.utc)
+    output = args.output or (
+        Path(tempfile.gettempdir())
+        / "qeem-bench"
+        / f"{now:%Y%m%dT%H%M%SZ}-{commit or 'unknown'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "meta": {
+            "timestamp": now.isoformat(),
+            "commit": commit,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "rounds": args.rounds,
+            "min_time": args.min_time,
+        },
+        "results": results,
+    }
+    output.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"\nresults: {output}")
+
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Microbenchmark: decode_token cost with and without the verification cache.
+
+Simulates one second of traffic at a target request rate where requests
+reuse a pool of long-lived tokens, and reports per-call cost and the share
+of one CPU core spent on token verification at that rate.
+
+    python benchmarks/bench_token_cache.py --rate 10000 --tokens 1000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import security  # noqa: E402
+
+
+def run(rate: int, tokens: int, cache_size: int) -> float:
+    """Return seconds spent decoding ``rate`` requests."""
+    pool = [security.create_access_token(str(i)) for i in range(tokens)]
+    requests = [random.choice(pool) for _ in range(rate)]
+    security._token_cache = security.ExpiringLRUCache(cache_size)
+    start = time.perf_counter()
+    for token in requests:
+        security.decode_token(token)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=10000, help="requests/second")
+    parser.add_argument("--tokens", type=int, default=1000, help="distinct tokens")
+    parser.add_argument("--cache-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"🔐 decode_token at {args.rate} req/s over {args.tokens} tokens")
+    print("=" * 50)
+    for label, size in (("uncached", 0), ("cached", args.cache_size)):
+        elapsed = run(args.rate, args.tokens, size)
+        per_call_us = elapsed / args.rate * 1e6
+        print(
+            f"{label:>9}: {per_call_us:8.2f} µs/call, "
+            f"{elapsed * 100:6.1f}% of one core"
+        )
+        if size:
+            print(f"{'':>9}  {security.token_cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Gunicorn settings for serving with several worker processes.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The master imports the app once (``preload_app``), warms its caches and
+freezes the heap, then forks uvicorn workers that share those pages
+copy-on-write. Database pools are per process (see ``app/db/database.py``)
+and everything that runs threads or holds sockets (Redis, log queue,
+tracing, rate limiter) starts in each worker's lifespan, after the fork.
+
+Environment:
+    UVICORN_HOST, UVICORN_PORT  bind address (default 0.0.0.0:8000)
+    UVICORN_WORKERS             worker count (default: one per CPU this
+                                process may use, counting its affinity mask
+                                and cgroup CPU quota, at most
+                                UVICORN_MAX_WORKERS)
+    UVICORN_MAX_WORKERS         cap on the default worker count (default 8)
+    PROMETHEUS_MULTIPROC_DIR    metrics directory shared by the workers,
+                                emptied at startup (default /tmp/qeem-prometheus)
+
+For a single process during development, ``uvicorn app.main:app --reload``
+is still the simplest.
+"""
+
+import gc
+import math
+import os
+import shutil
+from typing import Optional
+
+
+def _cgroup_cpu_limit() -> Optional[float]:
+    """CPUs allowed by the container's cgroup quota, if one is set."""
+    try:  # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:  # cgroup v1: quota is -1 when unlimited
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = f.read().strip()
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = f.read().strip()
+        return int(quota) / int(period) if int(quota) > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def default_workers() -> int:
+    """One worker per usable CPU, capped by ``UVICORN_MAX_WORKERS``.
+
+    ``cpu_count()`` reports the host's CPUs, which in a container limited
+    by affinity or a CPU quota starts far more workers than it can run.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        cpus: float = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+    limit = _cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, min(int(cpus), int(os.getenv("UVICORN_MAX_WORKERS") or 8)))
+
+
+bind = f"{os.getenv('UVICORN_HOST', '0.0.0.0')}:{os.getenv('UVICORN_PORT', '8000')}"
+workers = int(os.getenv("UVICORN_WORKERS") or default_workers())
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Trust X-Forwarded-* from the load balancer (uvicorn's --proxy-headers)
+forwarded_allow_ips = "*"
+graceful_timeout = 30
+accesslog = None
+
+# Must be set before the app imports prometheus_client
+_multiproc_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", "/tmp/qeem-prometheus"
+)
+os.makedirs(_multiproc_dir, exist_ok=True)
+
+
+def on_starting(server):
+    """Runs in the master after the app is preloaded, before any fork."""
+    from app.infra.warmup import warm_caches
+
+    # Start empty so samples from workers of a previous run are not
+    # aggregated. Done here, once per master, because this file is evaluated
+    # again on every HUP reload while the current workers keep writing.
+    shutil.rmtree(_multiproc_dir, ignore_errors=True)
+    os.makedirs(_multiproc_dir, exist_ok=True)
+
+    timings = warm_caches(server.app.wsgi())
+    server.log.info(
+        "warmed caches: %s",
+        ", ".join(
+            f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()
+        ),
+    )
+    # Keep the warm objects out of the collector's generations so that
+    # collections in the workers do not touch (and copy) shared pages
+    gc.collect()
+    gc.freeze()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -2,10 +2,12 @@
 
 import os
 import sys
+from contextlib import contextmanager
 from pathlib import Path
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from dotenv import load_dotenv
 
 # Ensure project root is on sys.path so `import app` works when running from tests/
@@ -16,6 +18,9 @@ if str(ROOT) not in sys.path:
 # Load environment variables
 load_dotenv()
 
+# Cache responses in process memory rather than Redis during tests
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "memory")
+
 
 @pytest.fixture(scope="session")
 def database_url():
@@ -40,6 +45,38 @@ def db_session(engine):
         session.close()
 
 
+@pytest.fixture(scope="session")
+def memory_engine():
+    """In-memory SQLite engine for unit tests that need no real database."""
+    return create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+
+@pytest.fixture(scope="function")
+def memory_sessionmaker(memory_engine):
+    """Session factory on a freshly created schema, dropped after the test."""
+    from app.models.base import Base
+
+    Base.metadata.create_all(bind=memory_engine)
+    try:
+        yield sessionmaker(autocommit=False, autoflush=False, bind=memory_engine)
+    finally:
+        Base.metadata.drop_all(bind=memory_engine)
+
+
+@pytest.fixture(scope="function")
+def memory_session(memory_sessionmaker):
+    """Session on the in-memory schema."""
+    session = memory_sessionmaker()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
 @pytest.fixture(scope="function")
 def test_user_data():
     """Sample user data for testing."""
@@ -66,3 +103,86 @@ def test_rate_calculation_data():
         "skills_count": 5,
         "location": "Cairo, Egypt"
     }
+
+
+@contextmanager
+def count_queries(bind):
+    """Record SQL statements executed on an engine while the block runs."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
+
+
+@pytest.fixture
+def max_queries():
+    """Fail the test if the guarded block issues more than N queries.
+
+    Usage::
+
+        with max_queries(engine, 4):
+            client.get("/api/v1/...")
+    """
+
+    @contextmanager
+    def _guard(bind, limit):
+        with count_queries(bind) as statements:
+            yield statements
+        assert len(statements) <= limit, (
+            f"Expected at most {limit} queries, got {len(statements)}:\n"
+            + "\n---\n".join(statements)
+        )
+
+    return _guard
+
+
+# Most statements each repository method may issue, measured with the ids it
+# needs already known and nothing preloaded in the session. Raise a budget
+# only for a deliberate change; an extra query is usually a lazy load.
+QUERY_BUDGETS = {
+    "RateRepository.get_by_id": 1,
+    "RateRepository.get_by_user_id": 1,
+    "RateRepository.create": 2,
+    "RateRepository.update": 3,
+    "RateRepository.delete": 2,
+    "RateRepository.get_favorites": 1,
+    "RateRepository.set_favorite": 3,
+    "RateRepository.get_by_project_type": 1,
+    "RateRepository.count_by_user": 1,
+    "RateRepository.get_recent_calculations": 1,
+    "UserRepository.get_by_id": 1,
+    "UserRepository.get_by_email": 1,
+    "UserRepository.get_with_plan": 4,
+    "UserRepository.list_active_with_plan": 4,
+    "UserRepository.create": 2,
+    "UserRepository.update": 3,
+    "UserRepository.delete": 9,
+    "UserRepository.get_profile": 1,
+    "UserRepository.create_profile": 2,
+    "UserRepository.update_profile": 3,
+    "UserRepository.list_active_users": 1,
+    "UserRepository.count_users": 1,
+    "UserRepository.search_by_skill": 1,
+}
+
+
+@pytest.fixture
+def query_budget(max_queries):
+    """Fail the test if a repository method exceeds its ``QUERY_BUDGETS``.
+
+    Usage::
+
+        with query_budget(engine, "RateRepository.create"):
+            repo.create(data)
+    """
+
+    def _guard(bind, method):
+        return max_queries(bind, QUERY_BUDGETS[method])
+
+    return _guard
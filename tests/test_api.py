@@ -5,8 +5,9 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.db.database import get_db, engine as app_engine
+from app.db.database import get_db
 from app.models.base import Base
+from app.schemas.rates import RateResponse
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -42,7 +43,8 @@ class TestHealthEndpoint:
         assert response.status_code == 200
         assert response.json() == {
             "status": "ok",
-            "service": "qeem-backend"
+            "service": "qeem-backend",
+            "dependencies": {"redis": "closed"}
         }
 
 
@@ -65,6 +67,44 @@ class TestRatesEndpoints:
         # Should not return 404 (endpoint exists)
         assert response.status_code != 404
 
+    def test_calculate_matches_response_model(self):
+        """Test the pre-encoded calculate body matches RateResponse."""
+        payload = {
+            "project_type": "web_development",
+            "project_complexity": "moderate",
+            "estimated_hours": 40,
+            "experience_years": 3,
+            "skills_count": 5,
+            "location": "Cairo, Egypt",
+        }
+        response = client.post("/api/v1/rates/calculate", json=payload)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        body = response.json()
+        assert RateResponse.model_validate(body).model_dump() == body
+
+    def test_calculate_requires_skills_count(self):
+        """Test skills_count is required by the request schema."""
+        payload = {
+            "project_type": "web_development",
+            "project_complexity": "moderate",
+            "estimated_hours": 40,
+            "experience_years": 3,
+            "location": "Cairo, Egypt",
+        }
+        response = client.post("/api/v1/rates/calculate", json=payload)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "skills_count"]
+        schema = client.get("/openapi.json").json()["components"]["schemas"]
+        assert "skills_count" in schema["RateRequest"]["required"]
+
+    def test_calculate_keeps_openapi_response_model(self):
+        """Test the calculate response is still documented as RateResponse."""
+        schema = client.get("/openapi.json").json()
+        operation = schema["paths"]["/api/v1/rates/calculate"]["post"]
+        content = operation["responses"]["200"]["content"]["application/json"]
+        assert content["schema"]["$ref"].endswith("/RateResponse")
+
 
 class TestAPIDocumentation:
     """Test API documentation endpoints."""
@@ -0,0 +1,174 @@
+"""Failure-injection tests for the Redis circuit breaker and local fallbacks."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.infra import redis as redis_infra
+from app.infra.rate_limit import (
+    RateLimit,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    RedisRateLimiter,
+)
+from app.infra.redis import CircuitBreaker, CircuitOpenError, InstrumentedAsyncRedis
+from app.infra.response_cache import (
+    FallbackCacheBackend,
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FlakyConnection(fakeredis.aioredis.FakeConnection):
+    """Fake connection whose connects fail while ``failing`` is set."""
+
+    failing = True
+    attempts = 0
+
+    async def connect(self):
+        FlakyConnection.attempts += 1
+        if FlakyConnection.failing:
+            raise RedisConnectionError("injected failure")
+        return await super().connect()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(
+        redis_infra,
+        "breaker",
+        CircuitBreaker(failure_threshold=3, recovery_timeout=10.0, clock=clock),
+    )
+    FlakyConnection.failing = True
+    FlakyConnection.attempts = 0
+    return clock
+
+
+@pytest.fixture
+def flaky_client(clock):
+    pool = redis_infra.aioredis.ConnectionPool(
+        connection_class=FlakyConnection,
+        server=fakeredis.FakeServer(),
+        decode_responses=True,
+    )
+    return InstrumentedAsyncRedis(connection_pool=pool)
+
+
+async def _get(client, key="k"):
+    try:
+        return await client.get(key)
+    except Exception as exc:
+        return exc
+
+
+def test_breaker_opens_rejects_then_probes(clock):
+    breaker = redis_infra.breaker
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    clock.now = 10.0
+    assert breaker.state == "half_open"
+    assert breaker.allow()  # the probe
+    assert not breaker.allow()  # only one at a time
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 20.0
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.snapshot()["times_opened"] == 2
+
+
+def test_injected_failures_short_circuit_commands(clock, flaky_client):
+    async def scenario():
+        failures = [await _get(flaky_client) for _ in range(3)]
+        attempts = FlakyConnection.attempts
+        rejected = await _get(flaky_client)
+        return failures, attempts, rejected
+
+    failures, attempts, rejected = asyncio.run(scenario())
+
+    assert all(isinstance(exc, RedisConnectionError) for exc in failures)
+    assert isinstance(rejected, CircuitOpenError)
+    # Rejected without touching the network
+    assert FlakyConnection.attempts == attempts
+
+    FlakyConnection.failing = False
+    clock.now = 10.0
+    assert asyncio.run(_get(flaky_client)) is None
+    assert redis_infra.breaker.state == "closed"
+
+
+def test_rate_limiting_falls_back_to_local_limits(clock, flaky_client):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {"ok": True}
+
+    policy = RateLimitPolicy(anonymous=RateLimit(2, 60), authenticated=RateLimit(2, 60))
+    app.add_middleware(
+        RateLimitMiddleware, policy=policy, limiter=RedisRateLimiter(flaky_client)
+    )
+    client = TestClient(app)
+
+    statuses = [client.get("/ping").status_code for _ in range(5)]
+
+    assert statuses == [200, 200, 429, 429, 429]
+    assert redis_infra.breaker.state == "open"
+
+
+def test_response_cache_falls_back_to_local_backend(clock, flaky_client):
+    backend = FallbackCacheBackend(
+        RedisCacheBackend(flaky_client, None), InMemoryCacheBackend()
+    )
+    cache = ResponseCache(backend)
+    computed = []
+
+    async def compute() -> str:
+        computed.append(1)
+        return "body"
+
+    async def scenario():
+        first = await cache.get_or_compute("k", compute, 60)
+        second = await cache.get_or_compute("k", compute, 60)
+        return first, second
+
+    assert asyncio.run(scenario()) == (("body", "MISS"), ("body", "HIT"))
+    assert len(computed) == 1
+    assert cache.stats()["fallbacks"] > 0
+
+
+def test_health_reports_degraded_while_open():
+    from app.main import app
+
+    breaker = redis_infra.breaker
+    try:
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        body = TestClient(app).get("/health").json()
+    finally:
+        breaker.reset()
+
+    assert body["status"] == "degraded"
+    assert body["dependencies"] == {"redis": "open"}
@@ -0,0 +1,103 @@
+"""Tests for per-request query stats and the slow-query log."""
+
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from app.core.context import RequestContext, current_request
+from app.core.logging import request_log_fields
+from app.core.middleware import RequestContextMiddleware
+from app.db.instrumentation import fingerprint, instrument_engine
+
+
+def _engine(slow_query_ms=None):
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    instrument_engine(engine, slow_query_ms)
+    return engine
+
+
+def test_fingerprint_normalizes_literals_and_parameters():
+    assert fingerprint(
+        "SELECT * FROM users\n WHERE email = 'a@b.c' AND id = 42 LIMIT ?"
+    ) == ("SELECT * FROM users WHERE email = ? AND id = ? LIMIT ?")
+    assert fingerprint(
+        "SELECT id FROM rates WHERE user_id IN (%(p_1)s, %(p_2)s, %(p_3)s)"
+    ) == fingerprint("SELECT id FROM rates WHERE user_id IN ($1)")
+    assert fingerprint("SELECT x::text FROM t WHERE y = :y") == (
+        "SELECT x::text FROM t WHERE y = ?"
+    )
+
+
+def test_request_context_keeps_slowest_statements():
+    context = RequestContext("r", "GET", "/", {})
+    for ms, statement in ((1.0, "a"), (5.0, "b"), (0.5, "c"), (3.0, "d")):
+        context.record_query(statement, ms)
+
+    assert context.queries == 4
+    assert context.db_ms == 9.5
+    assert [statement for _, statement in context.slowest] == ["b", "d", "a"]
+
+
+def test_slow_queries_are_logged_as_fingerprints(caplog):
+    engine = _engine(slow_query_ms=0.000001)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1 WHERE 'x' = 'x'"))
+
+    assert caplog.records[-1].getMessage().endswith("SELECT ? WHERE ? = ?")
+
+
+def test_fast_queries_are_not_logged(caplog):
+    engine = _engine(slow_query_ms=10000)
+
+    with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    assert not caplog.records
+
+
+def _app(query_stats):
+    engine = _engine()
+    app = FastAPI()
+
+    @app.get("/queries")
+    def queries() -> dict:
+        with engine.connect() as conn:
+            for n in range(3):
+                conn.execute(text(f"SELECT {n}"))
+        return request_log_fields() or {}
+
+    app.add_middleware(RequestContextMiddleware, query_stats=query_stats)
+    return app
+
+
+def test_query_stats_reach_logs_and_debug_headers(caplog):
+    client = TestClient(_app(query_stats=True))
+
+    with caplog.at_level(logging.INFO, logger="app.db.queries"):
+        response = client.get("/queries")
+
+    assert response.json()["db_queries"] == 3
+    assert response.headers["X-DB-Queries"] == "3"
+    assert ", db;dur=" in response.headers["Server-Timing"]
+    summary = caplog.records[-1].getMessage()
+    assert summary.startswith("3 queries in ")
+    assert "SELECT ?" in summary
+
+
+def test_query_stats_headers_are_debug_only():
+    response = TestClient(_app(query_stats=False)).get("/queries")
+
+    assert response.json()["db_queries"] == 3
+    assert "X-DB-Queries" not in response.headers
+    assert "db;dur" not in response.headers["Server-Timing"]
+    assert current_request() is None
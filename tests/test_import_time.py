@@ -0,0 +1,63 @@
+"""Cold-start budget for ``import app.main``.
+
+Each check runs in a fresh interpreter, since this process has already
+imported the app. The budget is generous for slow CI hosts; run
+``benchmarks/bench_import_time.py`` to see where the time goes.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+IMPORT_BUDGET_SECONDS = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", "3.0"))
+
+# Optional or rarely used dependencies that must load on first use only
+LAZY_MODULES = (
+    "app.core.profiler",
+    "app.infra.rate_limit",
+    "celery",
+    "jose",
+    "opentelemetry",
+    "pymongo",
+    "sentry_sdk",
+)
+
+
+def _run(code: str) -> str:
+    env = {**os.environ, "DATABASE_URL": "sqlite:///./test_ci.db"}
+    for name in ("TRACING_ENABLED", "PROFILER_ENABLED", "RATE_LIMITING_ENABLED"):
+        env.pop(name, None)
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_import_app_main_stays_within_budget():
+    code = (
+        "import time; start = time.perf_counter(); import app.main; "
+        "print(time.perf_counter() - start)"
+    )
+    # Best of three: the first run may also be compiling bytecode
+    elapsed = min(float(_run(code)) for _ in range(3))
+
+    assert (
+        elapsed < IMPORT_BUDGET_SECONDS
+    ), f"import app.main took {elapsed:.2f}s (budget {IMPORT_BUDGET_SECONDS}s)"
+
+
+def test_optional_dependencies_are_not_imported_eagerly():
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+
+    assert _run(code) == ""
@@ -0,0 +1,258 @@
+"""Tests for the queue-based logging pipeline."""
+
+import io
+import json
+import logging
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import logging as app_logging
+from app.core.context import RequestContext, bind_request, reset_request, set_user_id
+from app.core.logging import (
+    AccessLogSampler,
+    JsonFormatter,
+    configure_uvicorn_json_logging,
+    start_queue_logging,
+    stop_queue_logging,
+)
+from app.core.middleware import RequestContextMiddleware
+
+
+class SlowHandler(logging.StreamHandler):
+    """Stream handler that waits until released, like a backed-up collector."""
+
+    def __init__(self, stream) -> None:
+        super().__init__(stream)
+        self.unblock = threading.Event()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.unblock.wait(timeout=5)
+        super().emit(record)
+
+
+@pytest.fixture
+def queued_logger(monkeypatch):
+    monkeypatch.setattr(app_logging, "_queue_stats", app_logging.LogQueueStats())
+    stream = io.StringIO()
+    handler = SlowHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    logger = logging.getLogger("tests.queued")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield logger, handler, stream
+    handler.unblock.set()
+    stop_queue_logging()
+    logger.handlers = []
+
+
+def _lines(stream: io.StringIO) -> list:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_records_are_written_by_listener_with_same_json(queued_logger):
+    logger, handler, stream = queued_logger
+    handler.unblock.set()
+    start_queue_logging(100, "drop", logger_names=["tests.queued"])
+
+    logger.info("hello %s", "world")
+    original = handler
+    stop_queue_logging()
+
+    assert logger.handlers == [original]
+    assert _lines(stream) == [
+        {"level": "INFO", "name": "tests.queued", "message": "hello world"}
+    ]
+
+
+def test_drop_policy_never_blocks_and_counts(queued_logger):
+    logger, handler, stream = queued_logger
+    start_queue_logging(2, "drop", logger_names=["tests.queued"])
+
+    # The listener holds one record in the slow handler; two more fill the
+    # queue and the rest are dropped without waiting.
+    for i in range(20):
+        logger.warning("record %d", i)
+    stats = app_logging.logging_queue_stats()
+    handler.unblock.set()
+    stop_queue_logging()
+
+    assert stats["dropped"] >= 17
+    assert stats["dropped_by_level"] == {"WARNING": stats["dropped"]}
+    messages = [line["message"] for line in _lines(stream)]
+    assert f"Dropped {stats['dropped']} log records (logging queue full)" in messages
+    assert len(messages) == 20 - stats["dropped"] + 1
+
+
+def test_block_policy_keeps_every_record(queued_logger):
+    logger, handler, stream = queued_logger
+    start_queue_logging(2, "block", logger_names=["tests.queued"])
+
+    writer = threading.Thread(
+        target=lambda: [logger.info("record %d", i) for i in range(10)]
+    )
+    writer.start()
+    writer.join(timeout=0.2)
+    assert writer.is_alive()  # waiting for queue space
+    handler.unblock.set()
+    writer.join(timeout=5)
+    stop_queue_logging()
+
+    assert [line["message"] for line in _lines(stream)] == [
+        f"record {i}" for i in range(10)
+    ]
+    assert app_logging.logging_queue_stats()["dropped"] == 0
+
+
+def test_exception_text_rendered_before_enqueue(queued_logger):
+    logger, handler, stream = queued_logger
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.unblock.set()
+    start_queue_logging(10, "drop", logger_names=["tests.queued"])
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    stop_queue_logging()
+
+    output = stream.getvalue()
+    assert output.startswith("failed\nTraceback")
+    assert "ValueError: boom" in output
+
+
+def _request_app(stream: io.StringIO) -> TestClient:
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(JsonFormatter())
+    logger = logging.getLogger("tests.request")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int) -> dict:
+        set_user_id(7)  # as get_current_user does, from a worker thread
+        logger.info("loading item")
+        return {"id": item_id}
+
+    app.add_middleware(RequestContextMiddleware)
+    return TestClient(app)
+
+
+def test_json_formatter_adds_request_context():
+    stream = io.StringIO()
+    client = _request_app(stream)
+
+    client.get("/items/3", headers={"X-Request-ID": "req-1"})
+    (line,) = _lines(stream)
+
+    assert line["message"] == "loading item"
+    assert line["request_id"] == "req-1"
+    assert (line["method"], line["path"], line["route"]) == (
+        "GET",
+        "/items/3",
+        "/items/{item_id}",
+    )
+    assert line["user_id"] == 7
+    assert line["elapsed_ms"] >= 0
+
+
+def test_json_formatter_without_request_or_orjson():
+    record = logging.makeLogRecord(
+        {"name": "x", "levelno": 20, "levelname": "INFO", "msg": "plain"}
+    )
+
+    fast, stdlib = JsonFormatter(), JsonFormatter(use_orjson=False)
+
+    assert json.loads(fast.format(record)) == json.loads(stdlib.format(record))
+    assert json.loads(stdlib.format(record)) == {
+        "level": "INFO",
+        "name": "x",
+        "message": "plain",
+    }
+
+
+def test_request_context_survives_logging_queue(monkeypatch):
+    monkeypatch.setattr(app_logging, "_queue_stats", app_logging.LogQueueStats())
+    stream = io.StringIO()
+    client = _request_app(stream)
+    start_queue_logging(10, "drop", logger_names=["tests.request"])
+    try:
+        client.get("/items/3", headers={"X-Request-ID": "req-2"})
+    finally:
+        stop_queue_logging()
+
+    (line,) = _lines(stream)
+    assert (line["request_id"], line["user_id"]) == ("req-2", 7)
+
+
+def _access_record(path: str, status: int) -> logging.LogRecord:
+    return logging.LogRecord(
+        "uvicorn.access",
+        logging.INFO,
+        __file__,
+        1,
+        '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", path, "1.1", status),
+        None,
+    )
+
+
+class TestAccessLogSampler:
+    def test_sampling_per_route_with_errors_always_logged(self):
+        draws = iter([0.005, 0.5, 0.9])
+        sampler = AccessLogSampler(
+            routes={"/health": 0.0, "/api/v1/rates": 0.01},
+            rand=lambda: next(draws),
+        )
+
+        kept = [
+            sampler.filter(_access_record(path, status))
+            for path, status in [
+                ("/health", 200),
+                ("/health", 503),
+                ("/api/v1/rates/calculate?x=1", 200),  # draw 0.005: kept
+                ("/api/v1/rates/calculate", 200),  # draw 0.5: suppressed
+                ("/api/v1/rates/calculate", 422),
+                ("/api/v1/auth/login", 200),  # default rate 1.0
+            ]
+        ]
+
+        assert kept == [False, True, True, False, True, True]
+        assert sampler.stats() == {
+            "*": {"logged": 1, "suppressed": 0},
+            "/api/v1/rates": {"logged": 2, "suppressed": 1},
+            "/health": {"logged": 1, "suppressed": 1},
+        }
+
+    def test_sampled_records_carry_rate(self):
+        sampler = AccessLogSampler(default_rate=0.5, rand=lambda: 0.1)
+        record = _access_record("/x", 200)
+
+        assert sampler.filter(record)
+        assert json.loads(JsonFormatter().format(record))["sample_rate"] == 0.5
+
+    def test_slow_requests_always_logged(self):
+        sampler = AccessLogSampler(default_rate=0.0, slow_ms=0.0)
+        context = RequestContext("r", "GET", "/x", {})
+        token = bind_request(context)
+        try:
+            assert sampler.filter(_access_record("/x", 200))
+        finally:
+            reset_request(token)
+        assert not sampler.filter(_access_record("/x", 200))
+
+    def test_installed_on_uvicorn_access_logger(self):
+        sampler = AccessLogSampler(routes={"/health": 0.0})
+        configure_uvicorn_json_logging("INFO", sampler)
+        try:
+            assert sampler in logging.getLogger("uvicorn.access").filters
+            assert app_logging.access_log_stats() == {}
+        finally:
+            configure_uvicorn_json_logging("INFO")
+        assert logging.getLogger("uvicorn.access").filters == []
@@ -0,0 +1,156 @@
+"""Tests for the memory-mapped market index."""
+
+import math
+import os
+from datetime import date
+
+from app.infra.market_index import (
+    MarketIndex,
+    MarketIndexRefresher,
+    MarketSegment,
+    combine_statistics,
+    load_segments,
+    write_index,
+)
+from app.models.market_statistics import MarketStatistics
+
+
+def _stats(**overrides):
+    values = dict(
+        date=date(2025, 1, 6),
+        project_type="web_development",
+        experience_level="mid",
+        location="Cairo, Egypt",
+        average_rate=300.0,
+        median_rate=280.0,
+        min_rate=150.0,
+        max_rate=600.0,
+        rate_std_dev=80.0,
+        sample_size=100,
+        data_source="upwork",
+        demand_score=0.7,
+    )
+    values.update(overrides)
+    return MarketStatistics(**values)
+
+
+def _segment(rate):
+    return MarketSegment(*(float(rate),) * 13)
+
+
+def test_sources_are_combined_by_sample_size():
+    segment = combine_statistics(
+        [
+            _stats(),
+            _stats(
+                data_source="freelancer",
+                average_rate=200.0,
+                median_rate=200.0,
+                min_rate=100.0,
+                rate_std_dev=40.0,
+                sample_size=300,
+                demand_score=None,
+            ),
+        ]
+    )
+
+    assert segment.average_rate == 225.0
+    assert segment.median_rate == 220.0
+    assert (segment.min_rate, segment.max_rate) == (100.0, 600.0)
+    assert segment.sample_size == 400
+    assert segment.demand_score == 0.7
+    assert math.isnan(segment.competition_score)
+    assert segment.min_rate <= segment.p10 < segment.p25 < segment.p75 < segment.p90
+    assert segment.p50 == segment.median_rate
+
+
+def test_only_the_latest_period_of_each_segment_is_loaded(memory_session):
+    memory_session.add_all(
+        [
+            _stats(date=date(2024, 12, 30), average_rate=100.0),
+            _stats(),
+            _stats(experience_level="senior", average_rate=500.0),
+        ]
+    )
+    memory_session.commit()
+
+    segments = load_segments(memory_session)
+
+    assert segments[("web_development", "mid", "Cairo, Egypt")].average_rate == 300
+    assert segments[("web_development", "senior", "Cairo, Egypt")].average_rate == 500
+
+
+def test_lookups_read_rows_from_the_mapped_file(tmp_path):
+    path = tmp_path / "market.bin"
+    segments = {
+        ("design", "junior", "Alexandria, Egypt"): _segment(120),
+        ("web_development", "mid", "Cairo, Egypt"): _segment(300),
+        ("writing", "senior", "القاهرة"): _segment(90),
+    }
+    write_index(path, segments)
+
+    index = MarketIndex(path)
+
+    assert len(index) == 3
+    for key, segment in segments.items():
+        assert index.lookup(*key) == segment
+    assert index.lookup("design", "junior", "Cairo, Egypt") is None
+    assert index.lookup("zzz", "mid", "Cairo, Egypt") is None
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_readers_pick_up_a_replaced_file(tmp_path):
+    path = tmp_path / "market.bin"
+    key = ("design", "junior", "Cairo, Egypt")
+    write_index(path, {key: _segment(100)})
+    now = [0.0]
+    index = MarketIndex(path, check_interval=5.0, clock=lambda: now[0])
+    assert index.lookup(*key).average_rate == 100
+
+    write_index(path, {key: _segment(200)})
+    assert index.lookup(*key).average_rate == 100  # not checked again yet
+    now[0] = 5.0
+
+    assert index.lookup(*key).average_rate == 200
+
+
+def test_missing_or_corrupt_index_reads_as_empty(tmp_path):
+    path = tmp_path / "market.bin"
+    index = MarketIndex(path, check_interval=0)
+    assert index.lookup("design", "junior", "Cairo") is None
+
+    path.write_bytes(b"not an index at all, just some bytes")
+    assert index.lookup("design", "junior", "Cairo") is None
+    assert len(index) == 0
+
+
+def test_one_refresher_holds_the_lock(tmp_path, memory_sessionmaker):
+    path = tmp_path / "market.bin"
+    first = MarketIndexRefresher(path, memory_sessionmaker)
+    second = MarketIndexRefresher(path, memory_sessionmaker)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+    first.release()
+    assert second.try_acquire()
+    second.release()
+
+
+def test_refresher_rebuilds_only_a_stale_index(
+    tmp_path, memory_session, memory_sessionmaker
+):
+    memory_session.add(_stats())
+    memory_session.commit()
+    path = tmp_path / "market.bin"
+    refresher = MarketIndexRefresher(path, memory_sessionmaker, interval=60)
+
+    try:
+        assert refresher.refresh_if_stale()
+        assert not refresher.refresh_if_stale()
+        os.utime(path, (0, 0))
+        assert refresher.refresh_if_stale()
+    finally:
+        refresher.release()
+
+    index = MarketIndex(path)
+    assert index.lookup("web_development", "mid", "Cairo, Egypt").sample_size == 100
@@ -0,0 +1,151 @@
+"""Tests for Prometheus metrics and the /metrics endpoint."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import MetricsMiddleware
+from app.db.instrumentation import instrument_engine, sql_operation
+from app.infra.redis import RedisMetrics
+from app.schemas.rates import RateRequest
+from app.services.rates import calculate_compensation_tiers
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_middleware_labels_route_templates():
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int) -> dict:
+        assert _value("http_requests_in_progress", method="GET") >= 1
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware)
+    client = TestClient(app)
+    labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+    before = _value("http_request_duration_seconds_count", **labels)
+    missing = {"method": "GET", "route": "<unmatched>", "status": "404"}
+    missing_before = _value("http_request_duration_seconds_count", **missing)
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/nope")
+
+    assert _value("http_request_duration_seconds_count", **labels) == before + 2
+    assert _value("http_request_duration_seconds_count", **missing) == (
+        missing_before + 1
+    )
+    assert _value("http_requests_in_progress", method="GET") == 0
+
+
+def test_engine_instrumentation_times_queries_and_tracks_pool():
+    engine = create_engine("sqlite://", poolclass=QueuePool)
+    instrument_engine(engine)
+    selects = _value("db_query_duration_seconds_count", operation="SELECT")
+    checked_out = _value("db_pool_checked_out")
+
+    with engine.connect() as conn:
+        assert _value("db_pool_checked_out") == checked_out + 1
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("select 2"))
+        errors = _value("db_query_errors_total", operation="SELECT")
+        try:
+            conn.execute(text("SELECT * FROM missing_table"))
+        except Exception:
+            pass
+        assert conn.info["query_start"] == []
+
+    assert _value("db_query_duration_seconds_count", operation="SELECT") == (
+        selects + 2
+    )
+    assert _value("db_query_errors_total", operation="SELECT") == errors + 1
+    assert _value("db_pool_checked_out") == checked_out
+    engine.dispose()
+
+
+def test_sql_operation_labels():
+    assert sql_operation("  select * from users") == "SELECT"
+    assert sql_operation("INSERT INTO users VALUES (1)") == "INSERT"
+    assert sql_operation("PRAGMA table_info(users)") == "OTHER"
+    assert sql_operation("") == "OTHER"
+
+
+def test_redis_metrics_are_exported():
+    metrics = RedisMetrics()
+    count = _value("redis_command_duration_seconds_count", command="MGET")
+    errors = _value("redis_command_errors_total", command="MGET")
+
+    metrics.observe("MGET", 0.002, False)
+    metrics.observe("MGET", 0.004, True)
+    metrics.reject("MGET")
+
+    assert _value("redis_command_duration_seconds_count", command="MGET") == (count + 2)
+    assert _value("redis_command_errors_total", command="MGET") == errors + 2
+    assert metrics.snapshot()["MGET"]["calls"] == 3
+
+
+def test_rate_calculations_are_counted():
+    payload = RateRequest(
+        project_type="design",
+        project_complexity="simple",
+        estimated_hours=10,
+        experience_years=2,
+        skills_count=3,
+        location="Cairo, Egypt",
+    )
+    before = _value("rate_calculations_total", method="rule_based")
+
+    calculate_compensation_tiers(payload)
+
+    assert _value("rate_calculations_total", method="rule_based") == before + 1
+
+
+def test_metrics_endpoint_exposes_registry():
+    from app.main import app
+
+    client = TestClient(app)
+    client.get("/health")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/health"' in response.text
+    assert "db_pool_checked_out" in response.text
+
+
+def test_multiprocess_mode_aggregates_workers(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    worker = (
+        "from app.core.metrics import RATE_CALCULATIONS;"
+        "RATE_CALCULATIONS.labels('rule_based').inc(3)"
+    )
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], cwd=ROOT, env=env, check=True)
+
+    scrape = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "from app.core.metrics import render_metrics;"
+            "print(render_metrics()[0].decode())",
+        ],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    assert 'rate_calculations_total{method="rule_based"} 6.0' in scrape
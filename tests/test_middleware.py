@@ -0,0 +1,33 @@
+"""Tests for request-scoped ASGI middleware."""
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.middleware import RequestContextMiddleware
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(request: Request) -> dict:
+        return {"request_id": request.state.request_id}
+
+    app.add_middleware(RequestContextMiddleware)
+    return TestClient(app)
+
+
+def test_generates_request_id_and_timing():
+    response = _client().get("/whoami")
+
+    request_id = response.headers["X-Request-ID"]
+    assert len(request_id) == 32
+    assert response.json() == {"request_id": request_id}
+    assert response.headers["Server-Timing"].startswith("app;dur=")
+
+
+def test_keeps_incoming_request_id():
+    response = _client().get("/whoami", headers={"X-Request-ID": "abc-123"})
+
+    assert response.headers["X-Request-ID"] == "abc-123"
+    assert response.json() == {"request_id": "abc-123"}
@@ -0,0 +1,81 @@
+"""Tests for the per-process engine and pre-fork cache warming."""
+
+import logging
+import os
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app.db import database
+from app.infra import warmup
+
+
+def test_engine_is_created_once_per_process():
+    engine = database.get_engine()
+
+    assert database.get_engine() is engine
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_get_db_binds_sessions_to_the_process_engine():
+    session = next(database.get_db())
+    try:
+        assert session.get_bind() is database.get_engine()
+    finally:
+        session.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_forked_child_gets_a_fresh_pool():
+    engine = database.get_engine()
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    parent_pool = engine.pool
+
+    pid = os.fork()
+    if pid == 0:  # child: report through the exit code only
+        code = 1
+        try:
+            child_engine = database.get_engine()
+            with child_engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            if child_engine is engine and child_engine.pool is not parent_pool:
+                code = 0
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    # The parent's pool is untouched
+    assert engine.pool is parent_pool
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_warm_caches_runs_registered_warmers_and_openapi(monkeypatch):
+    calls = []
+    monkeypatch.setattr(warmup, "_warmers", dict(warmup._warmers))
+    warmup.register_warmer("extra")(lambda: calls.append("extra"))
+    app = FastAPI()
+
+    timings = warmup.warm_caches(app)
+
+    assert calls == ["extra"]
+    assert {"rules", "extra", "openapi"} <= set(timings)
+    assert app.openapi_schema is not None
+
+
+def test_failing_warmer_is_logged_and_skipped(monkeypatch, caplog):
+    def broken() -> None:
+        raise RuntimeError("market index unavailable")
+
+    monkeypatch.setattr(warmup, "_warmers", {"broken": broken})
+    monkeypatch.setitem(warmup._warmers, "ok", lambda: None)
+
+    with caplog.at_level(logging.ERROR, logger="app.infra.warmup"):
+        timings = warmup.warm_caches()
+
+    assert set(timings) == {"ok"}
+    assert "cache warmer broken failed" in caplog.text
@@ -0,0 +1,140 @@
+"""Tests for cached principal resolution and invalidation."""
+
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.deps import get_current_active_user, get_current_user, resolve_principal
+from app.core.security import create_access_token
+from app.infra import principal_cache
+from app.models.user import User, UserRole
+from app.repositories.user_repository import UserRepository
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.published = []
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(principal_cache, "get_redis", lambda: redis)
+    monkeypatch.setattr(principal_cache.settings, "principal_cache_redis", True)
+    principal_cache._local.clear()
+    yield redis
+    principal_cache._local.clear()
+
+
+def _authenticate(memory_session, user_id):
+    token = create_access_token(str(user_id))
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return get_current_user(credentials=credentials, db=memory_session)
+
+
+def test_principal_is_served_from_cache(
+    memory_engine, memory_session, fake_redis, max_queries
+):
+    user = User(email=f"test_{uuid4().hex}@example.com", password_hash="hashed")
+    memory_session.add(user)
+    memory_session.commit()
+
+    first = _authenticate(memory_session, user.id)
+    with max_queries(memory_engine, 0):
+        assert _authenticate(memory_session, user.id) == first
+
+    # A fresh worker (empty local tier) is served by Redis
+    principal_cache._local.clear()
+    with max_queries(memory_engine, 0):
+        assert _authenticate(memory_session, user.id) == first
+    assert first.is_active and first.role == "freelancer"
+
+
+def test_principal_role_is_the_plain_value(memory_session, fake_redis):
+    # Not yet reloaded, so the attribute still holds the enum member
+    user = User(
+        email=f"test_{uuid4().hex}@example.com",
+        password_hash="hashed",
+        role=UserRole.ADMIN,
+    )
+    memory_session.add(user)
+    memory_session.flush()
+
+    assert resolve_principal(memory_session, user.id).role == "admin"
+
+
+def test_update_invalidates_and_cuts_off_disabled_user(memory_session, fake_redis):
+    user = User(email=f"test_{uuid4().hex}@example.com", password_hash="hashed")
+    memory_session.add(user)
+    memory_session.commit()
+    assert get_current_active_user(_authenticate(memory_session, user.id))
+
+    UserRepository(memory_session).update(user, {"is_active": False})
+
+    assert fake_redis.published == [
+        (principal_cache.INVALIDATION_CHANNEL, str(user.id))
+    ]
+    with pytest.raises(HTTPException) as exc:
+        get_current_active_user(_authenticate(memory_session, user.id))
+    assert exc.value.status_code == 400
+
+
+def test_unknown_subject_is_rejected(memory_session, fake_redis):
+    with pytest.raises(HTTPException) as exc:
+        _authenticate(memory_session, 999)
+    assert exc.value.status_code == 401
+
+
+class RecordingEvent:
+    """Stop event that records waits and stops after a number of them."""
+
+    def __init__(self, stop_after):
+        self.waits = []
+        self.stop_after = stop_after
+
+    def is_set(self):
+        return len(self.waits) >= self.stop_after
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+
+
+def test_listener_backs_off_and_warns_once_while_redis_is_down(monkeypatch, caplog):
+    def unavailable():
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(principal_cache, "get_redis", unavailable)
+    listener = principal_cache.InvalidationListener(
+        retry_seconds=1.0, max_retry_seconds=4.0
+    )
+    listener._stop = RecordingEvent(stop_after=5)
+
+    with caplog.at_level("WARNING", logger="app.infra.principal_cache"):
+        listener._run()
+
+    assert listener._stop.waits == [1.0, 2.0, 4.0, 4.0, 4.0]
+    assert caplog.text.count("Principal invalidation listener error") == 1
+
+
+def test_listener_is_not_started_without_the_redis_tier(monkeypatch):
+    monkeypatch.setattr(principal_cache.settings, "principal_cache_redis", False)
+    listener = principal_cache.InvalidationListener()
+
+    listener.start()
+
+    assert listener._thread is None
@@ -0,0 +1,111 @@
+"""Tests for the on-demand request profiler."""
+
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.middleware import RequestContextMiddleware
+from app.core.profiler import ProfilerMiddleware, SamplingProfiler
+from app.schemas.rates import RateRequest
+from app.services.rates import calculate_compensation_tiers
+
+PAYLOAD = RateRequest(
+    project_type="web_development",
+    project_complexity="moderate",
+    estimated_hours=40,
+    experience_years=3,
+    skills_count=5,
+    location="Cairo, Egypt",
+)
+
+
+def _busy(seconds=0.03):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        calculate_compensation_tiers(PAYLOAD)
+
+
+def _client(tmp_path, **options):
+    app = FastAPI()
+
+    @app.get("/work")
+    def work() -> dict:
+        _busy()
+        return {"ok": True}
+
+    app.add_middleware(ProfilerMiddleware, output_dir=str(tmp_path), **options)
+    app.add_middleware(RequestContextMiddleware)
+    return TestClient(app)
+
+
+def test_sampling_profiler_folds_app_stacks():
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    try:
+        _busy(0.05)
+    finally:
+        profiler.stop()
+
+    folded = profiler.folded()
+    assert profiler.samples > 5
+    assert "calculate_compensation_tiers (app/services/rates.py:" in folded
+    stack, count = folded.splitlines()[0].rsplit(" ", 1)
+    assert int(count) >= 1 and ";" in stack
+
+
+def test_requests_without_token_are_not_profiled(tmp_path):
+    client = _client(tmp_path, token="secret")
+
+    plain = client.get("/work")
+    wrong = client.get("/work", headers={"X-Profile-Token": "guess"})
+
+    assert "X-Profile-File" not in plain.headers
+    assert "X-Profile-File" not in wrong.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_token_profile_is_written_to_directory(tmp_path):
+    client = _client(tmp_path, token="secret")
+
+    response = client.get(
+        "/work", headers={"X-Profile-Token": "secret", "X-Request-ID": "../../x y"}
+    )
+
+    assert response.json() == {"ok": True}
+    written = tmp_path / response.headers["X-Profile-File"]
+    assert written.parent == tmp_path and written.name.endswith("-xy.folded")
+    assert "calculate_compensation_tiers" in written.read_text()
+
+
+def test_inline_output_replaces_the_response(tmp_path):
+    client = _client(tmp_path, token="secret")
+
+    response = client.get(
+        "/work", headers={"X-Profile-Token": "secret", "X-Profile-Output": "inline"}
+    )
+
+    assert response.headers["content-type"].startswith("text/plain")
+    assert response.headers["X-Profile-Status"] == "200"
+    assert "calculate_compensation_tiers" in response.text
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sampled_fraction_is_profiled(tmp_path):
+    draws = iter([0.5, 0.001])
+    client = _client(tmp_path, sample_rate=0.01, rand=lambda: next(draws))
+
+    skipped = client.get("/work")
+    sampled = client.get("/work")
+
+    assert "X-Profile-File" not in skipped.headers
+    assert (tmp_path / sampled.headers["X-Profile-File"]).exists()
+
+
+def test_sampled_request_cannot_ask_for_inline_output(tmp_path):
+    client = _client(tmp_path, sample_rate=1.0)
+
+    response = client.get("/work", headers={"X-Profile-Output": "inline"})
+
+    assert response.json() == {"ok": True}
+    assert (tmp_path / response.headers["X-Profile-File"]).exists()
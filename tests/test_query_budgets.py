@@ -0,0 +1,118 @@
+"""Query budgets for RateRepository and UserRepository methods."""
+
+import pytest
+
+from app.models.rate_calculation import RateCalculation
+from app.models.user import User, UserProfile
+from app.repositories import user_repository
+from app.repositories.rate_repository import RateRepository
+from app.repositories.user_repository import RECENT_ACTIVITY_PLAN, UserRepository
+
+CALCULATION = {
+    "project_type": "design",
+    "project_complexity": "simple",
+    "estimated_hours": 10,
+    "experience_years": 2,
+    "skills_count": 3,
+    "location": "Cairo, Egypt",
+    "minimum_rate": 160.0,
+    "competitive_rate": 200.0,
+    "premium_rate": 260.0,
+    "calculation_method": "rule_based",
+}
+
+
+@pytest.fixture
+def seeded_session(monkeypatch, memory_session):
+    """Seed a user with a profile and a calculation, then empty the session."""
+    monkeypatch.setattr(user_repository, "invalidate_principal", lambda user_id: None)
+    session = memory_session
+    user = User(email="budget@example.com", password_hash="hashed")
+    session.add(user)
+    session.flush()
+    session.add(UserProfile(user_id=user.id, first_name="Test", skills=["python"]))
+    session.add(RateCalculation(user_id=user.id, **CALCULATION))
+    session.commit()
+    session.expunge_all()
+    return session
+
+
+class Seed:
+    """The seeded rows, expired so lookups by id must hit the database."""
+
+    def __init__(self, db) -> None:
+        self.user = db.query(User).one()
+        self.calculation = db.query(RateCalculation).one()
+        self.profile = db.query(UserProfile).one()
+        self.user_id = self.user.id
+        self.calculation_id = self.calculation.id
+        db.expire_all()
+
+
+RATE_CALLS = {
+    "get_by_id": lambda repo, seed: repo.get_by_id(seed.calculation_id),
+    "get_by_user_id": lambda repo, seed: repo.get_by_user_id(seed.user_id),
+    "create": lambda repo, seed: repo.create({"user_id": seed.user_id, **CALCULATION}),
+    "update": lambda repo, seed: repo.update(seed.calculation, {"location": "Giza"}),
+    "delete": lambda repo, seed: repo.delete(seed.calculation),
+    "get_favorites": lambda repo, seed: repo.get_favorites(seed.user_id),
+    "set_favorite": lambda repo, seed: repo.set_favorite(
+        seed.calculation_id, seed.user_id, True
+    ),
+    "get_by_project_type": lambda repo, seed: repo.get_by_project_type("design"),
+    "count_by_user": lambda repo, seed: repo.count_by_user(seed.user_id),
+    "get_recent_calculations": lambda repo, seed: repo.get_recent_calculations(),
+}
+
+USER_CALLS = {
+    "get_by_id": lambda repo, seed: repo.get_by_id(seed.user_id),
+    "get_by_email": lambda repo, seed: repo.get_by_email("budget@example.com"),
+    "get_with_plan": lambda repo, seed: repo.get_with_plan(
+        seed.user_id, RECENT_ACTIVITY_PLAN
+    ),
+    "list_active_with_plan": lambda repo, seed: repo.list_active_with_plan(
+        RECENT_ACTIVITY_PLAN
+    ),
+    "create": lambda repo, seed: repo.create(
+        {"email": "new@example.com", "password_hash": "hashed"}
+    ),
+    "update": lambda repo, seed: repo.update(seed.user, {"is_verified": True}),
+    "delete": lambda repo, seed: repo.delete(seed.user),
+    "get_profile": lambda repo, seed: repo.get_profile(seed.user_id),
+    "create_profile": lambda repo, seed: repo.create_profile(
+        {"user_id": seed.user_id, "first_name": "Second"}
+    ),
+    "update_profile": lambda repo, seed: repo.update_profile(
+        seed.profile, {"first_name": "Renamed"}
+    ),
+    "list_active_users": lambda repo, seed: repo.list_active_users(),
+    "count_users": lambda repo, seed: repo.count_users(),
+    "search_by_skill": lambda repo, seed: repo.search_by_skill("python"),
+}
+
+
+@pytest.mark.parametrize("method", sorted(RATE_CALLS))
+def test_rate_repository_budget(memory_engine, seeded_session, query_budget, method):
+    seed = Seed(seeded_session)
+    repo = RateRepository(seeded_session)
+
+    with query_budget(memory_engine, f"RateRepository.{method}"):
+        RATE_CALLS[method](repo, seed)
+
+
+@pytest.mark.parametrize("method", sorted(USER_CALLS))
+def test_user_repository_budget(memory_engine, seeded_session, query_budget, method):
+    seed = Seed(seeded_session)
+    repo = UserRepository(seeded_session)
+
+    with query_budget(memory_engine, f"UserRepository.{method}"):
+        USER_CALLS[method](repo, seed)
+
+
+def test_budget_catches_an_extra_query(memory_engine, seeded_session, query_budget):
+    seed = Seed(seeded_session)
+    repo = UserRepository(seeded_session)
+
+    with pytest.raises(AssertionError):
+        with query_budget(memory_engine, "UserRepository.get_by_id"):
+            repo.get_by_id(seed.user_id).profile  # lazy load past the budget
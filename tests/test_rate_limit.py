@@ -0,0 +1,193 @@
+"""Tests for rate limit parsing, policy, middleware and the GCRA script."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.infra.rate_limit import (
+    HybridRateLimiter,
+    RateLimit,
+    RateLimitDecision,
+    RateLimitMiddleware,
+    RateLimitPolicy,
+    RedisRateLimiter,
+)
+
+
+def test_parse_rate_limit():
+    assert RateLimit.parse("100/hour") == RateLimit(100, 3600)
+    assert RateLimit.parse(" 5 / minutes ") == RateLimit(5, 60)
+    with pytest.raises(ValueError):
+        RateLimit.parse("lots/hour")
+
+
+def test_policy_prefers_principal_then_route_then_default():
+    policy = RateLimitPolicy(
+        anonymous=RateLimit(100, 3600),
+        authenticated=RateLimit(1000, 3600),
+        routes={
+            "/api/v1/rates": RateLimit(50, 60),
+            "/api/v1/rates/calculate": RateLimit(10, 60),
+        },
+        principals={"7": RateLimit(5000, 3600)},
+    )
+    bearer = f"Bearer {create_access_token('42')}"
+
+    def resolve(*args):
+        return asyncio.run(policy.resolve(*args))
+
+    assert resolve("/health", "1.2.3.4") == (
+        "ratelimit:ip:1.2.3.4:/health",
+        RateLimit(100, 3600),
+    )
+    assert resolve("/api/v1/rates/calculate", "1.2.3.4", bearer) == (
+        "ratelimit:user:42:/api/v1/rates/calculate",
+        RateLimit(10, 60),
+    )
+    assert resolve("/docs", "1.2.3.4", bearer)[1] == RateLimit(1000, 3600)
+    vip = f"Bearer {create_access_token('7')}"
+    assert resolve("/api/v1/rates/history", "1.2.3.4", vip)[1] == RateLimit(5000, 3600)
+    # Invalid tokens fall back to the client address
+    assert resolve("/health", "1.2.3.4", "Bearer junk")[0].startswith("ratelimit:ip:")
+
+
+def test_decision_headers():
+    denied = RateLimitDecision(False, 10, 0, retry_after=0.2, reset_after=59.5)
+    assert denied.headers() == {
+        "X-RateLimit-Limit": "10",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": "60",
+        "Retry-After": "1",
+    }
+
+
+class CountingLimiter:
+    """Allows the first ``limit`` hits per key."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.hits: dict = {}
+
+    async def hit(self, key: str, rate: RateLimit) -> RateLimitDecision:
+        self.hits[key] = self.hits.get(key, 0) + 1
+        remaining = self.limit - self.hits[key]
+        return RateLimitDecision(
+            remaining >= 0, self.limit, max(remaining, 0), 1.0, 60.0
+        )
+
+
+def test_middleware_denies_and_passes_streaming_responses():
+    app = FastAPI()
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks():
+            for i in range(3):
+                yield f"chunk{i};"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    limiter = CountingLimiter(limit=1)
+    policy = RateLimitPolicy(anonymous=RateLimit(1, 60), authenticated=RateLimit(1, 60))
+    app.add_middleware(RateLimitMiddleware, policy=policy, limiter=limiter)
+    client = TestClient(app)
+
+    allowed = client.get("/stream")
+    denied = client.get("/stream")
+
+    assert allowed.status_code == 200
+    assert allowed.text == "chunk0;chunk1;chunk2;"
+    assert allowed.headers["X-RateLimit-Remaining"] == "0"
+    assert denied.status_code == 429
+    assert denied.headers["Retry-After"] == "1"
+    assert list(limiter.hits) == ["ratelimit:ip:testclient:/stream"]
+
+
+def test_gcra_script_allows_burst_then_denies():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    limiter = RedisRateLimiter(fakeredis.FakeAsyncRedis(decode_responses=True))
+    rate = RateLimit(3, 60)
+
+    async def scenario():
+        return [await limiter.hit("ratelimit:test", rate) for _ in range(4)]
+
+    decisions = asyncio.run(scenario())
+
+    assert [d.allowed for d in decisions] == [True, True, True, False]
+    assert [d.remaining for d in decisions[:3]] == [2, 1, 0]
+    assert 0 < decisions[3].retry_after <= 20
+
+
+def test_hybrid_limiter_batches_redis_calls_for_hot_keys():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    limiter = HybridRateLimiter(
+        fakeredis.FakeAsyncRedis(decode_responses=True), tolerance=0.05
+    )
+    rate = RateLimit(10000, 3600)
+
+    async def scenario():
+        return [await limiter.hit("ratelimit:hot", rate) for _ in range(1000)]
+
+    decisions = asyncio.run(scenario())
+
+    assert all(d.allowed for d in decisions)
+    assert limiter.stats()["redis_round_trips"] <= 3
+
+
+def test_hybrid_limiters_honor_global_limit_within_tolerance():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    workers = [HybridRateLimiter(redis, tolerance=0.1) for _ in range(2)]
+    rate = RateLimit(100, 3600)
+
+    async def scenario():
+        admitted = 0
+        for i in range(300):
+            decision = await workers[i % 2].hit("ratelimit:shared", rate)
+            admitted += decision.allowed
+        for worker in workers:
+            await worker.flush()
+        return admitted
+
+    admitted = asyncio.run(scenario())
+
+    assert 90 <= admitted <= 100 + 2 * 10
+    # Denied keys are answered locally until their retry time
+    trips = [w.stats()["redis_round_trips"] for w in workers]
+    assert sum(trips) < 40
+
+
+def test_hybrid_flush_syncs_each_pending_admission_once():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    limiter = HybridRateLimiter(
+        fakeredis.FakeAsyncRedis(decode_responses=True), tolerance=0.1
+    )
+    rate = RateLimit(100, 3600)
+
+    async def scenario():
+        for _ in range(5):
+            await limiter.hit("ratelimit:busy", rate)
+        await limiter.hit("ratelimit:quiet", rate)
+        await limiter.flush()
+        trips = limiter.redis_round_trips
+        # Nothing pending and tokens left: no round trip
+        await limiter.flush()
+        assert limiter.redis_round_trips == trips
+        for _ in range(3):
+            await limiter.hit("ratelimit:busy", rate)
+        # The second flush finds the bucket locked by the first and skips it
+        await asyncio.gather(limiter.flush(), limiter.flush())
+        return limiter._buckets["ratelimit:busy"]
+
+    bucket = asyncio.run(scenario())
+
+    assert bucket.pending == 0
+    assert bucket.remaining == 100 - 8
@@ -1,5 +1,9 @@
 """Unit tests for rates service multipliers and tier calculations."""
 
+from app.core.config import get_settings
+from app.infra.market_index import MarketIndex, MarketSegment, write_index
+from app.schemas.rates import RateRequest
+from app.services import rates
 from app.services.rates import (
     _base_rate_for_project_type,
     _complexity_multiplier,
@@ -44,3 +48,46 @@ def test_client_region_multiplier_scale():
 def test_urgency_multiplier():
     assert _urgency_multiplier("normal") == 1.0
     assert _urgency_multiplier("rush") > 1.0
+
+
+def _market_request():
+    return RateRequest(
+        project_type="web_development",
+        project_complexity="moderate",
+        estimated_hours=40,
+        experience_years=5,
+        skills_count=5,
+        location="Cairo, Egypt",
+    )
+
+
+def _use_market_index(monkeypatch, tmp_path, sample_size):
+    segment = MarketSegment(*(400.0,) * 10, float(sample_size), 0.5, 0.5)
+    path = tmp_path / "market.idx"
+    write_index(path, {("web_development", "mid", "Cairo, Egypt"): segment})
+    monkeypatch.setattr(rates, "market_index", MarketIndex(path))
+    monkeypatch.setattr(get_settings(), "market_index_enabled", True)
+
+
+def test_market_median_replaces_rule_baseline(monkeypatch, tmp_path):
+    _use_market_index(monkeypatch, tmp_path, sample_size=50)
+    payload = _market_request()
+
+    market_rate = rates.market_baseline(payload)
+    result = rates.compute_tiers(payload, 5, market_rate)
+
+    assert market_rate == 400.0
+    assert result["method"] == "market_based"
+    expected = 400.0 * _complexity_multiplier("moderate") * _skills_multiplier(5)
+    assert result["competitive_rate"] == round(expected)
+
+
+def test_thin_or_disabled_market_falls_back_to_rules(monkeypatch, tmp_path):
+    _use_market_index(monkeypatch, tmp_path, sample_size=3)
+    payload = _market_request()
+    assert rates.market_baseline(payload) is None
+
+    _use_market_index(monkeypatch, tmp_path, sample_size=50)
+    monkeypatch.setattr(get_settings(), "market_index_enabled", False)
+    assert rates.market_baseline(payload) is None
+    assert rates.compute_tiers(payload, 5)["method"] == "rule_based"
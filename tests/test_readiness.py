@@ -0,0 +1,159 @@
+"""Tests for readiness probes and the liveness/readiness endpoints."""
+
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.core.config import AppSettings
+from app.infra import readiness as readiness_infra
+from app.infra.readiness import ReadinessProbe, build_readiness_probe
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _probe(checks, required=("database",), timeout=0.05, ttl=2.0, clock=None):
+    return ReadinessProbe(
+        checks, required, timeout=timeout, ttl=ttl, clock=clock or FakeClock()
+    )
+
+
+async def _ok():
+    return None
+
+
+async def _fail():
+    raise ConnectionError("refused")
+
+
+async def _hang():
+    await asyncio.sleep(1)
+
+
+def test_required_failure_is_not_ready_optional_is_degraded():
+    probe = _probe({"database": _fail, "redis": _ok})
+    report = asyncio.run(probe.check())
+    assert report.status == "not_ready" and not report.ready
+    assert report.checks["database"].status == "error"
+    assert "refused" in report.checks["database"].error
+
+    probe = _probe({"database": _ok, "redis": _fail})
+    report = asyncio.run(probe.check())
+    assert report.status == "degraded" and report.ready
+    assert report.checks["redis"].required is False
+
+
+def test_checks_time_out_and_report_latency():
+    report = asyncio.run(_probe({"database": _hang, "rules": _ok}).check())
+
+    assert report.status == "not_ready"
+    assert report.checks["database"].status == "timeout"
+    assert 40 <= report.checks["database"].latency_ms < 500
+    assert report.checks["rules"].status == "ok"
+
+
+def test_results_are_cached_for_ttl_and_shared_by_concurrent_callers():
+    calls = []
+
+    async def counted():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    clock = FakeClock()
+    probe = _probe({"database": counted}, clock=clock)
+
+    async def scenario():
+        first = await asyncio.gather(*(probe.check() for _ in range(5)))
+        clock.now = 1.0
+        cached = await probe.check()
+        clock.now = 2.5
+        refreshed = await probe.check()
+        return first, cached, refreshed
+
+    first, cached, refreshed = asyncio.run(scenario())
+
+    assert len(calls) == 2
+    assert all(report is first[0] for report in first)
+    assert cached is first[0]
+    assert refreshed is not cached
+
+
+def test_redis_can_be_required():
+    settings = AppSettings(READINESS_REQUIRE_REDIS=True)
+    assert build_readiness_probe(settings).required == {"database", "rules", "redis"}
+    assert "redis" not in build_readiness_probe(AppSettings()).required
+
+
+def test_database_and_rule_table_checks_pass():
+    asyncio.run(readiness_infra.check_database())
+    asyncio.run(readiness_infra.check_rules())
+
+
+def test_endpoints(monkeypatch):
+    from app.main import app
+
+    client = TestClient(app)
+    assert client.get("/health/live").json()["status"] == "ok"
+
+    monkeypatch.setattr(
+        readiness_infra.readiness_probe,
+        "checks",
+        {"database": _ok, "redis": _fail, "rules": _ok},
+    )
+    readiness_infra.readiness_probe.reset()
+    degraded = client.get("/health/ready")
+    assert degraded.status_code == 200
+    body = degraded.json()
+    assert body["status"] == "degraded"
+    assert body["checks"]["redis"]["status"] == "error"
+    assert body["checks"]["database"]["latency_ms"] >= 0
+
+    monkeypatch.setattr(
+        readiness_infra.readiness_probe,
+        "checks",
+        {"database": _fail, "redis": _ok, "rules": _ok},
+    )
+    readiness_infra.readiness_probe.reset()
+    down = client.get("/health/ready")
+    assert down.status_code == 503
+    assert down.json()["status"] == "not_ready"
+    readiness_infra.readiness_probe.reset()
+
+
+def test_stuck_database_probe_is_not_run_again(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def blackholed():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+
+    monkeypatch.setattr(readiness_infra, "_database_select_one", blackholed)
+    monkeypatch.setattr(readiness_infra, "_database_probe", None)
+    probe = _probe({"database": readiness_infra.check_database}, ttl=0)
+
+    async def rounds():
+        return [await probe.check() for _ in range(3)]
+
+    try:
+        reports = asyncio.run(rounds())
+    finally:
+        release.set()
+
+    assert [r.checks["database"].status for r in reports] == ["timeout"] * 3
+    assert len(calls) == 1
+    assert calls[0].startswith("readiness-db")
+
+
+def test_postgres_connections_have_a_connect_timeout():
+    from app.db import database
+
+    args = database._engine_connect_args("postgresql://db/qeem")
+
+    assert args == {"connect_timeout": database.settings.db_connect_timeout}
@@ -0,0 +1,62 @@
+"""Tests for the Redis client factory, lifecycle and metrics."""
+
+import asyncio
+
+import pytest
+
+from app.core.config import get_settings
+from app.infra import redis as redis_infra
+
+
+def test_async_client_uses_configured_pool():
+    settings = get_settings().model_copy(
+        update={"redis_max_connections": 7, "redis_socket_timeout": 0.25}
+    )
+    client = redis_infra.create_async_redis(settings)
+    pool = client.connection_pool
+
+    assert pool.max_connections == 7
+    assert pool.connection_kwargs["socket_timeout"] == 0.25
+    assert pool.connection_kwargs["health_check_interval"] == 30
+    assert redis_infra._pool_stats(pool) == {"in_use": 0, "idle": 0, "max": 7}
+
+
+def test_lifespan_creates_and_closes_client(monkeypatch):
+    monkeypatch.setattr(redis_infra, "_async_client", None)
+
+    async def scenario():
+        client = await redis_infra.init_async_redis()
+        assert redis_infra.get_async_redis() is client
+        assert "async_pool" in redis_infra.redis_stats()
+        await redis_infra.close_async_redis()
+
+    asyncio.run(scenario())
+    assert redis_infra._async_client is None
+
+
+def test_commands_and_pipelines_record_latency():
+    fakeredis = pytest.importorskip("fakeredis")
+    import redis.asyncio as aioredis
+
+    pool = aioredis.ConnectionPool(
+        connection_class=fakeredis.aioredis.FakeConnection,
+        server=fakeredis.FakeServer(),
+        decode_responses=True,
+    )
+    client = redis_infra.InstrumentedAsyncRedis(connection_pool=pool)
+    redis_infra.metrics.reset()
+
+    async def scenario():
+        await client.set("k", "v")
+        assert await client.get("k") == "v"
+        pipe = client.pipeline(transaction=False)
+        pipe.get("k")
+        pipe.get("missing")
+        assert await pipe.execute() == ["v", None]
+
+    asyncio.run(scenario())
+    commands = redis_infra.metrics.snapshot()
+
+    assert commands["SET"]["calls"] == 1 and commands["GET"]["calls"] == 1
+    assert commands["PIPELINE"]["calls"] == 1
+    assert commands["GET"]["errors"] == 0
@@ -0,0 +1,258 @@
+"""Repository tests running against an in-memory SQLite database."""
+
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import InvalidRequestError
+
+from app.models.contract import Contract, ContractType
+from app.models.invoice import Invoice
+from app.models.rate_calculation import RateCalculation
+from app.models.user import User, UserProfile
+from app.repositories.contract_repository import ContractRepository
+from app.repositories.user_repository import (
+    RECENT_ACTIVITY_PLAN,
+    UserLoadPlan,
+    UserRepository,
+)
+
+
+def _user(memory_session) -> User:
+    user = User(email=f"test_{uuid4().hex}@example.com", password_hash="hashed")
+    memory_session.add(user)
+    memory_session.flush()
+    return user
+
+
+def _contract(memory_session, user: User, milestones) -> Contract:
+    contract = Contract(
+        user_id=user.id,
+        contract_number=f"CON-{uuid4().hex[:8]}",
+        client_name="Client",
+        project_title="Project",
+        contract_type=ContractType.MILESTONE,
+        start_date=date(2026, 10, 1),
+        milestones=milestones,
+    )
+    memory_session.add(contract)
+    memory_session.commit()
+    return contract
+
+
+class PostgresStatementRecorder:
+    """Session stand-in on the Postgres dialect that records statements."""
+
+    def __init__(self) -> None:
+        self.statements: list = []
+
+    def get_bind(self):
+        return self
+
+    @property
+    def dialect(self):
+        return postgresql.dialect()
+
+    def execute(self, stmt):
+        self.statements.append(stmt.compile(dialect=postgresql.dialect()))
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class TestContractRepository:
+    """Test JSON milestone queries."""
+
+    def test_unpaid_milestone_due_this_week(self, memory_session):
+        user = _user(memory_session)
+        due = _contract(
+            memory_session,
+            user,
+            [
+                {"title": "Design", "due_date": "2026-10-05", "paid": True},
+                {"title": "Build", "due_date": "2026-10-21", "paid": False},
+            ],
+        )
+        # Missing "paid" counts as unpaid
+        implicit = _contract(
+            memory_session, user, [{"title": "Ship", "due_date": "2026-10-25"}]
+        )
+        _contract(
+            memory_session,
+            user,
+            [{"title": "Paid", "due_date": "2026-10-20", "paid": True}],
+        )
+        _contract(
+            memory_session,
+            user,
+            [{"title": "Later", "due_date": "2026-11-20", "paid": False}],
+        )
+        _contract(memory_session, user, None)
+
+        repo = ContractRepository(memory_session)
+        found = repo.get_with_unpaid_milestone_due_this_week(today=date(2026, 10, 19))
+
+        assert [c.id for c in found] == [due.id, implicit.id]
+
+    def test_unpaid_milestone_filter_on_postgres(self):
+        session = PostgresStatementRecorder()
+
+        ContractRepository(session).get_with_unpaid_milestone_due(
+            date(2026, 10, 19), date(2026, 10, 25)
+        )
+
+        (compiled,) = session.statements
+        assert "contracts.milestones @? CAST(%(param_1)s AS JSONPATH)" in str(compiled)
+        assert compiled.params["param_1"] == (
+            '$[*] ? (!(@.paid == true) && @.due_date >= "2026-10-19"'
+            ' && @.due_date <= "2026-10-25")'
+        )
+
+    def test_milestone_items_accessor(self, memory_session):
+        user = _user(memory_session)
+        contract = _contract(
+            memory_session, user, [{"title": "Build", "due_date": "2026-10-21"}]
+        )
+        memory_session.expire_all()
+
+        assert contract.milestone_items == [
+            {"paid": False, "title": "Build", "due_date": "2026-10-21"}
+        ]
+        assert contract.deliverable_items == []
+
+
+class TestUserRepositorySkills:
+    """Test JSON skill queries."""
+
+    def test_search_by_skill(self, memory_session):
+        first, second = _user(memory_session), _user(memory_session)
+        memory_session.add_all(
+            [
+                UserProfile(user_id=first.id, skills=["python", "fastapi"]),
+                UserProfile(user_id=second.id, skills=["figma"]),
+            ]
+        )
+        memory_session.commit()
+
+        found = UserRepository(memory_session).search_by_skill("fastapi")
+
+        assert [p.user_id for p in found] == [first.id]
+
+    def test_search_by_skill_uses_containment_on_postgres(self):
+        session = PostgresStatementRecorder()
+
+        UserRepository(session).search_by_skill("fastapi")
+
+        (compiled,) = session.statements
+        assert "user_profiles.skills @> %(param_1)s" in str(compiled)
+        assert compiled.params["param_1"] == ["fastapi"]
+
+    def test_skill_names_accepts_legacy_string(self):
+        profile = UserProfile(skills='["python", "sql"]')
+
+        assert profile.skill_names == ["python", "sql"]
+
+
+def _seed_activity(memory_session, users: int = 5, per_user: int = 3):
+    for _ in range(users):
+        user = _user(memory_session)
+        memory_session.add(UserProfile(user_id=user.id, first_name="Test"))
+        for i in range(per_user):
+            memory_session.add(
+                RateCalculation(
+                    user_id=user.id,
+                    project_type="design",
+                    project_complexity="simple",
+                    estimated_hours=10,
+                    experience_years=2,
+                    skills_count=i,
+                    location="Cairo, Egypt",
+                    minimum_rate=100.0,
+                    competitive_rate=120.0,
+                    premium_rate=150.0,
+                )
+            )
+            memory_session.add(
+                Invoice(
+                    user_id=user.id,
+                    invoice_number=f"INV-{uuid4().hex[:8]}",
+                    client_name="Client",
+                    subtotal=100.0,
+                    total_amount=100.0,
+                    issue_date=date(2026, 10, 1),
+                    due_date=date(2026, 10, 15),
+                )
+            )
+        _contract(memory_session, user, None)
+    memory_session.commit()
+    memory_session.expunge_all()
+
+
+class TestUserLoadPlans:
+    """Test explicit loading plans for User aggregates."""
+
+    def test_recent_activity_query_count_is_constant(
+        self, memory_engine, memory_session, max_queries
+    ):
+        _seed_activity(memory_session)
+        repo = UserRepository(memory_session)
+
+        with max_queries(memory_engine, 4):
+            users = repo.list_active_with_plan(RECENT_ACTIVITY_PLAN)
+            for loaded in users:
+                assert loaded.user.profile.first_name == "Test"
+                assert len(loaded.rows("rate_calculations")) == 3
+                assert len(loaded.rows("invoices")) == 3
+                assert len(loaded.rows("contracts")) == 1
+
+        assert len(users) == 5
+
+    def test_collection_limit_keeps_most_recent(self, memory_session):
+        _seed_activity(memory_session, users=2, per_user=4)
+        plan = UserLoadPlan(collections={"rate_calculations": 2})
+
+        users = UserRepository(memory_session).list_active_with_plan(plan)
+
+        for loaded in users:
+            assert [c.skills_count for c in loaded.rows("rate_calculations")] == [3, 2]
+
+    def test_capped_window_leaves_the_collection_intact(self, memory_session):
+        _seed_activity(memory_session, users=1, per_user=4)
+        plan = UserLoadPlan(collections={"rate_calculations": 2}, strict=False)
+        repo = UserRepository(memory_session)
+
+        loaded = repo.list_active_with_plan(plan)[0]
+        assert len(loaded.recent["rate_calculations"]) == 2
+        assert len(loaded.user.rate_calculations) == 4
+
+        # Saving the user must not orphan-delete rows outside the window
+        loaded.user.is_verified = True
+        memory_session.commit()
+        assert repo.get_with_plan(loaded.user.id, plan).rows("rate_calculations")
+        assert len(repo.get_by_id(loaded.user.id).rate_calculations) == 4
+
+    def test_strict_plan_raises_on_unplanned_relationship(self, memory_session):
+        _seed_activity(memory_session, users=1)
+        loaded = UserRepository(memory_session).list_active_with_plan(UserLoadPlan())[0]
+
+        with pytest.raises(InvalidRequestError):
+            loaded.user.invoices
+
+    def test_lazy_loading_exceeds_budget(
+        self, memory_engine, memory_session, max_queries
+    ):
+        _seed_activity(memory_session)
+
+        with pytest.raises(AssertionError):
+            with max_queries(memory_engine, 4):
+                for user in UserRepository(memory_session).list_active_users():
+                    user.profile, user.rate_calculations, user.invoices
+
+    def test_unknown_collection_rejected(self):
+        with pytest.raises(ValueError):
+            UserLoadPlan(collections={"payments": 5})
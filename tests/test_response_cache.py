@@ -0,0 +1,232 @@
+"""Tests for the response cache."""
+
+import asyncio
+import threading
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.security import create_access_token
+from app.infra import response_cache
+from app.infra.response_cache import (
+    InMemoryCacheBackend,
+    RedisCacheBackend,
+    ResponseCache,
+    cache_response,
+    configure_response_cache,
+    invalidate_tags,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def cache():
+    cache = ResponseCache(InMemoryCacheBackend(), poll_interval=0.001)
+    configure_response_cache(cache)
+    yield cache
+    configure_response_cache(None)
+
+
+def _app(calls: list) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{owner}")
+    @cache_response(ttl=60, tags=("items:{owner}", "rates:{principal}"))
+    async def items(owner: str, page: int = 1, q: Optional[str] = None) -> dict:
+        calls.append((owner, page, q))
+        return {"owner": owner, "page": page, "q": q, "n": len(calls)}
+
+    return app
+
+
+class TestCacheResponse:
+    def test_hit_after_miss(self, cache):
+        calls: list = []
+        client = TestClient(_app(calls))
+
+        first = client.get("/items/a", params={"page": 2})
+        second = client.get("/items/a", params={"page": 2})
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert (
+            second.json()
+            == first.json()
+            == {
+                "owner": "a",
+                "page": 2,
+                "q": None,
+                "n": 1,
+            }
+        )
+        assert len(calls) == 1
+
+    def test_key_normalizes_query_and_varies_on_principal(self, cache):
+        calls: list = []
+        client = TestClient(_app(calls))
+        token = create_access_token("42")
+
+        client.get("/items/a?page=2&q=x")
+        assert client.get("/items/a?q=x&page=2").headers["X-Cache"] == "HIT"
+        authed = client.get(
+            "/items/a?q=x&page=2", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert authed.headers["X-Cache"] == "MISS"
+        assert len(calls) == 2
+
+    def test_tag_invalidation(self, cache):
+        calls: list = []
+        client = TestClient(_app(calls))
+        token = create_access_token("42")
+        headers = {"Authorization": f"Bearer {token}"}
+        client.get("/items/a")
+        client.get("/items/b", headers=headers)
+
+        assert invalidate_tags("rates:user:42") == 1
+        assert client.get("/items/a").headers["X-Cache"] == "HIT"
+        assert client.get("/items/b", headers=headers).headers["X-Cache"] == "MISS"
+
+        invalidate_tags("items:a")
+        assert client.get("/items/a").headers["X-Cache"] == "MISS"
+
+
+class TestStampedeProtection:
+    def test_concurrent_misses_compute_once(self, cache):
+        computed = 0
+
+        async def compute() -> str:
+            nonlocal computed
+            computed += 1
+            await asyncio.sleep(0.02)
+            return '{"ok":true}'
+
+        async def scenario():
+            return await asyncio.gather(
+                *(cache.get_or_compute("k", compute, 60) for _ in range(10))
+            )
+
+        results = asyncio.run(scenario())
+
+        assert computed == 1
+        assert {body for body, _ in results} == {'{"ok":true}'}
+        assert cache.lock_waits == 9
+
+    def test_early_refresh_near_expiry(self):
+        clock = FakeClock()
+        draws = iter([0.0, 0.999999])
+        cache = ResponseCache(
+            InMemoryCacheBackend(clock=clock), clock=clock, rand=lambda: next(draws)
+        )
+        bodies = iter(["old", "new"])
+
+        async def compute() -> str:
+            clock.now += 1.0  # one second to compute
+            return next(bodies)
+
+        async def scenario():
+            await cache.get_or_compute("k", compute, 60)
+            clock.now += 55.0
+            # Small draw: far from expiry relative to compute time, no refresh
+            first = await cache.get_or_compute("k", compute, 60)
+            # Large draw: -log(1e-6) * 1s lands past expiry, refresh early
+            second = await cache.get_or_compute("k", compute, 60)
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert first == ("old", "HIT")
+        assert second == ("new", "REFRESH")
+
+    def test_backend_errors_fall_back_to_compute(self):
+        class BrokenBackend(InMemoryCacheBackend):
+            async def get(self, key):
+                raise ConnectionError("down")
+
+            async def acquire(self, key, ttl):
+                raise ConnectionError("down")
+
+        cache = ResponseCache(BrokenBackend())
+
+        async def compute() -> str:
+            return "fresh"
+
+        assert asyncio.run(cache.get_or_compute("k", compute, 60)) == (
+            "fresh",
+            "MISS",
+        )
+        assert cache.errors == 2
+
+
+def test_memory_backend_drops_tags_of_evicted_and_expired_entries():
+    clock = FakeClock()
+    backend = InMemoryCacheBackend(max_entries=2, clock=clock)
+
+    async def scenario():
+        await backend.set("a", "1", 10, ["rates:1", "shared"])
+        await backend.set("b", "2", 60, ["rates:2", "shared"])
+        await backend.set("c", "3", 60, ["rates:3"])  # evicts "a"
+        clock.now += 30
+        assert await backend.get("b") == "2"
+        clock.now += 60
+        assert await backend.get("b") is None  # expired
+
+    asyncio.run(scenario())
+
+    assert backend._tags == {"rates:3": {"c"}}
+    assert backend.invalidate(["rates:3"]) == 1
+    assert backend._tags == {} and backend._key_tags == {}
+
+
+def test_redis_backend_tags():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    backend = RedisCacheBackend(
+        fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+        fakeredis.FakeRedis(server=server, decode_responses=True),
+    )
+    cache = ResponseCache(backend)
+
+    async def compute() -> str:
+        return "body"
+
+    async def fill():
+        await cache.get_or_compute("a", compute, 60, ["t1"])
+        await cache.get_or_compute("b", compute, 60, ["t1", "t2"])
+        return await cache.get_or_compute("a", compute, 60, ["t1"])
+
+    assert asyncio.run(fill()) == ("body", "HIT")
+    assert cache.invalidate(["t1"]) == 2
+    assert asyncio.run(backend.get("b")) is None
+
+
+def test_invalidation_on_the_event_loop_runs_in_a_worker_thread(cache):
+    class RecordingBackend(InMemoryCacheBackend):
+        threads: list = []
+
+        def invalidate(self, tags):
+            self.threads.append(threading.get_ident())
+            return super().invalidate(tags)
+
+    backend = RecordingBackend()
+    configure_response_cache(ResponseCache(backend))
+
+    async def scenario():
+        await backend.set("k", "v", 60, ["t"])
+        assert invalidate_tags("t") == 0  # deferred, not run inline
+        await asyncio.gather(*response_cache._pending_invalidations)
+        return threading.get_ident(), await backend.get("k")
+
+    loop_thread, value = asyncio.run(scenario())
+
+    assert value is None
+    assert backend.threads and backend.threads[0] != loop_thread
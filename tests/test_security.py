@@ -0,0 +1,158 @@
+"""Tests for JWT helpers and the token verification cache."""
+
+import asyncio
+import time
+from datetime import timedelta
+
+from app.core import security
+from app.core.lru import ExpiringLRUCache
+from app.core.security import create_access_token, decode_token
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache: ExpiringLRUCache[int] = ExpiringLRUCache(2, clock=FakeClock())
+    cache.set("a", 1, expires_at=2000)
+    cache.set("b", 2, expires_at=2000)
+    assert cache.get("a") == 1
+    cache.set("c", 3, expires_at=2000)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_drops_entries_at_expiry():
+    clock = FakeClock()
+    cache: ExpiringLRUCache[int] = ExpiringLRUCache(10, clock=clock)
+    cache.set("a", 1, expires_at=1010)
+    assert cache.get("a") == 1
+
+    clock.now = 1010
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_decode_token_caches_verified_claims(monkeypatch):
+    security._token_cache.clear()
+    calls = []
+    verify = security._verify_token
+    monkeypatch.setattr(
+        security, "_verify_token", lambda t: calls.append(t) or verify(t)
+    )
+    token = create_access_token("42")
+
+    first = decode_token(token)
+    second = decode_token(token)
+
+    assert first == second and first["sub"] == "42"
+    assert len(calls) == 1
+    assert security.token_cache_stats()["hits"] == 1
+    # Callers get a copy, not the cached dict
+    first["sub"] = "tampered"
+    assert decode_token(token)["sub"] == "42"
+
+
+def test_decode_token_rejects_invalid_and_expired():
+    security._token_cache.clear()
+    assert decode_token("not-a-jwt") is None
+    expired = create_access_token("42", expires_delta=timedelta(seconds=-1))
+    assert decode_token(expired) is None
+    assert security.token_cache_stats()["size"] == 0
+
+
+def test_revoked_token_is_rejected(monkeypatch):
+    security._token_cache.clear()
+    revoked = set()
+
+    class FakeRedis:
+        def setex(self, key, ttl, value):
+            assert ttl > 0
+            revoked.add(key)
+
+        def exists(self, key):
+            return key in revoked
+
+    monkeypatch.setattr("app.infra.redis.get_redis", lambda: FakeRedis())
+    monkeypatch.setattr(security.settings, "jwt_revocation_check", True)
+    token = create_access_token("42")
+    assert decode_token(token) is not None
+
+    security.revoke_token(token)
+
+    assert decode_token(token) is None
+
+
+def test_async_decode_checks_revocation_without_the_sync_client(monkeypatch):
+    security._token_cache.clear()
+    token = create_access_token("42")
+    revoked = {security.REVOKED_TOKEN_PREFIX + security._token_digest(token)}
+
+    class FakeAsyncRedis:
+        async def exists(self, key):
+            return key in revoked
+
+    def sync_client():
+        raise AssertionError("blocking Redis call on the event loop")
+
+    monkeypatch.setattr("app.infra.redis.get_redis", sync_client)
+    monkeypatch.setattr("app.infra.redis.get_async_redis", lambda: FakeAsyncRedis())
+    monkeypatch.setattr(security.settings, "jwt_revocation_check", True)
+
+    assert asyncio.run(security.decode_token_async(token)) is None
+    revoked.clear()
+    assert asyncio.run(security.decode_token_async(token))["sub"] == "42"
+
+
+def test_async_hashing_rehashes_on_cost_change(monkeypatch):
+    monkeypatch.setattr(security.settings, "bcrypt_rounds", 4)
+    old_hash = security.hash_password("s3cret")
+
+    async def scenario():
+        assert await security.verify_password_async("s3cret", old_hash)
+        assert await security.verify_and_update_password("s3cret", old_hash) == (
+            True,
+            None,
+        )
+        monkeypatch.setattr(security.settings, "bcrypt_rounds", 5)
+        valid, new_hash = await security.verify_and_update_password("s3cret", old_hash)
+        assert valid and new_hash is not None
+        assert not security.needs_rehash(new_hash)
+        assert await security.verify_and_update_password("wrong", new_hash) == (
+            False,
+            None,
+        )
+
+    asyncio.run(scenario())
+
+
+def test_hasher_pool_limits_concurrency_and_records_wait():
+    pool = security.PasswordHasherPool(workers=2)
+    active = []
+    peak = []
+
+    def work():
+        active.append(1)
+        peak.append(len(active))
+        time.sleep(0.02)
+        active.pop()
+
+    async def scenario():
+        await asyncio.gather(*(pool.run(work) for _ in range(6)))
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+    assert max(peak) <= 2
+    assert stats["completed"] == 6 and stats["in_flight"] == 0
+    assert stats["max_wait_seconds"] > 0
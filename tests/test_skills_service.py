@@ -0,0 +1,131 @@
+"""Unit tests for skill canonicalization, search and skills_count derivation."""
+
+from uuid import uuid4
+
+import pytest
+
+from app.models.skill import Skill
+from app.models.user import User, UserProfile
+from app.repositories.skill_repository import SkillRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.rates import RateRequest
+from app.services.rates import _resolve_skills_count
+from app.services.skills import (
+    SkillIndex,
+    create_profile,
+    create_skill,
+    derive_skills_count,
+    reset_skill_index,
+    search_users_by_skill,
+    sync_profile_skills,
+    update_profile,
+)
+
+
+@pytest.fixture
+def skills_session(memory_session):
+    """Session with a small skill dictionary and a fresh skill index."""
+    session = memory_session
+    session.add_all(
+        [
+            Skill(name="Python", aliases=["py"]),
+            Skill(name="React", aliases=["reactjs", "react.js"]),
+            Skill(name="Figma", aliases=[]),
+        ]
+    )
+    session.commit()
+    reset_skill_index()
+    try:
+        yield session
+    finally:
+        reset_skill_index()
+
+
+def test_index_folds_case_whitespace_and_aliases():
+    index = SkillIndex([(1, "Node.js", ["nodejs", "node"]), (2, "Python", [])])
+
+    assert index.lookup("  NODEJS ") == (1, "Node.js")
+    assert index.lookup("python") == (2, "Python")
+    assert index.lookup("cobol") is None
+    assert index.canonicalize(["node", "Node.js", "python", "cobol"]) == [
+        (1, "Node.js"),
+        (2, "Python"),
+    ]
+
+
+def test_index_prefix_completion():
+    index = SkillIndex(
+        [(1, "Python", ["py"]), (2, "PostgreSQL", ["postgres"]), (3, "React", [])]
+    )
+
+    assert index.complete("p") == ["PostgreSQL", "Python"]
+    assert index.complete("py") == ["Python"]
+    assert index.complete("p", limit=1) == ["PostgreSQL"]
+    assert index.complete("z") == []
+
+
+def test_sync_search_and_derived_skills_count(skills_session):
+    user = User(email=f"test_{uuid4().hex}@example.com", password_hash="hashed")
+    skills_session.add(user)
+    skills_session.flush()
+    profile = UserProfile(user_id=user.id, skills=["PY", "ReactJS", "cobol"])
+    skills_session.add(profile)
+    skills_session.commit()
+
+    assert sync_profile_skills(skills_session, profile) == ["Python", "React"]
+    assert [u.id for u in search_users_by_skill(skills_session, "react.js")] == [
+        user.id
+    ]
+    assert search_users_by_skill(skills_session, "figma") == []
+
+    payload = RateRequest(
+        project_type="web_development",
+        project_complexity="moderate",
+        estimated_hours=10,
+        experience_years=3,
+        skills_count=40,
+        location="Cairo, Egypt",
+    )
+    assert _resolve_skills_count(payload, skills_session, user.id) == 2
+    assert _resolve_skills_count(payload, None, None) == 40
+
+
+def test_profile_writes_link_skills_in_one_transaction(skills_session):
+    user = UserRepository(skills_session).create(
+        {"email": f"test_{uuid4().hex}@example.com", "password_hash": "hashed"}
+    )
+    profile = create_profile(skills_session, {"user_id": user.id, "skills": ["py"]})
+    assert derive_skills_count(skills_session, user.id) == 1
+
+    create_skill(skills_session, {"name": "Go", "aliases": ["golang"]})
+    update_profile(skills_session, profile, {"skills": ["py", "golang", "figma"]})
+
+    assert derive_skills_count(skills_session, user.id) == 3
+
+
+def test_failed_linking_rolls_back_the_profile(skills_session, monkeypatch):
+    user = UserRepository(skills_session).create(
+        {"email": f"test_{uuid4().hex}@example.com", "password_hash": "hashed"}
+    )
+
+    def broken(self, user_id, skill_ids, commit=True):
+        raise RuntimeError("link failed")
+
+    monkeypatch.setattr(SkillRepository, "set_user_skills", broken)
+    with pytest.raises(RuntimeError):
+        create_profile(skills_session, {"user_id": user.id, "skills": ["py"]})
+
+    assert UserRepository(skills_session).get_profile(user.id) is None
+
+
+def test_skill_added_by_another_worker_is_linked(skills_session):
+    user = UserRepository(skills_session).create(
+        {"email": f"test_{uuid4().hex}@example.com", "password_hash": "hashed"}
+    )
+    profile = create_profile(skills_session, {"user_id": user.id, "skills": ["py"]})
+    # Added elsewhere: this worker's index is not reset
+    SkillRepository(skills_session).create({"name": "Go", "aliases": ["golang"]})
+
+    update_profile(skills_session, profile, {"skills": ["py", "golang"]})
+
+    assert derive_skills_count(skills_session, user.id) == 2
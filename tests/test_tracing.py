@@ -0,0 +1,159 @@
+"""Tests for request tracing (app/core/tracing.py)."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import tracing
+from app.core.config import AppSettings
+from app.core.tracing import (
+    NOOP_SPAN,
+    TracingMiddleware,
+    configure_tracing,
+    shutdown_tracing,
+    span,
+    trace_methods,
+    traced,
+)
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    yield exporter
+    shutdown_tracing()
+
+
+def _enable(exporter, **overrides):
+    settings = AppSettings(TRACING_ENABLED=True, **overrides)
+    assert configure_tracing(settings, exporter=exporter)
+
+
+def _finished(exporter):
+    tracing._provider.force_flush()
+    return {s.name: s for s in exporter.get_finished_spans()}
+
+
+@trace_methods("Repo")
+class Repo:
+    def load(self, key):
+        return {"key": key}
+
+    @staticmethod
+    def helper():
+        return "static"
+
+
+def _app():
+    app = FastAPI()
+
+    @traced("deps.session")
+    def session():
+        with span("deps.connect"):
+            return Repo()
+
+    @app.get("/items/{key}")
+    @traced("items.get")
+    async def get_item(key: str, repo: Repo = Depends(session)) -> dict:
+        return repo.load(key)
+
+    @app.get("/boom")
+    async def boom() -> dict:
+        raise RuntimeError("boom")
+
+    app.add_middleware(TracingMiddleware)
+    return app
+
+
+def test_spans_nest_under_the_request_across_the_threadpool(exporter):
+    _enable(exporter)
+
+    response = TestClient(_app()).get("/items/a")
+
+    assert response.json() == {"key": "a"}
+    spans = _finished(exporter)
+    server = spans["GET /items/{key}"]
+    assert server.attributes["http.route"] == "/items/{key}"
+    assert server.attributes["http.response.status_code"] == 200
+    # The sync dependency runs in a worker thread but keeps its parent
+    assert spans["deps.session"].parent.span_id == server.context.span_id
+    assert spans["deps.connect"].parent.span_id == (
+        spans["deps.session"].context.span_id
+    )
+    assert spans["items.get"].parent.span_id == server.context.span_id
+    assert spans["Repo.load"].parent.span_id == spans["items.get"].context.span_id
+    assert Repo.helper() == "static"
+
+
+def test_incoming_traceparent_is_continued(exporter):
+    _enable(exporter, TRACING_SAMPLE_RATE=0.0)
+
+    TestClient(_app()).get("/items/a", headers={"traceparent": TRACEPARENT})
+
+    server = _finished(exporter)["GET /items/{key}"]
+    # The caller sampled the trace, which wins over the local ratio
+    assert format(server.context.trace_id, "032x") == TRACEPARENT[3:35]
+    assert format(server.parent.span_id, "016x") == TRACEPARENT[36:52]
+
+
+def test_sample_rate_zero_records_nothing(exporter):
+    _enable(exporter, TRACING_SAMPLE_RATE=0.0)
+
+    TestClient(_app()).get("/items/a")
+
+    assert _finished(exporter) == {}
+
+
+def test_server_errors_mark_the_span(exporter):
+    _enable(exporter)
+
+    client = TestClient(_app(), raise_server_exceptions=False)
+    assert client.get("/boom").status_code == 500
+
+    server = _finished(exporter)["GET /boom"]
+    assert not server.status.is_ok
+    assert server.attributes["http.response.status_code"] == 500
+
+
+def test_file_exporter_writes_one_span_per_line(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    configure_tracing(
+        AppSettings(
+            TRACING_ENABLED=True, TRACING_EXPORTER="file", TRACING_FILE=str(path)
+        )
+    )
+    try:
+        TestClient(_app()).get("/items/a")
+    finally:
+        shutdown_tracing()
+
+    names = {json.loads(line)["name"] for line in path.read_text().splitlines()}
+    assert {"GET /items/{key}", "items.get", "Repo.load"} <= names
+
+
+def test_disabled_tracing_is_a_noop():
+    assert not configure_tracing(AppSettings(TRACING_ENABLED=False))
+    assert span("x") is NOOP_SPAN
+    assert not tracing.tracing_enabled()
+
+    def current(key):
+        return key, trace.get_current_span()
+
+    async def acurrent(key):
+        return current(key)
+
+    # No span is started around the call: it runs in the caller's context
+    assert traced("sync")(current)(1) == (1, trace.INVALID_SPAN)
+    assert asyncio.run(traced("async")(acurrent)(1)) == (1, trace.INVALID_SPAN)